@@ -692,8 +692,13 @@ from datetime import datetime,timedelta
 from ..models.notice_model import Notice
 from ..models.approval_model import Approval
 from ..models.employee_model import Employee
-from ..middleware.auth_middleware import token_required
+from ..middleware.auth_middleware import token_required, role_required
 from ..utils.email_send_function import send_bulk_email
+from ..utils.notice_events import notice_changed, approval_changed
+from ..utils.creator_directory import resolve_creator
+from ..utils.serializers import json_response, compile_spec
+from ..utils.analytics_cache import analytics_cache
+from ..utils.approval_analytics import parse_period, approval_turnaround
 import traceback
 import random
 import string
@@ -740,8 +745,10 @@ def request_approval(current_user):
                 approved_by=str(current_user.id),
                 approved_by_name=current_user.name,
                 approved_at=datetime.utcnow(),
-                approval_comments="Auto-approved (no approvers found)"
+                approval_comments="Auto-approved (no approvers found)",
+                updated_at=datetime.now()
             )
+            notice_changed(notice)
             return jsonify({
                 "success": True,
                 "message": "No approvers found, notice approved automatically",
@@ -762,13 +769,16 @@ def request_approval(current_user):
                 status="pending"
             ).save()
             approval_ids.append(str(approval.id))
+        approval_changed()
             
         # Update the notice with approval workflow
         notice.update(
             set__approval_workflow=approval_ids,
             set__approval_status="pending",
-            set__status="pending_approval"
+            set__status="pending_approval",
+            set__updated_at=datetime.now()
         )
+        notice_changed(notice)
         
         return jsonify({
             "success": True,
@@ -788,66 +798,91 @@ def request_approval(current_user):
             "message": "Failed to request approval"
         }), 500
 
+_approval_row = compile_spec((
+    ("_id", "_id", None, str),
+    ("notice_id", "notice_id", None, str),
+    ("status", "status", None),
+    ("comments", "comments", None),
+    ("createdAt", "created_at", None),
+    ("approvedAt", "approved_at", None),
+    ("approver_name", "approver_name", None),
+    ("approver_role", "approver_role", None),
+    ("approved_by_name", "approved_by_name", None),
+))
+_approval_notice = compile_spec((
+    ("_id", "_id", None, str),
+    ("title", "title", None),
+    ("content", "content", None),
+    ("notice_type", "notice_type", None),
+    ("attachments", "attachments", []),
+    ("created_at", "created_at", None),
+    ("approval_status", "approval_status", None),
+))
+
+
+@approval_bp.route('/turnaround', methods=['GET'])
+@token_required
+@role_required(['academic'])
+def get_approval_turnaround(current_user):
+    """
+    p50 / p90 / p99 time from approval request to decision over ?period=
+    (7d, 30d, 90d, 365d or all), overall and by approver, role and department.
+    Slowest (by p90) first.
+    """
+    try:
+        period = parse_period(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        report = analytics_cache.get_or_compute('approvals', ('turnaround', period), lambda: approval_turnaround(period))
+        return jsonify(report), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
 @approval_bp.route('/my', methods=['GET'])
 @token_required
 def get_my_approvals(current_user):
     try:
         print(f"Fetching approvals for user: {current_user.id}, {current_user.name}")
         
-        # Get approvals for the current user
-        approvals = Approval.objects(approver_id=str(current_user.id)).order_by('-created_at')
-        
-        print(f"Found {approvals.count()} approvals in database")
+        # Get approvals for the current user as raw rows
+        approvals = list(Approval.objects(approver_id=str(current_user.id)).only(
+            'id', 'notice_id', 'status', 'comments', 'created_at', 'approved_at',
+            'approver_name', 'approver_role', 'approved_by_name'
+        ).order_by('-created_at').as_pymongo())
+        
+        print(f"Found {len(approvals)} approvals in database")
+        
+        # Load every referenced notice in one query instead of dereferencing per approval
+        notice_ids = list({a['notice_id'] for a in approvals if a.get('notice_id')})
+        notices = {
+            row['_id']: _approval_notice(row)
+            for row in Notice.objects(id__in=notice_ids).only(
+                'id', 'title', 'content', 'notice_type', 'attachments', 'created_at', 'approval_status'
+            ).as_pymongo()
+        }
         
         # Prepare response data
         approvals_data = []
         for approval in approvals:
-            print(f"Processing approval: {approval.id}, status: {approval.status}")
-            
-            # Get the associated notice - With ReferenceField, notice_id is the Notice object
-            try:
-                notice = approval.notice_id
-                if not notice:
-                    print(f"Notice not found for approval {approval.id}")
-                    continue
-                    
-                print(f"Found notice: {notice.title}")
-                
-                approval_data = {
-                    "_id": str(approval.id),
-                    "notice_id": str(notice.id),
-                    "status": approval.status,
-                    "comments": approval.comments,
-                    "createdAt": approval.created_at.isoformat(),
-                    "approvedAt": approval.approved_at.isoformat() if approval.approved_at else None,
-                    "approver_name": approval.approver_name,
-                    "approver_role": approval.approver_role,
-                    "approved_by_name": approval.approved_by_name,
-                    "notice": {
-                        "_id": str(notice.id),
-                        "title": notice.title,
-                        "content": notice.content,
-                        "notice_type": notice.notice_type,
-                        "attachments": notice.attachments or [],
-                        "created_at": notice.created_at.isoformat() if notice.created_at else None,
-                        "approval_status": notice.approval_status
-                    }
-                }
-                
-                approvals_data.append(approval_data)
-                print(f"Added approval to response: {approval.id}")
-                
-            except Exception as e:
-                print(f"Error processing approval {approval.id}: {str(e)}")
+            notice = notices.get(approval.get('notice_id'))
+            if not notice:
+                print(f"Notice not found for approval {approval['_id']}")
                 continue
+            approval_data = _approval_row(approval)
+            approval_data["notice"] = notice
+            approvals_data.append(approval_data)
                 
         print(f"Returning {len(approvals_data)} approvals in response")
         
-        return jsonify({
+        return json_response({
             "success": True,
             "approvals": approvals_data,
             "count": len(approvals_data)
-        }), 200
+        })
         
     except Exception as e:
         print(f"Error in get_my_approvals: {str(e)}")
@@ -907,6 +942,7 @@ def approve_notice(current_user, approval_id):
             approved_by_name=current_user.name,
             approved_by_role=current_user.role
         )
+        approval_changed(approval)
         
         # Get the notice and approve it immediately
         notice = approval.notice_id
@@ -917,8 +953,10 @@ def approve_notice(current_user, approval_id):
                 approved_by=str(current_user.id),
                 approved_by_name=current_user.name,
                 approved_at=datetime.utcnow(),
-                approval_comments=f"Approved by {current_user.name} ({current_user.role})"
+                approval_comments=f"Approved by {current_user.name} ({current_user.role})",
+                updated_at=datetime.now()
             )
+            notice_changed(notice)
                 
         return jsonify({
             "message": "Notice approved successfully",
@@ -953,6 +991,7 @@ def reject_notice(current_user, approval_id):
             approved_by_name=current_user.name,
             approved_by_role=current_user.role
         )
+        approval_changed(approval)
         
         # Immediately reject the notice
         notice = approval.notice_id
@@ -963,8 +1002,10 @@ def reject_notice(current_user, approval_id):
                 approved_by=str(current_user.id),
                 approved_by_name=current_user.name,
                 approved_at=datetime.utcnow(),
-                rejection_reason=reason
+                rejection_reason=reason,
+                updated_at=datetime.now()
             )
+            notice_changed(notice)
         
         return jsonify({"message": "Notice rejected"}), 200
     except Exception as e:
@@ -996,6 +1037,7 @@ def sign_approval(current_user, approval_id):
             approved_by_name=current_user.name,
             approved_by_role=current_user.role
         )
+        approval_changed(approval)
         
         # Get the notice and approve it immediately
         notice = approval.notice_id
@@ -1007,8 +1049,10 @@ def sign_approval(current_user, approval_id):
                 approved_by=str(current_user.id),
                 approved_by_name=current_user.name,
                 approved_at=datetime.utcnow(),
-                approval_comments=f"Signed and approved by {current_user.name} ({current_user.role})"
+                approval_comments=f"Signed and approved by {current_user.name} ({current_user.role})",
+                updated_at=datetime.now()
             )
+            notice_changed(notice)
                 
         return jsonify({
             "message": "Approval signed successfully",
@@ -1075,22 +1119,10 @@ def get_approval_tracking(current_user, notice_id):
         # Get approval_status (with fallback)
         approval_status = getattr(notice, 'approval_status', 'not_required')
         
-        # Get created_by_name (with fallback)
-        created_by_name = getattr(notice, 'created_by_name', 'Unknown')
-        
-        # Get created_by employee details (since employees create notices)
-        try:
-            created_by_employee = Employee.objects(id=ObjectId(notice.created_by)).first()
-            if created_by_employee:
-                created_by_name = getattr(created_by_employee, 'name', created_by_name)
-        except:
-            # If not found as employee, try as user (fallback)
-            try:
-                created_by_user = Employee.objects(id=ObjectId(notice.created_by)).first()
-                if created_by_user:
-                    created_by_name = getattr(created_by_user, 'name', created_by_name)
-            except:
-                pass  # Keep the default 'Unknown'
+        # Resolve the creator (Employee or legacy User), falling back to the name stored on the notice
+        created_by_name = resolve_creator(notice.created_by)["name"]
+        if created_by_name == "Unknown":
+            created_by_name = getattr(notice, 'created_by_name', None) or 'Unknown'
         
         # Get notice title with fallback
         notice_title = getattr(notice, 'title', 'Untitled Notice')
@@ -1139,7 +1171,8 @@ def update_approval_settings(current_user, notice_id):
         data = request.json
         auto_publish = data.get('auto_publish_after_approval', False)
         
-        notice.update(auto_publish_after_approval=auto_publish)
+        notice.update(auto_publish_after_approval=auto_publish, updated_at=datetime.now())
+        notice_changed(notice)
         
         return jsonify({
             "message": "Settings updated successfully",
@@ -1175,14 +1208,16 @@ def manually_publish_notice(current_user, notice_id):
         # Publish the notice
         notice.update(
             status='published',
-            publish_at=datetime.datetime.utcnow()
+            publish_at=datetime.utcnow(),
+            updated_at=datetime.now()
         )
+        notice_changed(notice)
         
         # TODO: Send notifications to recipients
         
         return jsonify({
             "message": "Notice published successfully",
-            "published_at": datetime.datetime.utcnow().isoformat()
+            "published_at": datetime.utcnow().isoformat()
         }), 200
         
     except Exception as e:
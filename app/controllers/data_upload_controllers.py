@@ -21,6 +21,8 @@ from ..models.employee_model import Employee
 from ..models.course_model import Course
 from ..models.department_model import Department
 from ..middleware.auth_middleware import token_required, role_required
+from ..utils.conditional import conditional, catalog_validator, bump_version
+from ..utils.creator_directory import forget_creators
 
 # Import socketio from extensions
 from app.extensions import socketio
@@ -56,6 +58,7 @@ data_upload_bp = Blueprint('data_upload_api', __name__, url_prefix="/api")
 
 @data_upload_bp.route('/departments', methods=['GET'])
 @token_required
+@conditional(catalog_validator)
 def get_departments(current_user):
     try:
         departments = Department.objects.only('name', 'code').order_by('name')
@@ -65,6 +68,7 @@ def get_departments(current_user):
 
 @data_upload_bp.route('/departments/<code>/courses', methods=['GET'])
 @token_required
+@conditional(catalog_validator)
 def get_courses_by_department(current_user, code):
     try:
         department = Department.objects(code=code).first()
@@ -151,6 +155,7 @@ def upload_student_details(current_user):
 
         if students_to_create:
             Student.objects.insert(students_to_create)
+            bump_version('catalog')
             # Emit socket event for real-time updates using safe function
             safe_socket_emit('students_uploaded', {
                 'count': len(students_to_create),
@@ -212,6 +217,7 @@ def add_student_manual(current_user):
             raw_password=raw_password  # Store raw password for reference only
         )
         student.save()
+        bump_version('catalog')
         
         # Emit socket event for real-time updates using safe function
         safe_socket_emit('student_added', {
@@ -248,6 +254,7 @@ def update_student_manual(current_user, univ_roll_no):
         student.email = data.get('official_email', student.email).lower()
         
         student.save()
+        bump_version('catalog')
         
         # Emit socket event for real-time updates using safe function
         safe_socket_emit('student_updated', {
@@ -409,6 +416,7 @@ def update_teacher_manual(current_user, employee_id):
         teacher.role = data.get('role', teacher.role)
 
         teacher.save()
+        forget_creators([teacher.id])
         
         # Emit socket event for real-time updates using safe function
         safe_socket_emit('teacher_updated', {
@@ -449,6 +457,7 @@ def batch_update_teachers(current_user):
                 teacher.role = teacher_data.get('role', teacher.role)
                 
                 teacher.save()
+                forget_creators([teacher.id])
                 updated_count += 1
             else:
                 failed_ids.append(employee_id)
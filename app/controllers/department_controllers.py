@@ -1,11 +1,13 @@
 from flask import Blueprint, jsonify
 from ..models.department_model import Department, Course
 from ..middleware.auth_middleware import token_required
+from ..utils.conditional import conditional, catalog_validator, bump_version
 
 department_bp = Blueprint('departments', __name__, url_prefix='/api/departments')
 
 @department_bp.route("", methods=["GET"])
 @token_required
+@conditional(catalog_validator)
 def get_departments(current_user):
     try:
         departments = Department.objects.only('name', 'code').order_by('name')
@@ -15,6 +17,7 @@ def get_departments(current_user):
 
 @department_bp.route("/<code>/courses", methods=["GET"])
 @token_required
+@conditional(catalog_validator)
 def get_courses_by_department(current_user, code):
     try:
         department = Department.objects(code=code).first()
@@ -113,6 +116,7 @@ def seed_departments():
             courses = [Course(name=c['name'], code=c['code']) for c in dept_info['courses']]
             department = Department(name=dept_info['name'], code=dept_info['code'], courses=courses)
             department.save()
+        bump_version('catalog')
         return jsonify({"message": f"Seeded {len(department_data)} departments"}), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
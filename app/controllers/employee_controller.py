@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify
 from ..models.employee_model import Employee
 from ..middleware.auth_middleware import token_required
+from ..utils.serializers import json_response
 
 employee_bp = Blueprint('employees', __name__, url_prefix='/api/employees')
 
@@ -11,8 +12,8 @@ def get_employees(current_user):
     Get all employees (for approver selection)
     """
     employees = Employee.objects().only(
-        '_id', 'name', 'department', 'post', 'official_email', 'role'
-    ).exclude('password', 'raw_password')
+        'id', 'name', 'department', 'post', 'official_email', 'role'
+    ).as_pymongo()
     
     # Filter out non-approvers if needed
     # approvers = [emp for emp in employees if emp.role in ['admin', 'academic']]
@@ -20,7 +21,8 @@ def get_employees(current_user):
     # return jsonify([emp.to_dict() for emp in approvers]), 200
 
 
-    return jsonify([emp.to_mongo().to_dict() for emp in employees]), 200
+    # Raw rows straight to the encoder (ObjectId _id is written as a string)
+    return json_response(list(employees))
 
 
 @employee_bp.route('/me', methods=['GET'])
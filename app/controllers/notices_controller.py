@@ -7,12 +7,38 @@ import traceback
 import threading # ✅ ADDED: Threading import
 from werkzeug.utils import secure_filename
 from ..models.notice_model import Notice
-from ..models.user_model import User
 from ..models.student_model import Student
 from ..models.department_model import Department
 from ..models.employee_model import Employee
-from ..middleware.auth_middleware import token_required, role_required
+from ..middleware.auth_middleware import token_required, role_required, user_from_token, TokenError
 from ..utils.email_send_function import send_bulk_email
+from ..utils.pagination import (
+    wants_pagination, parse_pagination_args, check_cursor_sort, paginate_queryset, page_payload, MAX_PAGE_SIZE
+)
+from ..utils.notice_summary import summary_queryset, notice_summary
+from ..utils.notice_filters import parse_notice_filters, parse_notice_sort
+from ..utils.notice_feed import feed_queryset, feed_query_for, cohort_key, cached_feed_page
+from ..utils.notice_search import parse_search_query, ranked_search
+from ..utils.notice_sync import parse_sync_token, changes_since, record_deletion, SyncTokenExpired
+from ..utils.notice_events import notice_changed, notice_read, approval_changed
+from ..utils.serializers import json_response, compile_spec
+from ..utils.read_store import (
+    record_read, apply_reads, user_read, forget_reads, engagement_stats, ENGAGEMENT_FIELDS,
+    reader_queryset, parse_reader_args, top_readers, wants_read_state, overlay_read_state, my_read_counts,
+    ReadsNotCounted
+)
+from ..utils.read_buffer import read_buffer, is_buffered
+from ..utils.dwell_tracker import dwell_tracker
+from ..utils.notice_analytics import notice_analytics_summary
+from ..utils.analytics_publisher import analytics_publisher
+from ..utils.analytics_cache import analytics_cache, notice_scope
+from ..utils.analytics_rollup import analytics_rollup, parse_daily_range, daily_analytics
+from ..utils.notice_reach import notice_reach, audience_size
+from ..utils.reach_bitmaps import bitmap_reach, bitmap_audience_size, reader_overlap
+from ..utils.read_timeseries import parse_timeseries_args, read_buckets, reach_milestones
+from config import Config
+from ..utils.creator_directory import resolve_creators, resolve_creator
+from ..utils.conditional import conditional, notice_collection_validator, notice_validator, catalog_validator
 from ..models.approval_model import Approval
 # from ..models.notification_model import Notification
 from ..extensions import socketio
@@ -76,28 +102,74 @@ def emit_notice_read_v2(notice_id, user_id, read_count):
     except Exception as e:
         current_app.logger.error(f"Error emitting notice_read_update: {str(e)}")
 
-def emit_analytics_update():
-    """Emit general analytics updates"""
+def emit_notice_reads_flushed(notice_id, reads_added, new_readers):
+    """
+    Emit one coalesced update per notice after a read buffer flush. It has its
+    own event so notice_read_update keeps its per-reader payload.
+    """
     try:
         if socketio and hasattr(socketio, 'emit'):
-            total_notices = Notice.objects.count()
-            total_reads = sum(notice.read_count for notice in Notice.objects())
-            
-            socketio.emit('analytics_update', {
-                'totalNotices': total_notices,
-                'totalReads': total_reads,
+            socketio.emit('notice_reads_flushed', {
+                'noticeId': str(notice_id),
+                'readsAdded': reads_added,
+                'newReaders': new_readers,
                 'timestamp': datetime.datetime.utcnow().isoformat()
-            }, namespace='/notices', room='analytics')
+            }, namespace='/notices')
     except Exception as e:
-        current_app.logger.error(f"Error emitting analytics_update: {str(e)}")
+        current_app.logger.error(f"Error emitting notice_reads_flushed: {str(e)}")
+
+def start_read_buffer(app):
+    """
+    Start the background read flusher (called from create_app). In sync mode
+    it only finishes read batches that failed part way.
+    """
+    def publish(flushed):
+        with app.app_context():
+            for notice_id, (reads_added, new_readers) in flushed.items():
+                emit_notice_reads_flushed(notice_id, reads_added, new_readers)
+                notice_read(notice_id)
+
+    read_buffer.start(on_flush=publish, flush_on_exit=Config.READ_BUFFER_FLUSH_ON_EXIT)
+
+def start_dwell_tracker():
+    """Start the background time-spent flusher (called from create_app)"""
+    dwell_tracker.start(flush_on_exit=Config.READ_BUFFER_FLUSH_ON_EXIT)
+
+ANALYTICS_ROOM = 'analytics'
+
+def emit_analytics_update():
+    """Request an analytics broadcast; the debounced publisher coalesces bursts"""
+    analytics_publisher.mark_dirty()
+
+def _analytics_room_has_members():
+    try:
+        return any(True for _ in socketio.server.manager.get_participants('/notices', ANALYTICS_ROOM))
+    except Exception:
+        return False
+
+def start_analytics_publisher(app):
+    """Start the debounced analytics broadcaster (called from create_app)"""
+    def publish():
+        with app.app_context():
+            payload = dict(analytics_cache.get_or_compute('summary', 'all', notice_analytics_summary))
+            payload['timestamp'] = datetime.datetime.utcnow().isoformat()
+            socketio.emit('analytics_update', payload, namespace='/notices', room=ANALYTICS_ROOM)
+
+    analytics_publisher.start(publish=publish, has_audience=_analytics_room_has_members)
+
+def start_analytics_rollup():
+    """Start the incremental daily analytics rollup (called from create_app)"""
+    analytics_rollup.start()
 
 @socketio.on('join_analytics_room', namespace='/notices')
 def handle_join_analytics_room(data):
     """Handle clients joining the analytics room"""
     try:
         from flask_socketio import join_room
-        join_room('analytics')
+        join_room(ANALYTICS_ROOM)
         current_app.logger.info(f"Client joined analytics room: {request.sid}")
+        # Newcomers get a fresh snapshot on the next publish
+        analytics_publisher.mark_dirty()
         socketio.emit('connected', {'message': 'Joined analytics room'}, 
                      namespace='/notices', room=request.sid)
     except Exception as e:
@@ -108,11 +180,26 @@ def handle_leave_analytics_room(data):
     """Handle clients leaving the analytics room"""
     try:
         from flask_socketio import leave_room
-        leave_room('analytics')
+        leave_room(ANALYTICS_ROOM)
         current_app.logger.info(f"Client left analytics room: {request.sid}")
     except Exception as e:
         current_app.logger.error(f"Error leaving analytics room: {str(e)}")
 
+@socketio.on('notice_heartbeat', namespace='/notices')
+def handle_notice_heartbeat(data):
+    """Time-spent heartbeat over the socket: {notice_id, token} while a notice is open"""
+    try:
+        notice_id = (data or {}).get('notice_id')
+        token = (data or {}).get('token')
+        if not notice_id or not token or not ObjectId.is_valid(notice_id):
+            return
+        user = user_from_token(token, request.remote_addr)
+        dwell_tracker.heartbeat(ObjectId(notice_id), str(user.id))
+    except TokenError:
+        return
+    except Exception as e:
+        current_app.logger.error(f"Error handling notice heartbeat: {str(e)}")
+
 @socketio.on('join_notice_room', namespace='/notices')
 def handle_join_notice_room(data):
     """Handle clients joining a specific notice room"""
@@ -140,44 +227,30 @@ def handle_leave_notice_room(data):
 
 @notice_bp.route("", methods=["GET"])
 @token_required
+@conditional(notice_collection_validator)
 def get_notices(current_user):
     try:
-        notices = Notice.objects().order_by('-created_at')
-        user_map = {str(user.id): user for user in User.objects.only('id', 'name', 'email')}
+        page_args = parse_pagination_args(request.args) if wants_pagination(request.args) else None
+        filters = parse_notice_filters(request.args)
+        sort_field, descending = parse_notice_sort(request.args)
+        check_cursor_sort(page_args, sort_field, descending)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-        notices_data = []
-        for notice in notices:
-            creator = user_map.get(notice.created_by)
-            notices_data.append({
-                "id": str(notice.id),
-                "title": notice.title,
-                "subject": notice.subject,
-                "content": notice.content,
-                "notice_type": notice.notice_type,
-                "departments": notice.departments,
-                "program_course": notice.program_course,
-                "specialization": notice.specialization,
-                "year": notice.year,
-                "section": notice.section,
-                "priority": notice.priority,
-                "status": notice.status,
-                "from_field": notice.from_field,
-                "publish_at": notice.publish_at.isoformat() if notice.publish_at else None,
-                "created_at": notice.created_at.isoformat(),
-                "read_count": notice.read_count,
-                "requires_approval": notice.requires_approval,
-                "approval_status": notice.approval_status,
-                "approved_by_name": notice.approved_by_name,
-                "approved_at": notice.approved_at.isoformat() if notice.approved_at else None,
-                "createdBy": {
-                    "id": notice.created_by,
-                    "name": creator.name if creator else "Unknown",
-                    "email": creator.email if creator else ""
-                },
-                "attachments": notice.attachments or []
-            })
+    try:
+        notices, next_cursor = paginate_queryset(
+            summary_queryset(Notice.objects(**filters)), page_args, field=sort_field, descending=descending
+        )
+        notices = list(notices)
+        creators = resolve_creators(raw.get('created_by') for raw in notices)
 
-        return jsonify(notices_data), 200
+        notices_data = [notice_summary(raw, creators[raw.get('created_by')]) for raw in notices]
+        if wants_read_state(request.args):
+            notices_data = overlay_read_state(notices_data, current_user.id)
+
+        if page_args is not None:
+            return json_response(page_payload(notices_data, next_cursor))
+        return json_response(notices_data)
 
     except Exception as e:
         traceback.print_exc()
@@ -268,6 +341,7 @@ def create_notice(current_user):
                         status="pending"
                     ).save()
                     approval_ids.append(approval.id)
+                approval_changed()
                 
                 notice.update(
                     set__approval_workflow=approval_ids,
@@ -304,6 +378,7 @@ def create_notice(current_user):
             "priority": notice.priority
         }
         emit_notice_update('created', notice_data)
+        notice_changed(notice)
         
         response_data = {
             "message": "Notice created successfully",
@@ -329,71 +404,132 @@ def create_notice(current_user):
 
 @notice_bp.route("/my", methods=["GET"])
 @token_required
+@conditional(notice_collection_validator)
 def get_my_notices(current_user):
+    """
+    Personal feed: published notices whose audience (departments, course,
+    year, section) matches the current user. Always paginated, and always
+    carries the caller's read state (``is_read`` / ``my_read_count``).
+    """
     try:
-        # Determine user type and fetch their document
-        if hasattr(current_user, 'univ_roll_no'):  # Student
-            user = Student.objects(id=current_user.id).only('notices').first()
-        else:  # Employee
-            user = Employee.objects(id=current_user.id).only('notices').first()
-            
-        if not user:
-            return jsonify({"error": "User not found"}), 404
+        page_args = parse_pagination_args(request.args)
+        check_cursor_sort(page_args, 'created_at')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-        # Extract just the Notice IDs from the user's notices list
-        notice_ids = [notice.id for notice in user.notices]
-
-        # Get all notices for this user (sorted by creation date)
-        notices = Notice.objects(id__in=notice_ids).order_by('-created_at')
+    def build_page():
+        notices, next_cursor = paginate_queryset(summary_queryset(feed_queryset(current_user)), page_args)
         
         # Get creator information in bulk for efficiency
-        creator_ids = list({notice.created_by for notice in notices})
-        creators = {str(user.id): user for user in User.objects(id__in=creator_ids).only('id', 'name', 'email')}
+        creators = resolve_creators(raw.get('created_by') for raw in notices)
         
-        # Prepare response data with all necessary fields
-        notices_data = []
-        for notice in notices:
-            creator = creators.get(notice.created_by)
-            notices_data.append({
-                "id": str(notice.id),
-                "title": notice.title,
-                "subject": notice.subject,
-                "content": notice.content,
-                "notice_type": notice.notice_type,
-                "priority": notice.priority,
-                "created_at": notice.created_at.isoformat(),
-                "attachments": notice.attachments or [],
-                "from_field": notice.from_field,
-                "approval_status": notice.approval_status,
-                "approved_by_name": notice.approved_by_name,
-                "approved_at": notice.approved_at.isoformat() if notice.approved_at else None,
-                "createdBy": {
-                    "id": notice.created_by,
-                    "name": creator.name if creator else "Unknown",
-                    "email": creator.email if creator else ""
-                },
-                "departments": notice.departments,
-                "program_course": notice.program_course,
-                "year": notice.year,
-                "section": notice.section,
-                "status": notice.status
-            })
+        return [notice_summary(raw, creators[raw.get('created_by')]) for raw in notices], next_cursor
+
+    try:
+        # The page itself is shared by the whole cohort; only read state is per user
+        notices_data, next_cursor = cached_feed_page(current_user, page_args, build_page)
+        notices_data = overlay_read_state(notices_data, current_user.id)
         
-        return jsonify(notices_data), 200
+        return json_response(page_payload(notices_data, next_cursor))
         
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": "Failed to fetch notices", "details": str(e)}), 500
 
+@notice_bp.route("/search", methods=["GET"])
+@token_required
+@conditional(notice_collection_validator)
+def search_notices(current_user):
+    """
+    Full-text search over title, subject and content, ranked by relevance
+    with recency and priority boosts. Accepts the same filters as the list
+    endpoint; students only ever see notices addressed to them. Always
+    paginated, ordered by rank.
+    """
+    try:
+        q = parse_search_query(request.args)
+        limit, after = parse_pagination_args(request.args)
+        filters = parse_notice_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        clauses = [Notice.objects(**filters)._query]
+        if isinstance(current_user, Student):
+            clauses.append(feed_query_for(current_user))
+        clauses = [c for c in clauses if c]
+        match = {'$and': clauses} if len(clauses) > 1 else (clauses[0] if clauses else {})
+
+        rows, next_cursor = ranked_search(Notice._get_collection(), q, match, limit, after)
+        creators = resolve_creators(raw.get('created_by') for raw in rows)
+
+        notices_data = []
+        for raw in rows:
+            item = notice_summary(raw, creators[raw.get('created_by')])
+            item["score"] = round(raw['rank'], 4)
+            notices_data.append(item)
+        if wants_read_state(request.args):
+            notices_data = overlay_read_state(notices_data, current_user.id)
+
+        return json_response(page_payload(notices_data, next_cursor))
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": "Failed to search notices", "details": str(e)}), 500
+
+
+@notice_bp.route("/changes", methods=["GET"])
+@token_required
+def get_notice_changes(current_user):
+    """
+    Delta sync: notices created, updated or deleted after ``since`` (a token
+    from the previous call). Without ``since`` the whole list is sent, oldest
+    change first, in pages of ``limit``. Keep calling with ``next_token``
+    while ``has_more`` is true. A 410 means the token is too old and the
+    client should drop its cache and sync from scratch.
+    """
+    try:
+        since = parse_sync_token(request.args)
+        limit, _ = parse_pagination_args({'limit': request.args.get('limit', MAX_PAGE_SIZE)})
+    except SyncTokenExpired:
+        return jsonify({"error": "Sync token expired, full resync required", "full_resync": True}), 410
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        # Students only receive notices addressed to them
+        cohort = cohort_key(current_user) if isinstance(current_user, Student) else None
+        rows, deleted, next_token, has_more = changes_since(since, limit, cohort)
+        creators = resolve_creators(raw.get('created_by') for raw in rows)
+
+        notices_data = [notice_summary(raw, creators[raw.get('created_by')]) for raw in rows]
+        if wants_read_state(request.args):
+            notices_data = overlay_read_state(notices_data, current_user.id)
+
+        return json_response({
+            "notices": notices_data,
+            "deleted": deleted,
+            "next_token": next_token,
+            "has_more": has_more
+        })
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": "Failed to fetch changes", "details": str(e)}), 500
+
+
 @notice_bp.route("/<notice_id>", methods=["GET"])
 @token_required
+@conditional(notice_validator)
 def get_notice(current_user, notice_id):
     try:
         notice = Notice.objects(id=ObjectId(notice_id)).first()
         if not notice:
             return jsonify({"error": "Notice not found"}), 404
         
-        creator = User.objects(id=ObjectId(notice.created_by)).first()
+        creator = resolve_creator(notice.created_by)
         
         # Build response with all model fields
         notice_data = {
@@ -423,11 +559,7 @@ def get_notice(current_user, notice_id):
             "approved_by_name": notice.approved_by_name,
             "approved_at": notice.approved_at.isoformat() if notice.approved_at else None,
             "approval_comments": notice.approval_comments,
-            "createdBy": {
-                "id": notice.created_by,
-                "name": creator.name if creator else "Unknown",
-                "email": creator.email if creator else ""
-            },
+            "createdBy": creator,
             "attachments": notice.attachments
         }
         
@@ -447,6 +579,7 @@ def update_notice(current_user, notice_id):
             return jsonify({"error": "Notice not found or unauthorized"}), 404
             
         form_data = request.form
+        previous_audience = (list(notice.departments), notice.program_course, notice.year, notice.section)
         
         # Update fields
         notice.title = form_data.get('title', notice.title)
@@ -492,6 +625,10 @@ def update_notice(current_user, notice_id):
             "updated_at": notice.updated_at.isoformat()
         }
         emit_notice_update('updated', notice_data)
+        if previous_audience != (notice.departments, notice.program_course, notice.year, notice.section):
+            notice_changed(None)  # Retargeted: feeds of the old audience are stale as well
+        else:
+            notice_changed(notice)
         
         # Clean up attachments
         for path in attachment_paths:
@@ -522,8 +659,13 @@ def delete_notice(current_user, notice_id):
             "title": notice.title
         }
         emit_notice_update('deleted', notice_data)
-            
+        
+        # Tombstone first: a failed delete only costs a client a refetch,
+        # a missing tombstone would leave the notice in their cache forever
+        record_deletion(notice)
         notice.delete()
+        forget_reads(notice.id)
+        notice_changed(notice)
         
         # Also emit analytics update
         emit_analytics_update()
@@ -543,195 +685,352 @@ def mark_notice_read(current_user, notice_id):
     Increments read count for each user visit.
     """
     try:
-        notice = Notice.objects(id=ObjectId(notice_id)).first()
+        if is_buffered():
+            # Acknowledge now; the read is written by the next buffer flush
+            if not ObjectId.is_valid(notice_id):
+                return jsonify({"error": "Notice not found"}), 404
+            queued = read_buffer.add(ObjectId(notice_id), str(current_user.id))
+            return jsonify({
+                "message": "Read queued" if queued else "Repeat read ignored",
+                "queued": queued
+            }), 202
+
+        notice = Notice.objects(id=ObjectId(notice_id)).only('id', 'read_count').as_pymongo().first()
         if not notice:
             return jsonify({"error": "Notice not found"}), 404
 
         user_id = str(current_user.id)
-        now = datetime.datetime.utcnow()
 
-        # Initialize reads array if it doesn't exist
-        if not hasattr(notice, 'reads') or notice.reads is None:
-            notice.reads = []
+        # One atomic upsert on notice_reads; Notice.read_count (unique readers) moves on first read only
+        read_count, is_new_read = record_read(notice['_id'], user_id)
+        unique_readers = notice.get('read_count', 0) + (1 if is_new_read else 0)
 
-        # Find existing read record for this user
-        existing_read = None
-        read_index = None
-        
-        for i, read in enumerate(notice.reads):
-            if read.get('user_id') == user_id:
-                existing_read = read
-                read_index = i
-                break
+        # EMIT SOCKET EVENT FOR READ UPDATE
+        emit_notice_read_v2(notice['_id'], user_id, read_count)
+        notice_read(notice['_id'])
 
-        if existing_read:
-            # User has read before - increment their read count
-            updated_read_count = existing_read.get('read_count', 1) + 1
-            
-            # Create updated read record
-            updated_read = {
-                "user_id": user_id,
-                "read_count": updated_read_count,
-                "first_read_at": existing_read.get('first_read_at', existing_read.get('timestamp', now)),
-                "last_read_at": now,
-                "total_time_spent": existing_read.get('total_time_spent', 0)
-            }
-            
-            # Update the specific read record in the array
-            notice.reads[read_index] = updated_read
-            notice.save()
-            
-            # EMIT SOCKET EVENT FOR READ UPDATE - FIXED CALL
-            emit_notice_read_v2(notice.id, user_id, updated_read_count)
-            
-            return jsonify({
-                "message": f"Read count updated to {updated_read_count}",
-                "isNewRead": False,
-                "readCount": updated_read_count,
-                "totalUniqueReaders": len(notice.reads)
-            }), 200
-            
-        else:
-            # First time this user is reading - add new read record
-            new_read = {
-                "user_id": user_id,
-                "read_count": 1,
-                "first_read_at": now,
-                "last_read_at": now,
-                "total_time_spent": 0
-            }
-            
-            # Add to reads array and increment unique reader count
-            notice.update(
-                push__reads=new_read,
-                inc__read_count=1  # This tracks unique readers
-            )
-            
-            # EMIT SOCKET EVENT FOR NEW READ - FIXED CALL
-            emit_notice_read_v2(notice.id, user_id, 1)
-            
+        if is_new_read:
             return jsonify({
                 "message": "First read recorded",
                 "isNewRead": True,
                 "readCount": 1,
-                "totalUniqueReaders": notice.read_count + 1
+                "totalUniqueReaders": unique_readers
             }), 200
 
+        return jsonify({
+            "message": f"Read count updated to {read_count}",
+            "isNewRead": False,
+            "readCount": read_count,
+            "totalUniqueReaders": unique_readers
+        }), 200
+
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": f"Failed to track read: {str(e)}"}), 500
 
 
+@notice_bp.route("/<notice_id>/heartbeat", methods=["POST"])
+@token_required
+def notice_heartbeat(current_user, notice_id):
+    """
+    Sent every few seconds while the notice is open. Only touches memory;
+    accumulated time is written to total_time_spent in periodic bulk flushes.
+    """
+    if not ObjectId.is_valid(notice_id):
+        return jsonify({"error": "Notice not found"}), 404
+    dwell_tracker.heartbeat(ObjectId(notice_id), str(current_user.id))
+    return jsonify({"next_heartbeat_seconds": Config.DWELL_HEARTBEAT_SECONDS}), 200
+
+
+MAX_READ_BATCH = 100
+
+
+@notice_bp.route("/read-batch", methods=["POST"])
+@token_required
+def mark_notices_read_batch(current_user):
+    """
+    Record reads of several notices at once (e.g. on app open).
+    Body: ``{"notice_ids": [...]}``. All reads go out in one bulk write and
+    each affected notice gets a single coalesced socket update.
+    """
+    data = request.get_json(silent=True) or {}
+    notice_ids = data.get('notice_ids')
+    if not isinstance(notice_ids, list) or not notice_ids:
+        return jsonify({"error": "notice_ids must be a non-empty list"}), 400
+    if len(notice_ids) > MAX_READ_BATCH:
+        return jsonify({"error": f"At most {MAX_READ_BATCH} notice_ids per batch"}), 400
+
+    valid = list(dict.fromkeys(str(n) for n in notice_ids if ObjectId.is_valid(str(n))))
+    invalid = [n for n in notice_ids if not ObjectId.is_valid(str(n))]
+    user_id = str(current_user.id)
+
+    try:
+        if is_buffered():
+            queued = [n for n in valid if read_buffer.add(ObjectId(n), user_id)]
+            return jsonify({
+                "message": f"{len(queued)} reads queued",
+                "queued": queued,
+                "ignored": [n for n in valid if n not in queued] + invalid
+            }), 202
+
+        now = datetime.datetime.utcnow()
+        try:
+            flushed = apply_reads({(ObjectId(n), user_id): (1, now, now) for n in valid}) if valid else {}
+        except ReadsNotCounted as e:
+            # Possibly partly written; the flusher finishes the batch under the same id
+            read_buffer.retry_batch(e.batch)
+            flushed = {notice_id: None for notice_id, _ in e.batch['pending']}
+        applied = [str(notice_id) for notice_id in flushed]
+        # Same per-reader notice_read_update as a single read
+        read_counts = my_read_counts(user_id, applied)
+        for notice_id in flushed:
+            emit_notice_read_v2(notice_id, user_id, read_counts.get(str(notice_id), 1))
+            notice_read(notice_id)
+
+        return jsonify({
+            "message": f"{len(applied)} reads recorded",
+            "applied": applied,
+            "ignored": [n for n in valid if n not in applied] + invalid
+        }), 200
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to track reads: {str(e)}"}), 500
+
+
+@notice_bp.route("/read-buffer/stats", methods=["GET"])
+@token_required
+@role_required(['academic'])
+def get_read_buffer_stats(current_user):
+    """Write-behind health: read buffer lag and counters, plus the dwell-time accumulator"""
+    return jsonify(dict(read_buffer.stats(), mode=Config.READ_BUFFER_MODE, dwell=dwell_tracker.stats())), 200
+
+
+# Reader profile fields for get_notice_reads, applied to raw Student / Employee rows
+_student_reader = compile_spec((
+    ("student_name", "name", None),
+    ("roll_number", "univ_roll_no", None),
+    ("department", "branch", None),
+    ("course", "course", None),
+    ("section", "section", None),
+    ("email", "official_email", None),
+))
+_employee_reader = compile_spec((
+    ("student_name", "name", None),
+    ("department", "department", "N/A"),
+    ("email", "email", None),
+))
+_EMPLOYEE_READER_DEFAULTS = {"roll_number": "N/A", "course": "Employee", "section": "N/A"}
+
+
+def _reader_entries(reads):
+    """Join raw NoticeRead rows with Student / Employee profiles, keeping their order."""
+    user_ids = [read['user_id'] for read in reads if 'user_id' in read]
+    if not user_ids:
+        return []
+
+    # Get all students in bulk
+    students = Student.objects(id__in=user_ids).only(
+        'id', 'name', 'univ_roll_no', 'branch', 
+        'course', 'section', 'official_email'
+    ).as_pymongo()
+    profiles = {str(row['_id']): (_student_reader(row), "student") for row in students}
+
+    # Also try to get employees if students not found
+    if len(profiles) < len(user_ids):
+        missing_ids = [uid for uid in user_ids if uid not in profiles]
+        employees = Employee.objects(id__in=missing_ids).only(
+            'id', 'name', 'email', 'department'
+        ).as_pymongo()
+        for row in employees:
+            profiles[str(row['_id'])] = (dict(_employee_reader(row), **_EMPLOYEE_READER_DEFAULTS), "employee")
+
+    entries = []
+    for read in reads:
+        user_id = read.get('user_id')
+        profile = profiles.get(user_id)
+        if not profile:
+            continue
+        entry, user_type = profile
+        entry = dict(entry)
+        entry["student_id"] = user_id
+        entry["read_count"] = read.get('read_count', 1)
+        entry["first_read"] = read.get('first_read_at')
+        entry["last_read"] = read.get('last_read_at')
+        entry["total_time_spent"] = read.get('total_time_spent', 0)
+        entry["user_type"] = user_type
+        entries.append(entry)
+    return entries
+
+
 @notice_bp.route("/<notice_id>/reads", methods=["GET"])
 @token_required
 def get_notice_reads(current_user, notice_id):
     """
     Get detailed reading analytics for a notice.
     Shows how many times each user has read the notice.
+
+    Summary stats come from the notice's counters and ``top_readers`` from a
+    bounded top-K query (``top``, default 5). Readers are listed by ``sort``
+    (read_count or last_read, newest/most first) in cursor pages of
+    ``limit`` (default 20) resumed with ``after``;
+    ``readers=false`` skips the listing entirely.
     """
     try:
-        notice = Notice.objects(id=ObjectId(notice_id)).first()
+        # Always a page: a widely read notice has thousands of reader rows
+        page_args = parse_pagination_args(request.args)
+        sort_field, top = parse_reader_args(request.args)
+        check_cursor_sort(page_args, sort_field)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def compute():
+        notice = Notice.objects(id=ObjectId(notice_id)).only('title', *ENGAGEMENT_FIELDS).as_pymongo().first()
         if not notice:
+            return None
+
+        leaders = _reader_entries(top_readers(notice['_id'], top))
+        top_name = next((r["student_name"] for r in leaders if r["student_id"] == notice.get('top_reader_id')), None)
+        payload = dict(
+            engagement_stats(notice, top_name),
+            notice_title=notice.get('title'),
+            top_readers=leaders
+        )
+
+        if request.args.get('readers', 'true').lower() == 'false':
+            return payload
+
+        # Ordered (and paged) by the database on the (notice_id, field, _id) index
+        reads, next_cursor = paginate_queryset(reader_queryset(notice['_id']), page_args, field=sort_field)
+        payload["reads"] = _reader_entries(list(reads))
+        payload.update(next_cursor=next_cursor, has_more=next_cursor is not None)
+        return payload
+
+    try:
+        # One entry per query string; every variant is dropped when the notice is read or changed
+        key = ('reads', tuple(sorted(request.args.items(multi=True))))
+        payload = analytics_cache.get_or_compute(notice_scope(ObjectId(notice_id)), key, compute)
+        if payload is None:
             return jsonify({"error": "Notice not found"}), 404
+        return json_response(payload)
 
-        # Handle case where reads might not exist or be empty
-        if not hasattr(notice, 'reads') or not notice.reads:
-            return jsonify({
-                "notice_title": notice.title,
-                "total_reads": 0,
-                "unique_readers": 0,
-                "average_reads_per_user": 0,
-                "reads": []
-            }), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to get reads: {str(e)}"}), 500
 
-        # Extract user IDs from reads
-        user_ids = [read['user_id'] for read in notice.reads if 'user_id' in read]
 
-        # Get all students in bulk
-        students = Student.objects(id__in=user_ids).only(
-            'id', 'name', 'univ_roll_no', 'branch', 
-            'course', 'section', 'official_email'
+@notice_bp.route("/<notice_id>/reach", methods=["GET"])
+@token_required
+@role_required(['academic'])
+def get_notice_reach(current_user, notice_id):
+    """
+    Share of the targeted students who have read the notice: overall and per
+    (branch, course, year, section), plus a ``limit`` / ``after`` page of the
+    students who have not read it yet, ordered by roll number.
+    """
+    try:
+        limit, after = parse_pagination_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        notice = Notice.objects(id=ObjectId(notice_id)).only(
+            'title', 'departments', 'program_course', 'year', 'section', 'read_count'
+        ).as_pymongo().first()
+        if not notice:
+            return jsonify({"error": "Notice not found"}), 404
+
+        reach = bitmap_reach if Config.REACH_ENGINE == 'bitmap' else notice_reach
+        try:
+            summary, non_readers, next_cursor = reach(notice, limit, after)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        payload = dict(
+            summary,
+            noticeId=notice_id,
+            noticeTitle=notice.get('title'),
+            # Unique readers of any kind, including staff and students outside the audience
+            totalReaders=notice.get('read_count', 0)
         )
-        student_map = {str(s.id): s for s in students}
-
-        # Also try to get employees if students not found
-        if len(student_map) < len(user_ids):
-            missing_ids = [uid for uid in user_ids if uid not in student_map]
-            employees = Employee.objects(id__in=missing_ids).only(
-                'id', 'name', 'email', 'department'
-            )
-            for emp in employees:
-                student_map[str(emp.id)] = emp
-
-        # Prepare response data
-        reads_data = []
-        total_reads = 0
-        
-        for read in notice.reads:
-            user_id = read['user_id']
-            user = student_map.get(user_id)
-            if not user:
-                continue
-                
-            read_count = read.get('read_count', 1)
-            total_reads += read_count
-            
-            # Handle both old and new data structures
-            first_read = read.get('first_read_at') or read.get('timestamp')
-            last_read = read.get('last_read_at') or read.get('timestamp')
-            
-            # Check if it's a student or employee
-            if hasattr(user, 'univ_roll_no'):  # Student
-                reads_data.append({
-                    "student_id": user_id,
-                    "student_name": user.name,
-                    "roll_number": user.univ_roll_no,
-                    "department": user.branch,
-                    "course": user.course,
-                    "section": user.section,
-                    "email": user.official_email,
-                    "read_count": read_count,
-                    "first_read": first_read.isoformat() if first_read else None,
-                    "last_read": last_read.isoformat() if last_read else None,
-                    "total_time_spent": read.get('total_time_spent', 0),
-                    "user_type": "student"
-                })
-            else:  # Employee
-                reads_data.append({
-                    "student_id": user_id,
-                    "student_name": user.name,
-                    "roll_number": "N/A",
-                    "department": getattr(user, 'department', 'N/A'),
-                    "course": "Employee",
-                    "section": "N/A",
-                    "email": user.email,
-                    "read_count": read_count,
-                    "first_read": first_read.isoformat() if first_read else None,
-                    "last_read": last_read.isoformat() if last_read else None,
-                    "total_time_spent": read.get('total_time_spent', 0),
-                    "user_type": "employee"
-                })
-
-        # Sort by read count (descending), then by last read time
-        # Sort by read count (descending), then by last read time
-        reads_data.sort(key=lambda x: (x['read_count'], x['last_read'] or ''), reverse=True)
+        payload.update(page_payload(
+            [dict(_student_reader(row), student_id=str(row['_id']), year=row.get('year')) for row in non_readers],
+            next_cursor, key='nonReaders'
+        ))
+        return jsonify(payload), 200
 
-        return jsonify({
-            "notice_title": notice.title,
-            "total_reads": total_reads,  # Sum of all read counts (total interactions)
-            "unique_readers": len(reads_data),  # Number of unique users who read
-            "average_reads_per_user": round(total_reads / len(reads_data), 1) if reads_data else 0,
-            "most_active_reader": {
-                "name": reads_data[0]["student_name"],
-                "read_count": reads_data[0]["read_count"]
-            } if reads_data else None,
-            "high_engagement_users": len([r for r in reads_data if r['read_count'] >= 5]),
-            "reads": reads_data
-        }), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to compute reach: {str(e)}"}), 500
+
+
+@notice_bp.route("/reach/overlap", methods=["GET"])
+@token_required
+@role_required(['academic'])
+def get_reader_overlap(current_user):
+    """How many people read both, only one, or either of notices ``a`` and ``b``"""
+    ids = [request.args.get('a'), request.args.get('b')]
+    if not all(ids) or not all(ObjectId.is_valid(notice_id) for notice_id in ids):
+        return jsonify({"error": "a and b must be notice ids"}), 400
+
+    try:
+        notices = {
+            str(row['_id']): row
+            for row in Notice.objects(id__in=ids).only('id').as_pymongo()
+        }
+        if len(notices) < len(set(ids)):
+            return jsonify({"error": "Notice not found"}), 404
+
+        overlap = reader_overlap(notices[ids[0]], notices[ids[1]])
+        return jsonify(dict(overlap, a=ids[0], b=ids[1])), 200
 
     except Exception as e:
         traceback.print_exc()
-        return jsonify({"error": f"Failed to get reads: {str(e)}"}), 500
+        return jsonify({"error": f"Failed to compute overlap: {str(e)}"}), 500
+
+
+@notice_bp.route("/<notice_id>/reads/timeseries", methods=["GET"])
+@token_required
+def get_notice_read_timeseries(current_user, notice_id):
+    """
+    Reads per hour or day (``granularity``) from the pre-aggregated buckets,
+    plus how many hours after publishing the notice was read by 50% / 90% of
+    its targeted audience.
+    """
+    try:
+        granularity = parse_timeseries_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        notice = Notice.objects(id=ObjectId(notice_id)).only(
+            'title', 'publish_at', 'created_at', 'read_count',
+            'departments', 'program_course', 'year', 'section'
+        ).as_pymongo().first()
+        if not notice:
+            return jsonify({"error": "Notice not found"}), 404
+
+        hourly = read_buckets(notice['_id'], 'hour')
+        buckets = hourly if granularity == 'hour' else read_buckets(notice['_id'], granularity)
+        published_at = notice.get('publish_at') or notice.get('created_at')
+        audience = (bitmap_audience_size if Config.REACH_ENGINE == 'bitmap' else audience_size)(notice)
+
+        return json_response(dict(
+            reach_milestones(hourly, published_at, audience) if published_at else {},
+            notice_title=notice.get('title'),
+            granularity=granularity,
+            published_at=published_at,
+            audience_size=audience,
+            unique_readers=notice.get('read_count') or 0,
+            buckets=[{
+                "start": bucket['bucket_start'],
+                "reads": bucket.get('reads', 0),
+                "new_readers": bucket.get('new_readers', 0)
+            } for bucket in buckets]
+        ))
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to get read time series: {str(e)}"}), 500
 
 
 @notice_bp.route("/<notice_id>/my-reads", methods=["GET"])
@@ -741,27 +1040,20 @@ def get_my_read_count(current_user, notice_id):
     Get the current user's read count for a specific notice.
     """
     try:
-        notice = Notice.objects(id=ObjectId(notice_id)).first()
+        notice = Notice.objects(id=ObjectId(notice_id)).only('id').as_pymongo().first()
         if not notice:
             return jsonify({"error": "Notice not found"}), 404
 
-        user_id = str(current_user.id)
-        
         # Find user's read record
-        user_read = None
-        if hasattr(notice, 'reads') and notice.reads:
-            for read in notice.reads:
-                if read.get('user_id') == user_id:
-                    user_read = read
-                    break
-
-        if user_read:
-            return jsonify({
+        read = user_read(notice['_id'], str(current_user.id))
+
+        if read:
+            return json_response({
                 "hasRead": True,
-                "readCount": user_read.get('read_count', 1),
-                "firstReadAt": user_read.get('first_read_at', user_read.get('timestamp')).isoformat() if user_read.get('first_read_at') or user_read.get('timestamp') else None,
-                "lastReadAt": user_read.get('last_read_at', user_read.get('timestamp')).isoformat() if user_read.get('last_read_at') or user_read.get('timestamp') else None
-            }), 200
+                "readCount": read.get('read_count', 1),
+                "firstReadAt": read.get('first_read_at'),
+                "lastReadAt": read.get('last_read_at')
+            })
         else:
             return jsonify({
                 "hasRead": False,
@@ -778,20 +1070,26 @@ def get_my_read_count(current_user, notice_id):
 @notice_bp.route("/<notice_id>/analytics", methods=["GET"])
 @token_required
 def get_notice_analytics(current_user, notice_id):
-    try:
-        notice = Notice.objects(id=ObjectId(notice_id)).first()
+    def compute():
+        notice = Notice.objects(id=ObjectId(notice_id)).exclude('reads').first()
         if not notice:
-            return jsonify({"error": "Notice not found"}), 404
-            
-        analytics_data = {
+            return None
+        return {
             "recipientCount": len(notice.recipient_emails) if notice.recipient_emails else 0,
             "priority": notice.priority,
             "status": notice.status,
             "publishedAt": notice.publish_at.isoformat() if notice.publish_at else None,
             "createdAt": notice.created_at.isoformat(),
             "attachmentsCount": len(notice.attachments) if notice.attachments else 0,
-            "readPercentage": (notice.read_count / len(notice.recipient_emails)) * 100 if notice.recipient_emails else 0
+            "readPercentage": (notice.read_count / len(notice.recipient_emails)) * 100 if notice.recipient_emails else 0,
+            # O(1) engagement counters kept up to date on every read
+            "engagement": engagement_stats({field: getattr(notice, field) for field in ENGAGEMENT_FIELDS})
         }
+
+    try:
+        analytics_data = analytics_cache.get_or_compute(notice_scope(ObjectId(notice_id)), 'analytics', compute)
+        if analytics_data is None:
+            return jsonify({"error": "Notice not found"}), 404
         
         return jsonify(analytics_data), 200
     except Exception as e:
@@ -803,62 +1101,75 @@ def get_notice_analytics(current_user, notice_id):
 @role_required(['academic'])
 def get_all_notices_analytics(current_user):
     try:
-        total_notices = Notice.objects.count()
-        total_reads = sum(notice.read_count for notice in Notice.objects())
-        
-        return jsonify({
-            "totalNotices": total_notices,
-            "totalReads": total_reads,
-            "averageReadsPerNotice": total_reads / total_notices if total_notices > 0 else 0
-        }), 200
+        return jsonify(analytics_cache.get_or_compute('summary', 'all', notice_analytics_summary)), 200
         
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@notice_bp.route("/analytics/cache/stats", methods=["GET"])
+@token_required
+@role_required(['academic'])
+def get_analytics_cache_stats(current_user):
+    """Hit / miss / coalescing counters of the analytics response cache"""
+    return jsonify(analytics_cache.stats()), 200
+
+@notice_bp.route("/analytics/daily", methods=["GET"])
+@token_required
+@role_required(['academic'])
+def get_daily_analytics(current_user):
+    """
+    Per-day trends for ?from=YYYY-MM-DD&to=YYYY-MM-DD (inclusive, last 30 days by default).
+    Served from the materialized rollups only; see utils/analytics_rollup.py.
+    """
+    try:
+        start, end = parse_daily_range(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        return jsonify(daily_analytics(start, end)), 200
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
 @notice_bp.route("/created-by/<user_id>", methods=["GET"])
 @token_required
+@conditional(notice_collection_validator)
 def get_notices_by_creator(current_user, user_id):
+    try:
+        page_args = parse_pagination_args(request.args) if wants_pagination(request.args) else None
+        filters = parse_notice_filters(request.args)
+        sort_field, descending = parse_notice_sort(request.args)
+        check_cursor_sort(page_args, sort_field, descending)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         # Verify the requesting user has permission
         if current_user.role != "academic" and str(current_user.id) != user_id:
             return jsonify({"error": "Unauthorized"}), 403
 
-        notices = Notice.objects(created_by=user_id).order_by('-created_at')
+        notices, next_cursor = paginate_queryset(
+            summary_queryset(Notice.objects(created_by=user_id, **filters)),
+            page_args, field=sort_field, descending=descending
+        )
         
-        user_map = {str(user.id): user for user in User.objects.only('id', 'name', 'email')}
+        notices = list(notices)
+        creators = resolve_creators(raw.get('created_by') for raw in notices)
         
         notices_data = []
-        for notice in notices:
-            creator = user_map.get(notice.created_by)
-            notices_data.append({
-                "id": str(notice.id),
-                "title": notice.title,
-                "content": notice.content,
-                "notice_type": notice.notice_type,
-                "departments": notice.departments,
-                "year": notice.year,
-                "section": notice.section,
-                "recipient_emails": notice.recipient_emails,
-                "priority": notice.priority,
-                "status": notice.status,
-                "from_field": notice.from_field,
-                "approval_status": notice.approval_status,
-                "approved_by_name": notice.approved_by_name,
-                "approved_at": notice.approved_at.isoformat() if notice.approved_at else None,
-                "approval_comments": notice.approval_comments,
-                "publish_at": notice.publish_at.isoformat() if notice.publish_at else None,
-                "created_at": notice.created_at.isoformat(),
-                "updated_at": notice.updated_at.isoformat(),
-                "created_by": {
-                    "id": notice.created_by,
-                    "name": creator.name if creator else "Unknown",
-                    "email": creator.email if creator else ""
-                },
-                "attachments": notice.attachments
-            })
+        for raw in notices:
+            item = notice_summary(raw, creators[raw.get('created_by')])
+            item["created_by"] = item.pop("createdBy")
+            notices_data.append(item)
+        if wants_read_state(request.args):
+            notices_data = overlay_read_state(notices_data, current_user.id)
             
-        return jsonify(notices_data), 200
+        if page_args is not None:
+            return json_response(page_payload(notices_data, next_cursor))
+        return json_response(notices_data)
         
     except Exception as e:
         traceback.print_exc()
@@ -869,6 +1180,7 @@ def get_notices_by_creator(current_user, user_id):
 
 @notice_bp.route('/departments', methods=['GET'])
 @token_required
+@conditional(catalog_validator)
 def get_departments(current_user):
     """
     Fetches a list of all departments.
@@ -882,15 +1194,20 @@ def get_departments(current_user):
     
 
 
-@notice_bp.route('/courses-by-departments', methods=['POST'])
+@notice_bp.route('/courses-by-departments', methods=['GET', 'POST'])
 @token_required
+@conditional(catalog_validator)
 def get_courses_by_departments(current_user):
     """
     Fetches courses based on a list of selected department codes.
+    GET takes repeated ?department=CODE params so the result can be revalidated by ETag.
     """
     try:
-        data = request.json
-        dept_codes = data.get('departments', [])
+        if request.method == 'GET':
+            dept_codes = request.args.getlist('department')
+        else:
+            data = request.json
+            dept_codes = data.get('departments', [])
         if not dept_codes:
             return jsonify([]), 200
 
@@ -911,6 +1228,7 @@ def get_courses_by_departments(current_user):
 
 @notice_bp.route('/years', methods=['GET'])
 @token_required
+@conditional(catalog_validator)
 def get_years(current_user):
     """
     Fetches distinct years from the student collection based on department and course.
@@ -932,6 +1250,7 @@ def get_years(current_user):
 
 @notice_bp.route('/sections', methods=['GET'])
 @token_required
+@conditional(catalog_validator)
 def get_sections(current_user):
     """
     Fetches distinct sections based on department, course, and year.
@@ -8,6 +8,56 @@ from ..models.employee_model import Employee
 from config import Config
 from datetime import datetime
 
+class TokenError(Exception):
+    """A bearer token that does not identify a current user"""
+    def __init__(self, message, code, status=401):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status = status
+
+def user_from_token(token, remote_addr=None):
+    """Resolve an access token to its Student/Employee/User.
+
+    Shared by token_required and the socket handlers, which cannot use the
+    decorator; raises TokenError with the response message and code.
+    """
+    try:
+        # Decode token and verify
+        data = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
+        
+        # Check token expiration
+        if 'exp' not in data or datetime.utcnow() > datetime.utcfromtimestamp(data['exp']):
+            raise TokenError('Token has expired!', 'TOKEN_EXPIRED')
+            
+        # Find user based on role in token
+        user = None
+        if data.get('role') == 'student':
+            user = Student.objects(id=ObjectId(data['user_id'])).first()
+        elif data.get('role') == 'employee':
+            user = Employee.objects(id=ObjectId(data['user_id'])).first()
+        else:
+            # Fallback to User model for backward compatibility
+            user = User.objects(id=ObjectId(data['user_id'])).first()
+    except TokenError:
+        raise
+    except jwt.ExpiredSignatureError:
+        raise TokenError('Token has expired!', 'TOKEN_EXPIRED')
+    except jwt.InvalidTokenError:
+        raise TokenError('Invalid token!', 'INVALID_TOKEN')
+    except Exception as e:
+        print(f"Token validation error: {str(e)}")
+        raise TokenError('Token validation failed!', 'TOKEN_VALIDATION_FAILED')
+    
+    if not user:
+        raise TokenError('User not found!', 'USER_NOT_FOUND', 404)
+        
+    # Add additional security checks
+    if 'ip' in data and remote_addr != data['ip']:
+        raise TokenError('Suspicious activity detected!', 'IP_MISMATCH')
+    
+    return user
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -28,64 +78,13 @@ def token_required(f):
             }), 401
             
         try:
-            # Decode token and verify
-            data = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
-            
-            # Check token expiration
-            if 'exp' not in data or datetime.utcnow() > datetime.utcfromtimestamp(data['exp']):
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Token has expired!',
-                    'code': 'TOKEN_EXPIRED'
-                }), 401
-                
-            # Find user based on role in token
-            user = None
-            if data.get('role') == 'student':
-                user = Student.objects(id=ObjectId(data['user_id'])).first()
-            elif data.get('role') == 'employee':
-                user = Employee.objects(id=ObjectId(data['user_id'])).first()
-            else:
-                # Fallback to User model for backward compatibility
-                user = User.objects(id=ObjectId(data['user_id'])).first()
-            
-            if not user:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'User not found!',
-                    'code': 'USER_NOT_FOUND'
-                }), 404
-                
-            # Add additional security checks
-            if 'ip' in data and request.remote_addr != data['ip']:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Suspicious activity detected!',
-                    'code': 'IP_MISMATCH'
-                }), 401
-                
-            # Add user object to kwargs for route access
-            kwargs['current_user'] = user
-            
-        except jwt.ExpiredSignatureError:
+            kwargs['current_user'] = user_from_token(token, request.remote_addr)
+        except TokenError as e:
             return jsonify({
                 'status': 'error',
-                'message': 'Token has expired!',
-                'code': 'TOKEN_EXPIRED'
-            }), 401
-        except jwt.InvalidTokenError:
-            return jsonify({
-                'status': 'error',
-                'message': 'Invalid token!',
-                'code': 'INVALID_TOKEN'
-            }), 401
-        except Exception as e:
-            print(f"Token validation error: {str(e)}")
-            return jsonify({
-                'status': 'error',
-                'message': 'Token validation failed!',
-                'code': 'TOKEN_VALIDATION_FAILED'
-            }), 401
+                'message': e.message,
+                'code': e.code
+            }), e.status
             
         return f(*args, **kwargs)
     return decorated
@@ -0,0 +1,37 @@
+from mongoengine import Document, StringField, IntField, FloatField, DateTimeField, ListField, DictField
+import datetime
+
+class DailyAnalytics(Document):
+    """One day of dashboard metrics, materialized by utils/analytics_rollup.py"""
+    day = DateTimeField(required=True)  # Midnight of the day
+    notices_published = IntField(default=0)
+    # [{"department": ..., "notices": n}]; a list because department names may contain dots
+    published_by_department = ListField(DictField(), default=[])
+    reads = IntField(default=0)
+    new_readers = IntField(default=0)
+    notices_read = IntField(default=0)
+    approvals_approved = IntField(default=0)
+    approvals_rejected = IntField(default=0)
+    # Sums, so any range of days can be averaged without going back to raw approvals
+    approval_turnaround_seconds = FloatField(default=0)
+    approval_turnaround_max_seconds = FloatField(default=0)
+    computed_at = DateTimeField(default=datetime.datetime.utcnow)
+
+    meta = {
+        'collection': 'analytics_daily',
+        'indexes': [
+            {'fields': ['day'], 'unique': True},
+        ]
+    }
+
+
+class AnalyticsRollupState(Document):
+    """Watermark of the rollup job: how far each source has been folded in"""
+    name = StringField(required=True, unique=True)
+    positions = DictField(default={})  # source -> datetime, each in that source's own clock
+    last_run_at = DateTimeField()
+    days_recomputed = IntField(default=0)
+
+    meta = {
+        'collection': 'analytics_rollup_state',
+    }
@@ -21,6 +21,8 @@ class Approval(Document):
             'notice_id',
             'approver_id',
             'status',
-            'created_at'
+            'created_at',
+            # Daily rollups (see utils/analytics_rollup.py)
+            'approved_at'
         ]
     }
\ No newline at end of file
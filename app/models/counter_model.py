@@ -0,0 +1,10 @@
+from mongoengine import Document, StringField, IntField
+
+class Counter(Document):
+    """Named monotonically increasing sequence, advanced atomically with $inc"""
+    name = StringField(primary_key=True)
+    seq = IntField(default=0)
+
+    meta = {
+        'collection': 'counters',
+    }
@@ -1,4 +1,4 @@
-from mongoengine import Document, StringField, EmailField, DateTimeField
+from mongoengine import Document, StringField, EmailField, DateTimeField, IntField
 from werkzeug.security import generate_password_hash, check_password_hash
 import datetime
 
@@ -17,6 +17,7 @@ class Employee(Document):
         'admin', 'academic', 'fees', 'exam', 'placement', 'faculty'
     ], default="employee")
     created_at = DateTimeField(default=datetime.datetime.utcnow)
+    ordinal = IntField()  # Dense id shared with Student, for reach bitmaps (utils/user_ordinals.py)
     
     meta = {
         'collection': 'employee',
@@ -25,7 +26,8 @@ class Employee(Document):
             {'fields': ['official_email'], 'unique': True, 'sparse': True},  # EXPLICIT index definition
             'email',
             'department',
-            'role'
+            'role',
+            {'fields': ['ordinal'], 'unique': True, 'sparse': True}
         ]
     }
     
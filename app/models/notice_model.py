@@ -1,10 +1,13 @@
-from mongoengine import Document, EmbeddedDocument, EmbeddedDocumentField, StringField, DictField, ListField, DateTimeField, EmailField, IntField, BooleanField, ReferenceField
+from mongoengine import Document, EmbeddedDocument, EmbeddedDocumentField, StringField, DictField, ListField, DateTimeField, EmailField, IntField, BooleanField, ReferenceField, ObjectIdField
 import datetime
+from ..utils.text_utils import html_to_text, make_excerpt
 
 class Notice(Document):
     title = StringField(required=True)
     subject = StringField()
     content = StringField(required=True)
+    excerpt = StringField(default="")  # Plain-text preview of content for list views
+    content_text = StringField(default="")  # Tag-free content, indexed for full-text search
     notice_type = StringField()
     departments = ListField(StringField(), default=[])
     program_course = StringField()
@@ -26,8 +29,16 @@ class Notice(Document):
     created_by = StringField(required=True)
     created_by_name = StringField()
     attachments = ListField(StringField(), default=[])
-    reads = ListField(DictField(), default=[])
-    read_count = IntField(default=0)
+    reads = ListField(DictField(), default=[])  # Legacy, reads now live in notice_reads (see utils/read_store.py)
+    read_count = IntField(default=0)  # Unique readers
+    # Engagement counters, maintained incrementally by utils/read_store.py
+    total_reads = IntField(default=0)
+    high_engagement_users = IntField(default=0)
+    top_reader_id = StringField()
+    top_reader_count = IntField(default=0)
+    total_time_spent = IntField(default=0)  # Seconds, from heartbeats (utils/dwell_tracker.py)
+    counted_read_batches = ListField(ObjectIdField(), default=[])  # Last read batches folded into the counters
+    counted_dwell_batches = ListField(ObjectIdField(), default=[])  # Last dwell flushes folded into total_time_spent
     requires_approval = BooleanField(default=False)
     approval_workflow = ListField(ReferenceField('Approval'))
     auto_publish_after_approval = BooleanField(default=False)
@@ -45,6 +56,23 @@ class Notice(Document):
         'collection': 'notices',
         'indexes': [
             '-created_at',
+            # Keyset pagination sorts on (created_at, _id)
+            ('-created_at', '-id'),
+            ('created_by', '-created_at', '-id'),
+            ('-updated_at', '-id'),
+            # Common dashboard filters combined with the default sort
+            ('status', '-created_at', '-id'),
+            ('approval_status', '-created_at', '-id'),
+            ('departments', '-created_at', '-id'),
+            # Audience-targeted student feed (see utils/notice_feed.py)
+            ('status', 'departments', 'program_course', 'year', 'section', '-created_at', '-id'),
+            # Full-text search (see utils/notice_search.py); one text index per collection
+            {
+                'fields': ['$title', '$subject', '$content_text'],
+                'default_language': 'english',
+                'weights': {'title': 10, 'subject': 5, 'content_text': 1},
+                'name': 'notice_text_search',
+            },
             'created_by',
             'notice_type',
             'status',
@@ -57,4 +85,9 @@ class Notice(Document):
             'approved_by_name',
             'approved_at',
         ]
-    }
\ No newline at end of file
+    }
+
+    def clean(self):
+        """Keep the list-view excerpt and search text in sync with the HTML content on every save"""
+        self.content_text = html_to_text(self.content)
+        self.excerpt = make_excerpt(self.content)
@@ -0,0 +1,22 @@
+from mongoengine import Document, ObjectIdField, StringField, IntField, DateTimeField, ListField
+
+class NoticeReadBucket(Document):
+    """Reads of one notice within one hour or day, pre-aggregated with $inc"""
+    notice_id = ObjectIdField(required=True)
+    granularity = StringField(required=True, choices=['hour', 'day'])
+    bucket_start = DateTimeField(required=True)  # UTC, truncated to the hour / day
+    reads = IntField(default=0)
+    new_readers = IntField(default=0)
+    updated_at = DateTimeField()  # UTC, lets the daily rollup find the days that changed
+    counted_read_batches = ListField(ObjectIdField(), default=[])  # Last read batches folded in
+
+    meta = {
+        'collection': 'notice_read_buckets',
+        'indexes': [
+            # Upsert target and the time series range scan
+            {'fields': ('notice_id', 'granularity', 'bucket_start'), 'unique': True},
+            # Daily rollups (see utils/analytics_rollup.py)
+            ('granularity', 'bucket_start'),
+            ('granularity', 'updated_at'),
+        ]
+    }
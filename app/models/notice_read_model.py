@@ -0,0 +1,27 @@
+from mongoengine import Document, ObjectIdField, StringField, IntField, DateTimeField, ListField, BooleanField
+
+class NoticeRead(Document):
+    """One row per (notice, reader): how often and when the user opened the notice"""
+    notice_id = ObjectIdField(required=True)
+    user_id = StringField(required=True)
+    read_count = IntField(default=1)
+    first_read_at = DateTimeField()
+    last_read_at = DateTimeField()
+    total_time_spent = IntField(default=0)
+    counted_read_batches = ListField(ObjectIdField(), default=[])  # Last read batches written to this row
+    first_read_batch = ObjectIdField()  # Read batch that created the row
+    counted_dwell_batches = ListField(ObjectIdField(), default=[])  # Last dwell flushes folded in
+    migrated_from_embedded = BooleanField()  # Set by scripts/migrate_notice_reads.py
+
+    meta = {
+        'collection': 'notice_reads',
+        'indexes': [
+            # Also the target of the read upsert; guarantees one row per reader
+            {'fields': ('notice_id', 'user_id'), 'unique': True},
+            # Reader listings: keyset pages per notice by engagement or recency
+            ('notice_id', '-read_count', '-id'),
+            ('notice_id', '-last_read_at', '-id'),
+            # "Which of these notices has this user read, how often?" (covered query)
+            ('user_id', 'notice_id', 'read_count'),
+        ]
+    }
@@ -0,0 +1,21 @@
+from mongoengine import Document, ObjectIdField, DateTimeField
+import datetime
+from config import Config
+
+class NoticeTombstone(Document):
+    """Left behind when a notice is deleted so delta-sync clients can drop their copy"""
+    notice_id = ObjectIdField(required=True)
+    deleted_at = DateTimeField(default=datetime.datetime.now)  # same clock as Notice.updated_at
+    published_at = DateTimeField()  # publish_at or created_at, so the daily rollup can recount that day
+
+    meta = {
+        'collection': 'notice_tombstones',
+        'indexes': [
+            # Sync reads tombstones in (deleted_at, notice_id) order
+            ('deleted_at', 'notice_id'),
+            {
+                'fields': ['deleted_at'],
+                'expireAfterSeconds': Config.NOTICE_TOMBSTONE_RETENTION_DAYS * 24 * 60 * 60,
+            },
+        ]
+    }
@@ -0,0 +1,18 @@
+from mongoengine import Document, StringField, IntField, DateTimeField, BinaryField
+import datetime
+
+class ReachBitmap(Document):
+    """A set of user ordinals stored as a zlib-compressed bitmap (see utils/bitset.py)"""
+    kind = StringField(required=True, choices=['readers', 'cohort'])
+    key = StringField(required=True)  # Notice id for readers, JSON cohort key for cohorts
+    bits = BinaryField()
+    cardinality = IntField(default=0)
+    unmapped = IntField(default=0)  # Readers without an ordinal (deleted users), counted but not in bits
+    built_at = DateTimeField(default=datetime.datetime.utcnow)  # UTC, same clock as NoticeRead.last_read_at
+
+    meta = {
+        'collection': 'reach_bitmaps',
+        'indexes': [
+            {'fields': ('kind', 'key'), 'unique': True},
+        ]
+    }
@@ -49,6 +49,7 @@ class Student(Document):
     raw_password = StringField()
     created_at = DateTimeField(default=datetime.datetime.utcnow)
     notices = ListField(ReferenceField('Notice'))
+    ordinal = IntField()  # Dense id shared with Employee, for reach bitmaps (utils/user_ordinals.py)
     
     meta = {
         'collection': 'students',
@@ -58,9 +59,12 @@ class Student(Document):
             'branch',
             'year', # <<-- ADD THIS
             'section', # <<-- ADD THIS
+            # Audience resolution for reach reports (see utils/notice_reach.py)
+            ('branch', 'course', 'year', 'section'),
             'email',
             'official_email',
-            {'fields': ['notices'], 'sparse': True}
+            {'fields': ['notices'], 'sparse': True},
+            {'fields': ['ordinal'], 'unique': True, 'sparse': True}
         ]
     }
     
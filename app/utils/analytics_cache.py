@@ -0,0 +1,165 @@
+"""
+Shared response cache for the analytics endpoints.
+
+Several admin dashboards poll the same analytics at once. Payloads are
+cached for ``ANALYTICS_CACHE_TTL_SECONDS`` under a scope and a key:
+
+* ``summary``: /api/notices/analytics,
+* ``notice:<id>``: /api/notices/<id>/analytics and /api/notices/<id>/reads
+  (one entry per distinct query string),
+* ``approvals``: approval turnaround reports.
+
+Writes invalidate by scope through notice_events: a notice change drops the
+summary and that notice's entries, an approval change drops the approval
+reports. A computation that overlaps one of those invalidations is returned
+but not stored, so a result from before the change is never cached.
+
+Reads are far more frequent and only move counters, so they are soft: a
+recorded read drops that notice's entries but leaves the summary to expire
+by TTL (it would otherwise never be cached while reads are coming in,
+exactly when dashboards poll), and a computation that overlaps a read is
+still stored, for ``ANALYTICS_CACHE_BUSY_TTL_SECONDS`` only.
+
+Concurrent misses on one key are coalesced: the first request computes and
+the others wait for its result, so a burst of polls costs one aggregation.
+"""
+import threading
+from config import Config
+from .ttl_cache import TTLCache
+from .notice_events import on_notice_changed, on_notice_read, on_approval_changed
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on."""
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """TTL cache keyed by ``(scope, key)`` with scope invalidation and request coalescing."""
+
+    def __init__(self, maxsize=512, ttl=30, busy_ttl=2):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.busy_ttl = busy_ttl
+        self._lock = threading.Lock()
+        self._flights = {}  # (scope, key) -> _Flight
+        self._generations = {}  # scope -> bumped on every invalidation of that scope
+        self._soft_generations = {}  # scope -> bumped on every soft invalidation of that scope
+        self._epoch = 0  # bumped by clear()
+        self._counters = {
+            "computed": 0, "coalesced": 0, "not_stored": 0, "stored_briefly": 0,
+            "invalidations": 0, "soft_invalidations": 0,
+        }
+
+    def _generation(self, scope):
+        return self._epoch, self._generations.get(scope, 0), self._soft_generations.get(scope, 0)
+
+    def get_or_compute(self, scope, key, compute):
+        """
+        Cached ``compute()`` for ``(scope, key)``. None results (e.g. not
+        found) are returned but never cached.
+        """
+        full_key = (scope, key)
+        value = self._cache.get(full_key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(full_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[full_key] = _Flight()
+                generation = self._generation(scope)
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[full_key]
+                self._counters["computed"] += 1
+                if flight.value is not None:
+                    current = self._generation(scope)
+                    if current == generation:
+                        self._cache.set(full_key, flight.value)
+                    elif current[:2] == generation[:2]:
+                        # Only reads overlapped: close enough, but not for long
+                        self._cache.set(full_key, flight.value, ttl=self.busy_ttl)
+                        self._counters["stored_briefly"] += 1
+                    else:
+                        self._counters["not_stored"] += 1
+            flight.done.set()
+        return flight.value
+
+    def invalidate(self, scope, soft=False):
+        """
+        Drop every entry of ``scope``. After a ``soft`` invalidation a
+        computation already running is still stored, briefly.
+        """
+        generations = self._soft_generations if soft else self._generations
+        counter = "soft_invalidations" if soft else "invalidations"
+        with self._lock:
+            generations[scope] = generations.get(scope, 0) + 1
+            self._counters[counter] += 1
+        self._cache.evict(lambda key: key[0] == scope)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._counters["invalidations"] += 1
+        self._cache.clear()
+
+    def stats(self):
+        stats = self._cache.stats()
+        with self._lock:
+            lookups = stats["hits"] + stats["misses"]
+            return dict(
+                stats, **self._counters,
+                in_flight=len(self._flights),
+                hit_ratio=round(stats["hits"] / lookups, 3) if lookups else None,
+            )
+
+
+def notice_scope(notice_id):
+    return f"notice:{notice_id}"
+
+
+analytics_cache = ResponseCache(
+    maxsize=Config.ANALYTICS_CACHE_SIZE,
+    ttl=Config.ANALYTICS_CACHE_TTL_SECONDS,
+    busy_ttl=Config.ANALYTICS_CACHE_BUSY_TTL_SECONDS,
+)
+
+
+@on_notice_changed
+def _notice_changed(notice):
+    if notice is None:
+        analytics_cache.clear()
+        return
+    analytics_cache.invalidate('summary')
+    analytics_cache.invalidate(notice_scope(notice.id))
+
+
+@on_notice_read
+def _notice_read(notice_id):
+    # The summary is left to its TTL
+    analytics_cache.invalidate(notice_scope(notice_id), soft=True)
+
+
+@on_approval_changed
+def _approval_changed(approval):
+    analytics_cache.invalidate('approvals')
@@ -0,0 +1,83 @@
+"""
+Debounced analytics broadcasts.
+
+Mutations (notice changes, recorded reads, explicit requests) only call
+``mark_dirty``. A single background task recomputes and publishes at most
+once per ``ANALYTICS_PUBLISH_INTERVAL_SECONDS``, and only when someone is
+listening; while nobody is, the dirty flag simply stays set and the next
+subscriber gets a fresh snapshot. A burst of a thousand deletes or reads
+therefore costs one aggregation, not a thousand.
+"""
+import logging
+import threading
+import time
+from config import Config
+from .notice_events import on_notice_changed, on_notice_read
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsPublisher:
+    """
+    ``publish()`` computes and sends the update; ``has_audience()`` says
+    whether anyone would receive it. Both run on the publisher thread.
+    """
+
+    def __init__(self, interval_seconds=5):
+        self.interval = interval_seconds
+        self.publish = None
+        self.has_audience = None
+        self._dirty = threading.Event()
+        self._thread = None
+        self._last_published = 0.0
+        self._counters = {"marked": 0, "published": 0, "skipped_no_audience": 0, "failed": 0}
+
+    def mark_dirty(self):
+        self._counters["marked"] += 1
+        self._dirty.set()
+
+    def _run(self):
+        while True:
+            self._dirty.wait()
+            # Debounce: never publish more often than once per interval
+            wait = self._last_published + self.interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            if not self.has_audience():
+                self._counters["skipped_no_audience"] += 1
+                # Stay dirty, but re-check the audience no faster than the interval
+                time.sleep(self.interval)
+                continue
+            self._dirty.clear()
+            self._last_published = time.monotonic()
+            try:
+                self.publish()
+                self._counters["published"] += 1
+            except Exception:
+                self._counters["failed"] += 1
+                logger.exception("analytics publish failed")
+
+    def start(self, publish, has_audience):
+        """Start the publisher thread (idempotent)."""
+        self.publish = publish
+        self.has_audience = has_audience
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="analytics-publisher", daemon=True)
+        self._thread.start()
+
+    def stats(self):
+        return dict(self._counters, dirty=self._dirty.is_set(), interval_seconds=self.interval)
+
+
+analytics_publisher = AnalyticsPublisher(interval_seconds=Config.ANALYTICS_PUBLISH_INTERVAL_SECONDS)
+
+
+@on_notice_changed
+def _notice_changed(notice):
+    analytics_publisher.mark_dirty()
+
+
+@on_notice_read
+def _notice_read(notice_id):
+    analytics_publisher.mark_dirty()
@@ -0,0 +1,336 @@
+"""
+Materialized daily analytics.
+
+A background job folds the raw collections into one small ``DailyAnalytics``
+document per day: notices published (total and per department), reads and
+new readers from the daily read buckets, and approvals decided with their
+summed turnaround. Dashboards read those documents only, so a month of
+trends is thirty tiny documents instead of a scan over notices, reads and
+approvals.
+
+The job is incremental. ``AnalyticsRollupState`` keeps a watermark per
+source, in that source's own clock (notices are stamped with local time,
+buckets and approvals with UTC). Each run finds the days touched since the
+watermarks:
+
+* notices by ``updated_at`` (every edit bumps it, see notice_sync.py),
+* deleted notices by their tombstone's ``deleted_at``,
+* read buckets by ``updated_at``,
+* approvals by ``approved_at``,
+
+recomputes exactly those days from scratch and only then moves the
+watermarks, so a failed run is simply repeated. Recomputing a day is
+idempotent, which also makes it safe for several workers to run the job.
+The very first run has no watermark and therefore backfills every day.
+
+As in notice_sync.py, a watermark never moves past ``now - SETTLE_SECONDS``
+so writes stamped just before they commit are not missed.
+
+A notice counts on the day it was published (``publish_at``, falling back to
+``created_at``). If that date is later moved, the notice is recounted on its
+new day only; the old day is corrected by the next full rebuild
+(``scripts/rebuild_analytics_rollups.py``).
+"""
+import datetime
+import logging
+import threading
+import time
+from pymongo import UpdateOne
+from config import Config
+from ..models.analytics_rollup_model import DailyAnalytics, AnalyticsRollupState
+from ..models.approval_model import Approval
+from ..models.notice_model import Notice
+from ..models.notice_read_bucket_model import NoticeReadBucket
+from ..models.notice_tombstone_model import NoticeTombstone
+from .notice_analytics import UNSPECIFIED
+
+logger = logging.getLogger(__name__)
+
+SETTLE_SECONDS = 5
+STATE_NAME = 'daily'
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+_ONE_DAY = datetime.timedelta(days=1)
+
+
+def _day(at):
+    return datetime.datetime(at.year, at.month, at.day)
+
+
+def _between(field, after, upto):
+    # No watermark yet: take everything, including rows written before the field existed
+    if after is None:
+        return {}
+    return {field: {'$gt': after, '$lte': upto}}
+
+
+# source -> (clock, collection, position field, filter, day of a changed row)
+SOURCES = {
+    'notices': (
+        datetime.datetime.now, Notice, 'updated_at', {},
+        lambda row: row.get('publish_at') or row.get('created_at'),
+    ),
+    'deletions': (
+        datetime.datetime.now, NoticeTombstone, 'deleted_at', {},
+        lambda row: row.get('published_at'),
+    ),
+    'reads': (
+        datetime.datetime.utcnow, NoticeReadBucket, 'updated_at', {'granularity': 'day'},
+        lambda row: row.get('bucket_start'),
+    ),
+    'approvals': (
+        datetime.datetime.utcnow, Approval, 'approved_at', {},
+        lambda row: row.get('approved_at'),
+    ),
+}
+
+_PROJECTIONS = {
+    'notices': {'publish_at': 1, 'created_at': 1},
+    'deletions': {'published_at': 1},
+    'reads': {'bucket_start': 1},
+    'approvals': {'approved_at': 1},
+}
+
+
+def changed_days(positions):
+    """
+    Days touched since ``positions`` (source -> watermark or missing).
+    Returns ``(days, new_positions)``.
+    """
+    days, new_positions = set(), {}
+    for source, (clock, document, field, base, day_of) in SOURCES.items():
+        upto = clock() - datetime.timedelta(seconds=SETTLE_SECONDS)
+        after = positions.get(source)
+        query = dict(base, **_between(field, after, upto))
+        for row in document._get_collection().find(query, _PROJECTIONS[source]):
+            at = day_of(row)
+            if at is not None:
+                days.add(_day(at))
+        # Never move a watermark backwards (clock skew, a re-run right after a run)
+        new_positions[source] = max(after, upto) if after is not None else upto
+    return days, new_positions
+
+
+def _published_on(day):
+    end = day + _ONE_DAY
+    pipeline = [
+        {'$match': {'status': 'published', '$or': [
+            {'publish_at': {'$gte': day, '$lt': end}},
+            {'publish_at': None, 'created_at': {'$gte': day, '$lt': end}},
+        ]}},
+        {'$project': {'departments': 1}},
+        {'$facet': {
+            'total': [{'$count': 'notices'}],
+            'byDepartment': [
+                {'$unwind': {'path': '$departments', 'preserveNullAndEmptyArrays': True}},
+                {'$group': {'_id': '$departments', 'notices': {'$sum': 1}}},
+            ],
+        }},
+    ]
+    result = next(Notice._get_collection().aggregate(pipeline), {})
+    total = result.get('total') or [{}]
+    by_department = {}
+    for row in result.get('byDepartment', []):
+        name = row['_id'] or UNSPECIFIED
+        by_department[name] = by_department.get(name, 0) + row['notices']
+    return total[0].get('notices', 0), [
+        {'department': name, 'notices': count}
+        for name, count in sorted(by_department.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+def _reads_on(day):
+    pipeline = [
+        {'$match': {'granularity': 'day', 'bucket_start': day}},
+        {'$group': {
+            '_id': None,
+            'reads': {'$sum': '$reads'},
+            'new_readers': {'$sum': '$new_readers'},
+            'notices_read': {'$sum': 1},
+        }},
+    ]
+    return next(NoticeReadBucket._get_collection().aggregate(pipeline), {})
+
+
+def _approvals_on(day):
+    pipeline = [
+        {'$match': {
+            'approved_at': {'$gte': day, '$lt': day + _ONE_DAY},
+            'status': {'$in': ['approved', 'rejected']},
+        }},
+        {'$project': {
+            'status': 1,
+            'turnaround': {'$divide': [{'$subtract': ['$approved_at', '$created_at']}, 1000]},
+        }},
+        {'$group': {
+            '_id': '$status',
+            'count': {'$sum': 1},
+            'turnaround': {'$sum': '$turnaround'},
+            'max_turnaround': {'$max': '$turnaround'},
+        }},
+    ]
+    return {row['_id']: row for row in Approval._get_collection().aggregate(pipeline)}
+
+
+def compute_day(day):
+    """Recompute one day from the raw collections. Returns the rollup fields."""
+    published, by_department = _published_on(day)
+    reads = _reads_on(day)
+    approvals = _approvals_on(day)
+    decided = approvals.values()
+    return {
+        'notices_published': published,
+        'published_by_department': by_department,
+        'reads': reads.get('reads', 0),
+        'new_readers': reads.get('new_readers', 0),
+        'notices_read': reads.get('notices_read', 0),
+        'approvals_approved': approvals.get('approved', {}).get('count', 0),
+        'approvals_rejected': approvals.get('rejected', {}).get('count', 0),
+        'approval_turnaround_seconds': sum(row['turnaround'] or 0 for row in decided),
+        'approval_turnaround_max_seconds': max((row['max_turnaround'] or 0 for row in decided), default=0),
+        'computed_at': datetime.datetime.utcnow(),
+    }
+
+
+def roll_up(days):
+    """Recompute and store the given days. Returns how many were written."""
+    ops = [
+        UpdateOne({'day': day}, {'$set': compute_day(day)}, upsert=True)
+        for day in sorted(days)
+    ]
+    if ops:
+        DailyAnalytics._get_collection().bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+class AnalyticsRollup:
+    """Runs the incremental rollup every ``interval_seconds`` on a background thread."""
+
+    def __init__(self, interval_seconds=300):
+        self.interval = interval_seconds
+        self._lock = threading.Lock()  # one run at a time
+        self._thread = None
+        self._counters = {"runs": 0, "failed_runs": 0, "days_recomputed": 0}
+        self._last_run = {"at": None, "days": None, "duration_ms": None, "error": None}
+
+    def run_once(self, full=False):
+        """Fold in everything changed since the watermark. Returns the number of days recomputed."""
+        with self._lock:
+            started = time.monotonic()
+            try:
+                state = AnalyticsRollupState.objects(name=STATE_NAME).first()
+                positions = {} if full or state is None else dict(state.positions)
+                days, new_positions = changed_days(positions)
+                written = roll_up(days)
+                # Watermarks move only after the days are stored, so a failed run is repeated
+                AnalyticsRollupState.objects(name=STATE_NAME).update_one(
+                    set__positions=new_positions,
+                    set__last_run_at=datetime.datetime.utcnow(),
+                    inc__days_recomputed=written,
+                    upsert=True,
+                )
+            except Exception as e:
+                self._counters["failed_runs"] += 1
+                self._last_run["error"] = str(e)
+                logger.exception("analytics rollup failed")
+                return 0
+            self._counters["runs"] += 1
+            self._counters["days_recomputed"] += written
+            self._last_run = {
+                "at": datetime.datetime.utcnow().isoformat(),
+                "days": written,
+                "duration_ms": round((time.monotonic() - started) * 1000, 1),
+                "error": None,
+            }
+            return written
+
+    def _run(self):
+        while True:
+            self.run_once()
+            time.sleep(self.interval)
+
+    def start(self):
+        """Start the background rollup (idempotent)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="analytics-rollup", daemon=True)
+        self._thread.start()
+
+    def stats(self):
+        return dict(self._counters, last_run=dict(self._last_run), interval_seconds=self.interval)
+
+
+analytics_rollup = AnalyticsRollup(interval_seconds=Config.ANALYTICS_ROLLUP_INTERVAL_SECONDS)
+
+
+def parse_daily_range(args, today=None):
+    """
+    Read ``from`` / ``to`` (YYYY-MM-DD, inclusive). Defaults to the last
+    DEFAULT_RANGE_DAYS days. Raises ValueError with a client-facing message.
+    """
+    today = _day(today or datetime.datetime.utcnow())
+    try:
+        end = datetime.datetime.strptime(args['to'], '%Y-%m-%d') if args.get('to') else today
+        start = (datetime.datetime.strptime(args['from'], '%Y-%m-%d') if args.get('from')
+                 else end - datetime.timedelta(days=DEFAULT_RANGE_DAYS - 1))
+    except ValueError:
+        raise ValueError("from and to must be dates formatted YYYY-MM-DD")
+    if start > end:
+        raise ValueError("from must not be after to")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise ValueError(f"Range must be at most {MAX_RANGE_DAYS} days")
+    return start, end
+
+
+def _daily_entry(day, row):
+    decided = row.get('approvals_approved', 0) + row.get('approvals_rejected', 0)
+    turnaround = row.get('approval_turnaround_seconds', 0)
+    return {
+        "date": day.strftime('%Y-%m-%d'),
+        "noticesPublished": row.get('notices_published', 0),
+        "publishedByDepartment": row.get('published_by_department', []),
+        "reads": row.get('reads', 0),
+        "newReaders": row.get('new_readers', 0),
+        "noticesRead": row.get('notices_read', 0),
+        "approvalsApproved": row.get('approvals_approved', 0),
+        "approvalsRejected": row.get('approvals_rejected', 0),
+        "avgApprovalTurnaroundHours": round(turnaround / decided / 3600, 2) if decided else None,
+        "maxApprovalTurnaroundHours": round(row.get('approval_turnaround_max_seconds', 0) / 3600, 2) if decided else None,
+    }
+
+
+def daily_analytics(start, end):
+    """The stored rollups for ``start``..``end`` (inclusive), one entry per day, gaps as zeros."""
+    rows = {
+        row['day']: row
+        for row in DailyAnalytics.objects(day__gte=start, day__lte=end).exclude('id').as_pymongo()
+    }
+    days = []
+    day = start
+    while day <= end:
+        days.append(_daily_entry(day, rows.get(day, {})))
+        day += _ONE_DAY
+
+    totals = {'approved': 0, 'rejected': 0, 'turnaround': 0}
+    for row in rows.values():
+        totals['approved'] += row.get('approvals_approved', 0)
+        totals['rejected'] += row.get('approvals_rejected', 0)
+        totals['turnaround'] += row.get('approval_turnaround_seconds', 0)
+    decided = totals['approved'] + totals['rejected']
+
+    state = AnalyticsRollupState.objects(name=STATE_NAME).only('last_run_at').first()
+    return {
+        "from": start.strftime('%Y-%m-%d'),
+        "to": end.strftime('%Y-%m-%d'),
+        "days": days,
+        "totals": {
+            "noticesPublished": sum(entry["noticesPublished"] for entry in days),
+            "reads": sum(entry["reads"] for entry in days),
+            "newReaders": sum(entry["newReaders"] for entry in days),
+            "approvalsDecided": decided,
+            "avgApprovalTurnaroundHours": round(totals['turnaround'] / decided / 3600, 2) if decided else None,
+        },
+        "rolledUpAt": state.last_run_at.isoformat() if state and state.last_run_at else None,
+    }
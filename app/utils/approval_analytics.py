@@ -0,0 +1,111 @@
+"""
+Approval turnaround percentiles.
+
+Turnaround is ``approved_at - created_at`` of every decided (approved or
+rejected) approval. One aggregation computes p50 / p90 / p99 overall and by
+approver, role and department: the durations are sorted once, then each
+``$facet`` branch ``$push``es them per group and picks the nearest-rank percentiles with
+``$arrayElemAt``, so no durations are shipped to Python. Works on any MongoDB
+with ``$facet`` (no ``$percentile`` needed).
+
+Reports are cached per period in analytics_cache's ``approvals`` scope,
+which every approval write drops.
+"""
+import datetime
+from ..models.approval_model import Approval
+from .notice_analytics import UNSPECIFIED
+
+PERCENTILES = (50, 90, 99)
+
+# period -> days back from now (None: everything)
+PERIODS = {'7d': 7, '30d': 30, '90d': 90, '365d': 365, 'all': None}
+DEFAULT_PERIOD = '30d'
+
+GROUPINGS = {
+    'byApprover': '$approver_id',
+    'byRole': '$approver_role',
+    'byDepartment': '$approver_department',
+}
+
+
+def parse_period(args):
+    """Read ``period`` from the query string. Raises ValueError with a client-facing message."""
+    period = args.get('period') or DEFAULT_PERIOD
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of: {', '.join(PERIODS)}")
+    return period
+
+
+def _rank(p):
+    # Nearest rank, ceil(p * n / 100) - 1, in integer arithmetic so 90% of 10 is exactly 9
+    return {'$max': [0, {'$subtract': [
+        {'$floor': {'$divide': [{'$add': [{'$multiply': [p, '$count']}, 99]}, 100]}}, 1
+    ]}]}
+
+
+def _percentiles(group_id, extra=None):
+    group = {'_id': group_id, 'durations': {'$push': '$seconds'}, 'count': {'$sum': 1}, 'mean': {'$avg': '$seconds'}}
+    group.update(extra or {})
+    projection = {'_id': 1, 'count': 1, 'mean': 1, 'max': {'$arrayElemAt': ['$durations', -1]}}
+    projection.update({f'p{p}': {'$arrayElemAt': ['$durations', _rank(p)]} for p in PERCENTILES})
+    projection.update({field: 1 for field in extra or {}})
+    return [
+        {'$group': group},
+        {'$project': projection},
+        {'$sort': {'p90': -1}},
+    ]
+
+
+def turnaround_pipeline(since=None):
+    match = {'status': {'$in': ['approved', 'rejected']}, 'approved_at': {'$ne': None}, 'created_at': {'$ne': None}}
+    if since is not None:
+        match['approved_at'] = {'$gte': since}
+    facets = {'overall': _percentiles(None)}
+    for key, field in GROUPINGS.items():
+        extra = {'approver_name': {'$first': '$approver_name'}} if key == 'byApprover' else None
+        facets[key] = _percentiles(field, extra)
+    return [
+        {'$match': match},
+        {'$project': {
+            'approver_id': 1, 'approver_name': 1, 'approver_role': 1, 'approver_department': 1,
+            'seconds': {'$divide': [{'$subtract': ['$approved_at', '$created_at']}, 1000]},
+        }},
+        # Sorted once, before $push, so every group's array is in ascending order
+        {'$sort': {'seconds': 1}},
+        {'$facet': facets},
+    ]
+
+
+def _hours(seconds):
+    return round(seconds / 3600, 2) if seconds is not None else None
+
+
+def _stats(row):
+    stats = {"count": row['count'], "meanHours": _hours(row.get('mean')), "maxHours": _hours(row.get('max'))}
+    stats.update({f"p{p}Hours": _hours(row.get(f'p{p}')) for p in PERCENTILES})
+    return stats
+
+
+def approval_turnaround(period):
+    """Turnaround report for ``period`` (a PERIODS key)."""
+    now = datetime.datetime.utcnow()  # same clock as Approval.approved_at
+    days = PERIODS[period]
+    since = now - datetime.timedelta(days=days) if days is not None else None
+    result = next(Approval._get_collection().aggregate(turnaround_pipeline(since), allowDiskUse=True), {})
+
+    overall = result.get('overall') or [{'count': 0}]
+    report = {
+        "period": period,
+        "from": since.isoformat() if since else None,
+        "to": now.isoformat(),
+        "overall": _stats(overall[0]),
+    }
+    for key in GROUPINGS:
+        entries = []
+        for row in result.get(key, []):
+            entry = dict(_stats(row), key=row['_id'] or UNSPECIFIED)
+            if key == 'byApprover':
+                entry["approverName"] = row.get('approver_name')
+            entries.append(entry)
+        report[key] = entries
+    return report
@@ -0,0 +1,153 @@
+"""
+ETag / Last-Modified support for polled GET endpoints.
+
+A route opts in with ``@conditional(validator)`` placed under
+``@token_required``. The validator is a cheap function of the view's
+arguments that returns ``(seed, last_modified)`` without building the
+response: an indexed watermark query plus an in-process version counter.
+When the client's ``If-None-Match`` (or ``If-Modified-Since``) still
+matches, a 304 is returned and the view never runs, so nothing is
+serialized.
+
+The strong ETag hashes the seed together with the full request path and
+the caller's id, since list bodies depend on query parameters and on who
+is asking.
+
+Last-Modified is only sent when every clock behind it is UTC. Notice
+``updated_at`` is written in server local time, so the notice validators
+rely on the ETag alone.
+"""
+import datetime
+import hashlib
+import os
+import threading
+from functools import wraps
+from flask import request, make_response
+from ..models.notice_model import Notice
+from ..models.department_model import Department
+from ..models.student_model import Student
+from .notice_events import on_notice_changed, on_notice_read
+
+# Restarting the process resets the counters below, so mix in a per-boot token
+_BOOT_TOKEN = os.urandom(8).hex()
+_versions = {'notices': 0, 'catalog': 0}
+_changed_at = {'notices': None, 'catalog': None}
+_versions_lock = threading.Lock()
+
+
+def bump_version(scope):
+    """Mark everything in ``scope`` ('notices' or 'catalog') as changed."""
+    with _versions_lock:
+        _versions[scope] += 1
+        _changed_at[scope] = datetime.datetime.utcnow()
+
+
+def current_version(scope):
+    return _versions[scope]
+
+
+@on_notice_changed
+def _notice_changed(notice):
+    bump_version('notices')
+
+
+@on_notice_read
+def _notice_read(notice_id):
+    # Read counts are part of list and detail payloads
+    bump_version('notices')
+
+
+def _to_http_date(value):
+    """Naive UTC datetime -> aware, truncated to HTTP date precision."""
+    if value is None:
+        return None
+    return value.replace(tzinfo=datetime.timezone.utc, microsecond=0)
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(validator):
+    """
+    Decorator adding ETag / Last-Modified handling to a GET view.
+
+    ``validator(**view_kwargs)`` returns ``(seed, last_modified)`` or None
+    when it cannot vouch for the resource (e.g. it does not exist); the view
+    then runs normally. ``last_modified`` is a naive UTC datetime, or None
+    to send the ETag only.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return f(*args, **kwargs)
+
+            validated = validator(**{k: v for k, v in kwargs.items() if k != 'current_user'})
+            if validated is None:
+                return f(*args, **kwargs)
+
+            seed, last_modified = validated
+            last_modified = _to_http_date(last_modified)
+            current_user = kwargs.get('current_user')
+            viewer = str(current_user.id) if current_user is not None else ''
+            etag = hashlib.sha1(
+                f"{_BOOT_TOKEN}|{seed}|{request.full_path}|{viewer}".encode()
+            ).hexdigest()
+
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Clients must revalidate every time; the 304 keeps that cheap
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated
+    return decorator
+
+
+# --- Validators ---
+
+def notice_collection_validator(**kwargs):
+    """Any notice list: newest updated_at plus document count plus local version."""
+    latest = Notice.objects.only('updated_at').order_by('-updated_at').as_pymongo().first()
+    watermark = latest.get('updated_at') if latest else None
+    count = Notice._get_collection().estimated_document_count()
+    # Reads and deletes do not move updated_at; the local version covers them
+    seed = f"notices:{current_version('notices')}:{count}:{watermark}"
+    # updated_at is local time, so no Last-Modified
+    return seed, None
+
+
+def notice_validator(notice_id=None, **kwargs):
+    """A single notice, identified by its own timestamps and state."""
+    try:
+        raw = Notice.objects(id=notice_id).only(
+            'updated_at', 'read_count', 'status', 'approval_status', 'approved_at'
+        ).as_pymongo().first()
+    except Exception:
+        return None  # Malformed id: let the view produce its usual error
+    if not raw:
+        return None
+    updated_at = raw.get('updated_at')
+    seed = (f"notice:{notice_id}:{updated_at}:{raw.get('read_count')}:"
+            f"{raw.get('status')}:{raw.get('approval_status')}:{raw.get('approved_at')}")
+    return seed, None
+
+
+def catalog_validator(**kwargs):
+    """Department / course / year / section pick lists."""
+    seed = (f"catalog:{current_version('catalog')}:"
+            f"{Department._get_collection().estimated_document_count()}:"
+            f"{Student._get_collection().estimated_document_count()}")
+    return seed, _changed_at['catalog']
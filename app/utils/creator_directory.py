@@ -0,0 +1,76 @@
+"""
+Resolves ``Notice.created_by`` ids to display names.
+
+Notices are created by Employees, with legacy ones pointing at the old
+User collection. Instead of scanning a whole collection per request, the
+ids on the current page are looked up in a single ``$in`` round trip across
+both collections (``$unionWith``), and the answers are held in a bounded
+in-process LRU with TTL. Employee edits call ``forget_creators`` so renamed
+staff show up immediately.
+"""
+from bson import ObjectId
+from config import Config
+from ..models.employee_model import Employee
+from ..models.user_model import User
+from .ttl_cache import TTLCache
+
+_creators = TTLCache(maxsize=Config.CREATOR_CACHE_SIZE, ttl=Config.CREATOR_CACHE_TTL)
+
+
+def unknown_creator(creator_id):
+    return {"id": creator_id, "name": "Unknown", "email": ""}
+
+
+def _fetch(object_ids):
+    """One round trip: Employees first, then legacy Users for the same ids."""
+    match = {'$match': {'_id': {'$in': object_ids}}}
+    project = {'$project': {'name': 1, 'email': 1}}
+    pipeline = [
+        match, project, {'$addFields': {'_rank': 0}},
+        {'$unionWith': {
+            'coll': User._get_collection_name(),
+            'pipeline': [match, project, {'$addFields': {'_rank': 1}}]
+        }},
+    ]
+    found = {}
+    for row in Employee._get_collection().aggregate(pipeline):
+        key = str(row['_id'])
+        # Employees win if an id somehow exists in both collections
+        if key not in found or row['_rank'] < found[key]['_rank']:
+            found[key] = row
+    return found
+
+
+def resolve_creators(creator_ids):
+    """Map each creator id to ``{"id", "name", "email"}``; unknown ids resolve to "Unknown"."""
+    result, missing = {}, []
+    for creator_id in set(creator_ids):
+        cached = _creators.get(creator_id)
+        if cached is None:
+            missing.append(creator_id)
+        else:
+            result[creator_id] = cached
+
+    if missing:
+        object_ids = [ObjectId(c) for c in missing if ObjectId.is_valid(c)]
+        found = _fetch(object_ids) if object_ids else {}
+        for creator_id in missing:
+            row = found.get(creator_id)
+            entry = {
+                "id": creator_id,
+                "name": row.get('name') or "Unknown",
+                "email": row.get('email') or ""
+            } if row else unknown_creator(creator_id)
+            _creators.set(creator_id, entry)
+            result[creator_id] = entry
+    return result
+
+
+def resolve_creator(creator_id):
+    return resolve_creators([creator_id]).get(creator_id, unknown_creator(creator_id))
+
+
+def forget_creators(creator_ids):
+    """Drop cached entries after the underlying Employee/User documents change."""
+    for creator_id in creator_ids:
+        _creators.pop(str(creator_id))
@@ -0,0 +1,169 @@
+"""
+Time-spent tracking from heartbeats.
+
+While a notice is open the client sends a heartbeat every
+``DWELL_HEARTBEAT_SECONDS`` (HTTP or socket). The server credits the time
+since that viewer's previous heartbeat, capped at ``DWELL_MAX_GAP_SECONDS``
+so a closed laptop lid is not counted, and keeps the running totals in
+memory. A background thread flushes them every ``DWELL_FLUSH_SECONDS`` as one
+bulk ``$inc`` of ``total_time_spent`` on the reader rows and the notices,
+so a heartbeat never costs a Mongo write of its own.
+
+Only reader rows are credited (no upsert), so time from viewers without a
+read row, e.g. heartbeats that beat a buffered read to Mongo, is dropped.
+A notice is credited with exactly what its rows took: each flush has an id
+that the rows it updated record in ``counted_dwell_batches``, and the notice
+total is summed from those rows.
+
+Delivery semantics match the read buffer: flushed on clean exit, at most
+one flush interval lost on a crash. A flush that fails is retried as is on
+the next one; both steps skip documents that already have its id, so a
+retry never credits the same seconds twice.
+"""
+import atexit
+import logging
+import threading
+import time
+from bson import ObjectId
+from pymongo import UpdateOne
+from config import Config
+from ..models.notice_model import Notice
+from ..models.notice_read_model import NoticeRead
+from .read_buffer import exit_on_sigterm
+from .read_timeseries import counted_once
+
+logger = logging.getLogger(__name__)
+
+DWELL_BATCHES = 'counted_dwell_batches'
+
+
+def write_dwell(batch_id, batch):
+    """
+    Credit ``{(notice_id, user_id): seconds}`` to the reader rows, then to
+    each notice the sum of the rows that were credited. Idempotent per
+    ``batch_id``. Returns the seconds credited.
+    """
+    reads = NoticeRead._get_collection()
+    reads.bulk_write([
+        UpdateOne(*counted_once(
+            {'notice_id': notice_id, 'user_id': user_id}, {'$inc': {'total_time_spent': seconds}}, batch_id, DWELL_BATCHES
+        ))
+        for (notice_id, user_id), seconds in batch.items()
+    ], ordered=False)
+
+    per_notice = {}
+    credited = reads.find(
+        {'notice_id': {'$in': list({notice_id for notice_id, _ in batch})}, DWELL_BATCHES: batch_id},
+        {'_id': 0, 'notice_id': 1, 'user_id': 1}
+    )
+    for row in credited:
+        key = (row['notice_id'], row['user_id'])
+        per_notice[key[0]] = per_notice.get(key[0], 0) + batch.get(key, 0)
+    if per_notice:
+        Notice._get_collection().bulk_write([
+            UpdateOne(*counted_once({'_id': notice_id}, {'$inc': {'total_time_spent': seconds}}, batch_id, DWELL_BATCHES))
+            for notice_id, seconds in per_notice.items()
+        ], ordered=False)
+    return sum(per_notice.values())
+
+
+class DwellAccumulator:
+    """Per (notice, user) seconds credited from heartbeats, waiting for the next flush."""
+
+    def __init__(self, max_gap_seconds=45, flush_seconds=10):
+        self.max_gap = max_gap_seconds
+        self.flush_interval = flush_seconds
+        self.lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._last_beat = {}  # (notice_id, user_id) -> monotonic time of last heartbeat
+        self._pending = {}  # (notice_id, user_id) -> seconds not yet written
+        self._failed = None  # (batch_id, batch) of a failed flush, retried before anything new
+        self._counters = {
+            "heartbeats": 0, "flushes": 0, "failed_flushes": 0, "seconds_flushed": 0, "seconds_without_read": 0,
+        }
+
+    def heartbeat(self, notice_id, user_id):
+        """Credit the time since this viewer's previous heartbeat. Returns the seconds credited."""
+        key = (notice_id, user_id)
+        now = time.monotonic()
+        with self.lock:
+            self._counters["heartbeats"] += 1
+            last = self._last_beat.get(key)
+            self._last_beat[key] = now
+            if last is None or now - last > self.max_gap:
+                return 0  # first beat of a viewing session
+            credited = now - last
+            self._pending[key] = self._pending.get(key, 0.0) + credited
+            return credited
+
+    def _take(self):
+        with self.lock:
+            # Keep fractions of a second for the next flush
+            batch = {key: int(seconds) for key, seconds in self._pending.items() if seconds >= 1}
+            for key, seconds in batch.items():
+                self._pending[key] -= seconds
+                if self._pending[key] <= 0:
+                    del self._pending[key]
+            # Forget viewers whose session has ended
+            cutoff = time.monotonic() - self.max_gap
+            self._last_beat = {key: at for key, at in self._last_beat.items() if at >= cutoff}
+        return batch
+
+    def _write(self, batch_id, batch):
+        try:
+            credited = write_dwell(batch_id, batch)
+        except Exception:
+            self._failed = (batch_id, batch)
+            with self.lock:
+                self._counters["failed_flushes"] += 1
+            logger.exception("dwell flush failed")
+            return None
+        self._failed = None
+        with self.lock:
+            self._counters["flushes"] += 1
+            self._counters["seconds_flushed"] += credited
+            self._counters["seconds_without_read"] += sum(batch.values()) - credited
+        return credited
+
+    def flush(self):
+        """Write pending seconds in bulk. Returns the number of seconds credited."""
+        with self._flush_lock:
+            total = 0
+            if self._failed is not None:
+                total = self._write(*self._failed)
+                if total is None:
+                    return 0
+            batch = self._take()
+            if batch:
+                total += self._write(ObjectId(), batch) or 0
+            return total
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def start(self, flush_on_exit=True):
+        """Start the background flusher (idempotent)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="dwell-flusher", daemon=True)
+        self._thread.start()
+        if flush_on_exit:
+            atexit.register(self.flush)
+            exit_on_sigterm()
+
+    def stats(self):
+        with self.lock:
+            return dict(
+                self._counters,
+                active_viewers=len(self._last_beat),
+                pending_seconds=round(sum(self._pending.values()), 1),
+            )
+
+
+dwell_tracker = DwellAccumulator(
+    max_gap_seconds=Config.DWELL_MAX_GAP_SECONDS,
+    flush_seconds=Config.DWELL_FLUSH_SECONDS,
+)
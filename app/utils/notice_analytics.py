@@ -0,0 +1,79 @@
+"""
+Dashboard-wide notice analytics computed inside MongoDB.
+
+One ``$facet`` aggregation returns the totals and the breakdowns by status,
+priority, notice type and department in a single round trip. Only the few
+numeric and grouping fields are projected, so the ``reads`` arrays and HTML
+content never leave the server and nothing is summed in Python.
+"""
+from ..models.notice_model import Notice
+
+UNSPECIFIED = "unspecified"
+
+BREAKDOWNS = {
+    'byStatus': 'status',
+    'byPriority': 'priority',
+    'byNoticeType': 'notice_type',
+    'byDepartment': 'departments',
+}
+
+
+def _group_by(field):
+    return [
+        {'$group': {
+            '_id': f'${field}',
+            'notices': {'$sum': 1},
+            'reads': {'$sum': {'$ifNull': ['$read_count', 0]}},
+        }},
+        {'$sort': {'notices': -1}},
+    ]
+
+
+def analytics_pipeline():
+    facets = {
+        'totals': [{'$group': {
+            '_id': None,
+            'notices': {'$sum': 1},
+            'reads': {'$sum': {'$ifNull': ['$read_count', 0]}},
+            'interactions': {'$sum': {'$ifNull': ['$total_reads', 0]}},
+            'time_spent': {'$sum': {'$ifNull': ['$total_time_spent', 0]}},
+        }}],
+    }
+    for key, field in BREAKDOWNS.items():
+        if field == 'departments':
+            # A notice counts once for each department it targets; untargeted ones land in UNSPECIFIED
+            facets[key] = [{'$unwind': {'path': '$departments', 'preserveNullAndEmptyArrays': True}}] + _group_by(field)
+        else:
+            facets[key] = _group_by(field)
+    return [
+        {'$project': {
+            'status': 1, 'priority': 1, 'notice_type': 1, 'departments': 1,
+            'read_count': 1, 'total_reads': 1, 'total_time_spent': 1,
+        }},
+        {'$facet': facets},
+    ]
+
+
+def notice_analytics_summary():
+    """Totals plus per-status / priority / type / department counts, in one aggregation."""
+    result = next(Notice._get_collection().aggregate(analytics_pipeline()), {})
+    totals = (result.get('totals') or [{}])[0]
+    total_notices = totals.get('notices', 0)
+    total_reads = totals.get('reads', 0)
+
+    summary = {
+        "totalNotices": total_notices,
+        "totalReads": total_reads,  # Unique readers summed over notices
+        "totalInteractions": totals.get('interactions', 0),  # Every open, including repeats
+        "totalTimeSpent": totals.get('time_spent', 0),
+        "averageReadsPerNotice": total_reads / total_notices if total_notices > 0 else 0,
+    }
+    for key in BREAKDOWNS:
+        groups = {}
+        for row in result.get(key, []):
+            # Missing and empty values are both "unspecified"
+            group = groups.setdefault(row['_id'] if row['_id'] not in (None, '') else UNSPECIFIED, {"notices": 0, "reads": 0})
+            group["notices"] += row['notices']
+            group["reads"] += row['reads']
+        summary[key] = groups
+    return summary
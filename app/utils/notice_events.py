@@ -0,0 +1,63 @@
+"""
+In-process hooks fired from the notice write paths.
+
+Caches and derived views register a listener here instead of every
+controller knowing about every cache. Controllers call ``notice_changed``
+after creating, editing, deleting or changing the approval state of a
+notice, ``notice_read`` after a read is recorded and ``approval_changed``
+after an approval record is created or decided. Listeners must be
+cheap and must not raise; failures are logged and swallowed so a cache bug
+can never fail a write request.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+_change_listeners = []
+_read_listeners = []
+_approval_listeners = []
+
+
+def on_notice_changed(fn):
+    """Register ``fn(notice)`` to run after any notice mutation. Usable as a decorator."""
+    _change_listeners.append(fn)
+    return fn
+
+
+def on_notice_read(fn):
+    """Register ``fn(notice_id)`` to run after read counters change. Usable as a decorator."""
+    _read_listeners.append(fn)
+    return fn
+
+
+def on_approval_changed(fn):
+    """Register ``fn(approval)`` to run after an approval is created or decided. Usable as a decorator."""
+    _approval_listeners.append(fn)
+    return fn
+
+
+def _fire(listeners, arg):
+    for listener in listeners:
+        try:
+            listener(arg)
+        except Exception:
+            logger.exception("notice event listener %r failed", listener)
+
+
+def notice_changed(notice=None):
+    """
+    Notify listeners that ``notice`` was created, updated or deleted.
+    Pass None when the affected notice is unknown; listeners then drop
+    everything they hold.
+    """
+    _fire(_change_listeners, notice)
+
+
+def notice_read(notice_id):
+    """Notify listeners that read counters of ``notice_id`` changed."""
+    _fire(_read_listeners, notice_id)
+
+
+def approval_changed(approval=None):
+    """Notify listeners that ``approval`` was created or decided (None: unknown / several)."""
+    _fire(_approval_listeners, approval)
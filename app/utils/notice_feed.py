@@ -0,0 +1,131 @@
+"""
+Audience-targeted notice feed.
+
+A notice targets students through ``departments`` (branch names),
+``program_course``, ``year`` and ``section``; an empty value means "everyone".
+The feed is evaluated at read time against the reader's own attributes, so
+publishing a notice to a whole year is a single insert instead of a
+per-student fan-out write into ``Student.notices``.
+
+Each targeting field becomes a small ``$in`` over ``[own value, untargeted]``.
+With the compound (status, departments, program_course, year, section,
+created_at, _id) index on Notice the planner expands those into a handful of
+point ranges and merges them already sorted by ``created_at``, so pages come
+straight off the index.
+
+Everyone in the same cohort (branch, course, year, section) sees the same
+feed, so rendered pages are cached per cohort rather than per user and
+dropped whenever a notice addressed to that cohort changes. Per-user read
+state is layered on top of the shared page at request time.
+"""
+import threading
+from config import Config
+from ..models.notice_model import Notice
+from ..models.student_model import Student
+from ..models.employee_model import Employee
+from .notice_events import on_notice_changed
+from .ttl_cache import TTLCache
+
+# Values that mean a targeting field was left blank on the notice
+UNTARGETED = ['', None]
+
+
+def _match_one(value):
+    if value in UNTARGETED:
+        return {'$in': UNTARGETED}
+    return {'$in': [value] + UNTARGETED}
+
+
+def audience_query(branch=None, course=None, year=None, section=None):
+    """Raw Mongo filter matching published notices visible to this audience."""
+    departments = [branch, []] if branch else [[]]
+    return {
+        'status': 'published',
+        # Matches notices listing the branch or listing no departments at all
+        'departments': {'$in': departments},
+        'program_course': _match_one(course),
+        'year': _match_one(year),
+        'section': _match_one(section),
+    }
+
+
+def feed_query_for(user):
+    """Audience filter for the logged-in user, or None if they see every published notice."""
+    if isinstance(user, Student):
+        return audience_query(user.branch, user.course, user.year, user.section)
+    if isinstance(user, Employee):
+        # Staff see everything addressed to their department; class-level
+        # targeting (course/year/section) does not apply to them
+        return {'status': 'published', 'departments': {'$in': [user.department, []]}}
+    return None
+
+
+def feed_queryset(user):
+    """Notice queryset backing the user's personal feed."""
+    query = feed_query_for(user)
+    if query is None:
+        return Notice.objects(status='published')
+    return Notice.objects(__raw__=query)
+
+
+def cohort_key(user):
+    """Cache key shared by every user who sees the same feed."""
+    if isinstance(user, Student):
+        return ('student', user.branch, user.course, user.year, user.section)
+    if isinstance(user, Employee):
+        return ('employee', user.department)
+    return ('all',)
+
+
+def _targets(notice_value, cohort_value):
+    return notice_value in UNTARGETED or notice_value == cohort_value
+
+
+def cohort_sees(cohort, notice):
+    """Python mirror of feed_query_for: could ``notice`` appear in this cohort's feed?"""
+    departments = notice.departments or []
+    if cohort[0] == 'student':
+        _, branch, course, year, section = cohort
+        return ((not departments or branch in departments)
+                and _targets(notice.program_course, course)
+                and _targets(notice.year, year)
+                and _targets(notice.section, section))
+    if cohort[0] == 'employee':
+        return not departments or cohort[1] in departments
+    return True
+
+
+_feed_cache = TTLCache(maxsize=Config.FEED_CACHE_SIZE, ttl=Config.FEED_CACHE_TTL)
+_generation_lock = threading.Lock()
+_generation = 0
+
+
+def cached_feed_page(user, page_args, build_page):
+    """
+    Return ``build_page()`` for this user's cohort and page, computing it at
+    most once per cohort until it expires or a relevant notice changes.
+    The returned page is shared; callers must copy items before mutating them.
+    """
+    key = (cohort_key(user), page_args)
+    page = _feed_cache.get(key)
+    if page is not None:
+        return page
+
+    generation = _generation
+    page = build_page()
+    # Skip the store if a notice changed while we were building, the page may be stale
+    with _generation_lock:
+        if generation == _generation:
+            _feed_cache.set(key, page)
+    return page
+
+
+@on_notice_changed
+def _invalidate_cohort_feeds(notice):
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        if notice is None:
+            _feed_cache.clear()
+        else:
+            _feed_cache.evict(lambda key: cohort_sees(key[0], notice))
@@ -0,0 +1,91 @@
+"""
+Query-string filters for the notice list endpoints.
+
+Every filter maps onto an indexed Notice field so dashboards can fetch just
+the slice they render instead of downloading everything and filtering in
+the browser. Multi-valued filters accept repeated parameters
+(``?status=draft&status=published``) or a comma separated list.
+"""
+import datetime
+from ..models.notice_model import Notice
+
+# query parameter -> Notice field
+EQUALITY_FILTERS = {
+    'status': 'status',
+    'priority': 'priority',
+    'notice_type': 'notice_type',
+    'department': 'departments',
+    'program_course': 'program_course',
+    'year': 'year',
+    'section': 'section',
+    'approval_status': 'approval_status',
+}
+
+SORTABLE_FIELDS = ('created_at', 'updated_at')
+
+
+def _values(args, name):
+    values = []
+    for raw in args.getlist(name):
+        values.extend(v.strip() for v in raw.split(',') if v.strip())
+    return values
+
+
+def _parse_date(raw, name, end_of_range=False):
+    try:
+        if len(raw) == 10:  # plain YYYY-MM-DD
+            value = datetime.datetime.strptime(raw, '%Y-%m-%d')
+            # A bare end date covers the whole day
+            return value + datetime.timedelta(days=1) if end_of_range else value
+        value = datetime.datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date (YYYY-MM-DD) or datetime")
+    # Stored timestamps are naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_notice_filters(args):
+    """
+    Translate request args into MongoEngine filter kwargs for Notice.objects().
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    filters = {}
+    for param, field in EQUALITY_FILTERS.items():
+        values = _values(args, param)
+        if not values:
+            continue
+        choices = Notice._fields[field].choices
+        if choices:
+            invalid = [v for v in values if v not in choices]
+            if invalid:
+                raise ValueError(f"Invalid {param}: {', '.join(invalid)}. Allowed: {', '.join(choices)}")
+        if len(values) == 1:
+            filters[field] = values[0]
+        else:
+            filters[f'{field}__in'] = values
+
+    created_from = args.get('created_from')
+    created_to = args.get('created_to')
+    if created_from:
+        filters['created_at__gte'] = _parse_date(created_from, 'created_from')
+    if created_to:
+        filters['created_at__lt'] = _parse_date(created_to, 'created_to', end_of_range=True)
+    if created_from and created_to and filters['created_at__gte'] >= filters['created_at__lt']:
+        raise ValueError("created_from must be before created_to")
+
+    return filters
+
+
+def parse_notice_sort(args):
+    """
+    Read ``sort`` (e.g. ``-created_at``, ``updated_at``) and return
+    ``(field, descending)``. Defaults to newest first.
+    """
+    raw = args.get('sort', '-created_at').strip()
+    descending = raw.startswith('-')
+    field = raw.lstrip('-+')
+    if field not in SORTABLE_FIELDS:
+        raise ValueError(f"sort must be one of: {', '.join(SORTABLE_FIELDS)} (prefix with - for descending)")
+    return field, descending
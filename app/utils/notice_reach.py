@@ -0,0 +1,130 @@
+"""
+Audience reach: how much of the cohort a notice targets has actually read it.
+
+The audience is the set of students matching the notice's ``departments`` /
+``program_course`` / ``year`` / ``section`` (see notice_feed.py for the same
+rules from the reader's side). It is intersected with the notice's reader
+rows entirely inside MongoDB, in one aggregation over ``students``:
+
+1. the audience is matched on the (branch, course, year, section) index and
+   reduced to the string id the reader rows use,
+2. ``$unionWith`` appends the notice's ``notice_reads`` rows (an index range
+   on ``notice_id``),
+3. one ``$group`` on the id hash-joins the two sets, so a student is an
+   audience member, a reader, or both,
+4. a ``$facet`` returns the per-section counts and one keyset page of
+   non-readers ordered by roll number.
+
+That is a single pass over at most audience + readers small documents, with
+no per-student index probe, so a 20k-student year stays one round trip.
+With ``REACH_ENGINE=bitmap`` the same report is answered from precomputed
+bitmaps instead (see reach_bitmaps.py).
+"""
+from ..models.student_model import Student
+from ..models.notice_read_model import NoticeRead
+from .notice_feed import UNTARGETED
+from .pagination import encode_cursor, decode_cursor
+
+STUDENT_FIELDS = ('name', 'univ_roll_no', 'branch', 'course', 'year', 'section', 'official_email')
+
+
+def audience_filter(notice):
+    """Raw ``students`` filter for everyone a (raw) notice row is addressed to."""
+    query = {}
+    if notice.get('departments'):
+        query['branch'] = {'$in': notice['departments']}
+    for field, student_field in (('program_course', 'course'), ('year', 'year'), ('section', 'section')):
+        if notice.get(field) not in UNTARGETED:
+            query[student_field] = notice[field]
+    return query
+
+
+def audience_size(notice):
+    """Number of students a (raw) notice row is addressed to."""
+    return Student._get_collection().count_documents(audience_filter(notice))
+
+
+def _after(after):
+    roll_no, last_id = decode_cursor(after)
+    return {'$or': [
+        {'student.univ_roll_no': {'$gt': roll_no}},
+        {'student.univ_roll_no': roll_no, 'student._id': {'$gt': last_id}},
+    ]}
+
+
+def reach_pipeline(notice, limit, after=None):
+    """The single aggregation behind notice_reach, run against ``students``."""
+    student = {field: f'${field}' for field in STUDENT_FIELDS}
+    student['_id'] = '$_id'
+    non_readers = [{'$match': {'read': None}}]
+    if after:
+        non_readers.append({'$match': _after(after)})
+    non_readers += [
+        {'$sort': {'student.univ_roll_no': 1, 'student._id': 1}},
+        # One extra row tells us whether another page exists
+        {'$limit': limit + 1},
+        {'$replaceRoot': {'newRoot': '$student'}},
+    ]
+    return [
+        {'$match': audience_filter(notice)},
+        {'$project': {'_id': 0, 'uid': {'$toString': '$_id'}, 'student': student}},
+        {'$unionWith': {'coll': NoticeRead._get_collection_name(), 'pipeline': [
+            {'$match': {'notice_id': notice['_id']}},
+            {'$project': {'_id': 0, 'uid': '$user_id', 'read': {'$literal': 1}}},
+        ]}},
+        # Hash join on the user id: audience rows carry ``student``, reader rows ``read``
+        {'$group': {'_id': '$uid', 'student': {'$max': '$student'}, 'read': {'$max': '$read'}}},
+        {'$match': {'student': {'$ne': None}}},
+        {'$facet': {
+            'bySection': [
+                {'$group': {
+                    '_id': {
+                        'branch': '$student.branch', 'course': '$student.course',
+                        'year': '$student.year', 'section': '$student.section',
+                    },
+                    'audience': {'$sum': 1},
+                    'readers': {'$sum': {'$ifNull': ['$read', 0]}},
+                }},
+                {'$sort': {'_id.branch': 1, '_id.course': 1, '_id.year': 1, '_id.section': 1}},
+            ],
+            'nonReaders': non_readers,
+        }},
+    ]
+
+
+def reach_percentage(part, whole):
+    return round(part / whole * 100, 1) if whole else 0
+
+
+def notice_reach(notice, limit, after=None):
+    """
+    Reach of a raw notice row (needs ``_id`` and the targeting fields).
+    Returns ``(summary, non_readers, next_cursor)``; ``non_readers`` are raw
+    student rows.
+    """
+    result = next(Student._get_collection().aggregate(reach_pipeline(notice, limit, after)), {})
+
+    sections = []
+    audience = readers = 0
+    for row in result.get('bySection', []):
+        audience += row['audience']
+        readers += row['readers']
+        sections.append(dict(
+            row['_id'], audience=row['audience'], readers=row['readers'],
+            reachPercentage=reach_percentage(row['readers'], row['audience'])
+        ))
+
+    non_readers = result.get('nonReaders', [])
+    next_cursor = None
+    if len(non_readers) > limit:
+        non_readers = non_readers[:limit]
+        next_cursor = encode_cursor(non_readers[-1].get('univ_roll_no'), non_readers[-1]['_id'])
+
+    summary = {
+        "audienceSize": audience,
+        "readers": readers,
+        "nonReaderCount": audience - readers,
+        "reachPercentage": reach_percentage(readers, audience),
+        "bySection": sections,
+    }
+    return summary, non_readers, next_cursor
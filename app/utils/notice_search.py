@@ -0,0 +1,109 @@
+"""
+Full-text notice search.
+
+Matching uses the weighted text index on Notice (title 10, subject 5,
+plain-text content 1). Mongo's text score is then multiplied by two boosts
+inside the same aggregation so ranking never happens in Python:
+
+* recency: ``1 + RECENCY_WEIGHT * HALF_LIFE / (HALF_LIFE + age_days)``, so a
+  notice from today gets up to ``1 + RECENCY_WEIGHT`` and old ones decay
+  towards 1.
+* priority: a flat multiplier per priority level.
+
+Pages are keyset-paginated on ``(rank, _id)``. The cursor also carries the
+"now" the first page was ranked with, so later pages recompute exactly the
+same ranks and never skip or repeat a result.
+"""
+import datetime
+from .pagination import encode_cursor, decode_cursor
+from .notice_summary import NOTICE_SUMMARY_FIELDS
+
+MAX_QUERY_LENGTH = 200
+
+RECENCY_WEIGHT = 1.0
+RECENCY_HALF_LIFE_DAYS = 14
+PRIORITY_BOOSTS = {"Highly Urgent": 1.5, "Urgent": 1.25}
+
+_MS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+def parse_search_query(args):
+    """Read ``q`` from the query string. Raises ValueError with a client-facing message."""
+    q = (args.get('q') or '').strip()
+    if not q:
+        raise ValueError("q is required")
+    if len(q) > MAX_QUERY_LENGTH:
+        raise ValueError(f"q must be at most {MAX_QUERY_LENGTH} characters")
+    return q
+
+
+def _rank_expression(now):
+    age_days = {'$max': [0, {'$divide': [{'$subtract': [now, '$created_at']}, _MS_PER_DAY]}]}
+    recency = {'$add': [1, {'$divide': [
+        RECENCY_WEIGHT * RECENCY_HALF_LIFE_DAYS,
+        {'$add': [RECENCY_HALF_LIFE_DAYS, age_days]}
+    ]}]}
+    priority = {'$switch': {
+        'branches': [
+            {'case': {'$eq': ['$priority', level]}, 'then': boost}
+            for level, boost in PRIORITY_BOOSTS.items()
+        ],
+        'default': 1,
+    }}
+    return {'$multiply': [{'$meta': 'textScore'}, recency, priority]}
+
+
+def _decode_search_cursor(after):
+    value, last_id = decode_cursor(after)
+    try:
+        rank, now = value
+        return float(rank), datetime.datetime.fromisoformat(now), last_id
+    except (TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def search_pipeline(q, match, limit, after=None, now=None):
+    """
+    Build the ranked search aggregation. ``match`` is a raw filter combined
+    with the text match (filters, audience). Returns ``(pipeline, now)``.
+    """
+    last = None
+    if after:
+        rank, now, last_id = _decode_search_cursor(after)
+        last = (rank, last_id)
+    if now is None:
+        now = datetime.datetime.utcnow()  # create_notice stores created_at in UTC
+        # BSON dates are millisecond precision; keep the cursor exact
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+    # $text has to sit in the very first $match to use the text index
+    pipeline = [
+        {'$match': dict(match, **{'$text': {'$search': q}})},
+        {'$addFields': {'rank': _rank_expression(now)}},
+    ]
+    if last:
+        rank, last_id = last
+        pipeline.append({'$match': {'$or': [
+            {'rank': {'$lt': rank}},
+            {'rank': rank, '_id': {'$lt': last_id}},
+        ]}})
+    projection = {field: 1 for field in NOTICE_SUMMARY_FIELDS if field != 'id'}
+    projection['rank'] = 1
+    pipeline += [
+        {'$sort': {'rank': -1, '_id': -1}},
+        # One extra row tells us whether another page exists
+        {'$limit': limit + 1},
+        {'$project': projection},
+    ]
+    return pipeline, now
+
+
+def ranked_search(collection, q, match, limit, after=None):
+    """Run one page of the search. Returns ``(rows, next_cursor)``."""
+    pipeline, now = search_pipeline(q, match, limit, after)
+    rows = list(collection.aggregate(pipeline))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]['rank'], now.isoformat()], rows[-1]['_id'])
+    return rows, next_cursor
@@ -0,0 +1,61 @@
+"""
+Lightweight notice representation for list endpoints.
+
+List views only render titles, badges and dates, so they must never pull
+the unbounded ``reads`` array, ``recipient_emails`` or the full HTML
+``content`` off the wire. Queries go through ``summary_queryset`` which
+projects just the fields below and returns raw dicts (no Document
+hydration); the precomputed ``excerpt`` stands in for the content.
+"""
+from .serializers import compile_spec
+
+NOTICE_SUMMARY_FIELDS = (
+    'id', 'title', 'subject', 'excerpt', 'notice_type', 'departments',
+    'program_course', 'specialization', 'year', 'section', 'priority',
+    'status', 'from_field', 'publish_at', 'created_at', 'updated_at',
+    'read_count', 'requires_approval', 'approval_status', 'approved_by_name',
+    'approved_at', 'approval_comments', 'created_by', 'attachments',
+)
+
+
+def summary_queryset(queryset):
+    """Restrict a Notice queryset to the summary projection as raw dicts."""
+    return queryset.only(*NOTICE_SUMMARY_FIELDS).as_pymongo()
+
+
+_summary_row = compile_spec((
+    ("id", "_id", None, str),
+    ("title", "title", None),
+    ("subject", "subject", None),
+    ("excerpt", "excerpt", ""),
+    ("notice_type", "notice_type", None),
+    ("departments", "departments", []),
+    ("program_course", "program_course", None),
+    ("specialization", "specialization", None),
+    ("year", "year", None),
+    ("section", "section", None),
+    ("priority", "priority", "Normal"),
+    ("status", "status", None),
+    ("from_field", "from_field", None),
+    ("publish_at", "publish_at", None),
+    ("created_at", "created_at", None),
+    ("updated_at", "updated_at", None),
+    ("read_count", "read_count", 0),
+    ("requires_approval", "requires_approval", False),
+    ("approval_status", "approval_status", None),
+    ("approved_by_name", "approved_by_name", None),
+    ("approved_at", "approved_at", None),
+    ("approval_comments", "approval_comments", None),
+    ("attachments", "attachments", []),
+))
+
+
+def notice_summary(raw, creator):
+    """
+    Build the list-view dict for one raw notice from ``summary_queryset``.
+    ``creator`` is the entry from ``creator_directory.resolve_creators``.
+    Datetimes are left for the encoder; send it with ``serializers.json_response``.
+    """
+    item = _summary_row(raw)
+    item["createdBy"] = creator
+    return item
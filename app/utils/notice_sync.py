@@ -0,0 +1,136 @@
+"""
+Delta sync for clients that keep a local copy of the notice list.
+
+A sync token is a ``(timestamp, _id)`` position in one combined change log:
+notices ordered by ``(updated_at, _id)`` plus deletion tombstones ordered by
+``(deleted_at, notice_id)``. Each call returns the changes strictly after the
+token, oldest first, and a new token to resume from. Omitting the token
+starts from the beginning, which doubles as the initial full download.
+Tombstones expire after NOTICE_TOMBSTONE_RETENTION_DAYS, so tokens handed
+out longer ago than that are refused and the client has to start over.
+
+Every write path that edits a notice must bump ``updated_at``. Read counters
+deliberately do not, otherwise every page view would show up as a change.
+
+Writes are stamped before they commit, so a change can become visible with a
+slightly older timestamp than one already handed out. To avoid missing those,
+a token never moves past ``now - SETTLE_SECONDS``: the last few seconds of
+changes may be sent twice, and clients apply changes idempotently by id.
+"""
+import datetime
+from types import SimpleNamespace
+from bson import ObjectId
+from config import Config
+from .pagination import encode_cursor, decode_cursor
+from .notice_summary import NOTICE_SUMMARY_FIELDS
+from .notice_feed import cohort_sees
+from ..models.notice_model import Notice
+from ..models.notice_tombstone_model import NoticeTombstone
+
+SETTLE_SECONDS = 5
+
+_ORIGIN = (datetime.datetime.min, ObjectId('0' * 24))
+
+
+class SyncTokenExpired(Exception):
+    """The token predates the tombstone retention window; the client must resync in full."""
+
+
+def _encode_token(position, issued_at):
+    value, last_id = position
+    return encode_cursor([value.isoformat(), issued_at.isoformat()], last_id)
+
+
+def parse_sync_token(args):
+    """
+    Read ``since`` from the query string. Returns the ``(timestamp, _id)``
+    position, or None for a full sync.
+    Raises ValueError on a malformed token and SyncTokenExpired on a stale one.
+    """
+    token = args.get('since') or None
+    if not token:
+        return None
+    try:
+        (value, issued_at), last_id = decode_cursor(token)
+        value = datetime.datetime.fromisoformat(value)
+        issued_at = datetime.datetime.fromisoformat(issued_at)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid sync token")
+    # Expiry goes by when the token was handed out, not by its position: a
+    # client paging through a full sync holds positions far in the past.
+    horizon = datetime.datetime.now() - datetime.timedelta(days=Config.NOTICE_TOMBSTONE_RETENTION_DAYS)
+    if issued_at < horizon:
+        raise SyncTokenExpired()
+    return value, last_id
+
+
+def _after(field, id_field, position):
+    value, last_id = position
+    return {'$or': [{field: {'$gt': value}}, {field: value, id_field: {'$gt': last_id}}]}
+
+
+def _changed_notices(since, limit):
+    projection = {field: 1 for field in NOTICE_SUMMARY_FIELDS if field != 'id'}
+    cursor = Notice._get_collection().find(_after('updated_at', '_id', since), projection)
+    return list(cursor.sort([('updated_at', 1), ('_id', 1)]).limit(limit))
+
+
+def _tombstones(since, limit):
+    cursor = NoticeTombstone._get_collection().find(
+        _after('deleted_at', 'notice_id', since), {'deleted_at': 1, 'notice_id': 1}
+    )
+    return list(cursor.sort([('deleted_at', 1), ('notice_id', 1)]).limit(limit))
+
+
+def _visible_to(cohort, row):
+    if cohort is None:
+        return True
+    notice = SimpleNamespace(
+        departments=row.get('departments'), program_course=row.get('program_course'),
+        year=row.get('year'), section=row.get('section'),
+    )
+    return row.get('status') == 'published' and cohort_sees(cohort, notice)
+
+
+def changes_since(since, limit, cohort=None):
+    """
+    Collect up to ``limit`` changes after ``since``.
+
+    ``cohort`` (from notice_feed.cohort_key) limits upserts to notices that
+    cohort may see; a changed notice outside it is reported as removed, which
+    covers notices retargeted away from or unpublished for the reader.
+
+    Returns ``(rows, removed_ids, next_token, has_more)`` where ``rows`` are
+    raw summary rows and ``removed_ids`` are string ids.
+    """
+    start = since or _ORIGIN
+    events = [((row['updated_at'], row['_id']), row) for row in _changed_notices(start, limit + 1)]
+    if since is not None:
+        # Nothing to delete on a first sync
+        events += [((row['deleted_at'], row['notice_id']), None) for row in _tombstones(start, limit + 1)]
+    events.sort(key=lambda event: event[0])
+
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    rows, removed = [], []
+    for position, row in events:
+        if row is None:
+            removed.append(str(position[1]))
+        elif _visible_to(cohort, row):
+            rows.append(row)
+        else:
+            removed.append(str(row['_id']))
+
+    now = datetime.datetime.now()
+    if has_more:
+        position = events[-1][0]
+    else:
+        # Caught up: resume from the settle point (never going backwards)
+        position = max(start, (now - datetime.timedelta(seconds=SETTLE_SECONDS), _ORIGIN[1]))
+    return rows, removed, _encode_token(position, now), has_more
+
+
+def record_deletion(notice):
+    """Write the tombstone for ``notice``; call before deleting it."""
+    NoticeTombstone(notice_id=notice.id, published_at=notice.publish_at or notice.created_at).save()
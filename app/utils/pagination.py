@@ -0,0 +1,133 @@
+import base64
+import datetime
+import json
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine.queryset.visitor import Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def wants_pagination(args):
+    """True when the client asked for a page instead of the legacy full list."""
+    return 'limit' in args or 'after' in args
+
+
+def parse_pagination_args(args):
+    """
+    Read and validate ``limit`` / ``after`` from the query string.
+    Raises ValueError with a client-facing message on bad input.
+    """
+    raw_limit = args.get('limit', DEFAULT_PAGE_SIZE)
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    after = args.get('after') or None
+    if after:
+        decode_cursor(after)  # fail fast on a malformed cursor
+    return limit, after
+
+
+def sort_key(field, descending=True):
+    """The ``sort`` spelling of an ordering, e.g. ``-created_at``."""
+    return f'{"-" if descending else ""}{field}'
+
+
+def encode_cursor(value, doc_id, sort=None):
+    """
+    Pack a ``(sort value, _id)`` pair into an opaque URL-safe token. ``sort``
+    (see sort_key) records the ordering the pair belongs to.
+    """
+    if isinstance(value, datetime.datetime):
+        value = {"$dt": value.isoformat()}
+    parts = [value, str(doc_id)] if sort is None else [value, str(doc_id), sort]
+    payload = json.dumps(parts, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort=None):
+    """
+    Inverse of encode_cursor. Raises ValueError if the token was tampered
+    with, or if ``sort`` is given and the token was issued for another one.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value, doc_id, *cursor_sort = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if isinstance(value, dict) and '$dt' in value:
+            value = datetime.datetime.fromisoformat(value['$dt'])
+        doc_id = ObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId, json.JSONDecodeError):
+        raise ValueError("Invalid pagination cursor")
+    if sort is not None and cursor_sort != [sort]:
+        raise ValueError(f"Pagination cursor does not match sort={sort}; start again without after")
+    return value, doc_id
+
+
+def check_cursor_sort(page_args, field, descending=True):
+    """Reject an ``after`` cursor from parse_pagination_args that was issued for another sort."""
+    if page_args is not None and page_args[1]:
+        decode_cursor(page_args[1], sort_key(field, descending))
+
+
+def _sort_key(item, field):
+    # Works for hydrated Documents as well as raw as_pymongo() dicts
+    if isinstance(item, dict):
+        return item.get(field), item['_id']
+    return getattr(item, field), item.id
+
+
+def keyset_paginate(queryset, limit, after=None, field='created_at', descending=True):
+    """
+    Return one page of ``queryset`` ordered by ``(field, _id)``, newest-first
+    unless ``descending`` is False.
+
+    Instead of skip/offset the query resumes strictly after the last
+    ``(field, _id)`` pair seen, so every page is a bounded index range scan
+    and page N costs the same as page 1. ``_id`` breaks ties between
+    documents sharing the same ``field`` value.
+
+    The cursor carries the ordering it was issued for; resuming it under a
+    different ``field`` / ``descending`` raises ValueError.
+
+    Returns ``(items, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    op, sign = ('lt', '-') if descending else ('gt', '')
+    sort = sort_key(field, descending)
+    if after:
+        value, last_id = decode_cursor(after, sort)
+        queryset = queryset.filter(
+            Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': last_id})
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    items = list(queryset.order_by(f'{sign}{field}', f'{sign}id').limit(limit + 1))
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(*_sort_key(items[-1], field), sort)
+    return items, next_cursor
+
+
+def paginate_queryset(queryset, page_args, field='created_at', descending=True):
+    """
+    Apply keyset pagination when ``page_args`` (from parse_pagination_args)
+    is set, otherwise return the full queryset in the same order as before.
+    """
+    if page_args is None:
+        return queryset.order_by(sort_key(field, descending)), None
+    limit, after = page_args
+    return keyset_paginate(queryset, limit, after, field=field, descending=descending)
+
+
+def page_payload(items, next_cursor, key='notices'):
+    """Envelope returned by list endpoints when a page was requested."""
+    return {
+        key: items,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
+    }
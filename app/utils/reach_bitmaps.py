@@ -0,0 +1,203 @@
+"""
+Reach, overlap and non-reader queries over bitmaps of user ordinals.
+
+Two kinds of sets are kept as compressed bitmaps in ``reach_bitmaps``:
+
+* cohort: the students of one (branch, course, year, section). All cohorts
+  are rebuilt together with one ``$group`` over students, after
+  ``REACH_COHORT_TTL_SECONDS`` or as soon as the student catalog changes in
+  this process. A notice's audience is the union of the cohorts it targets,
+  decided with the same ``cohort_sees`` rule as the feed.
+* readers: the readers of one notice. Refreshed on demand and only while it
+  disagrees with the number of ``notice_reads`` rows (an index count, not
+  the ``read_count`` counter, which may drift): first with the reader rows
+  touched since it was built, then, if the counts still differ, from scratch.
+
+Reach is then ``len(audience & readers)``, non-readers are
+``audience - readers`` and the overlap of two notices is
+``readers_a & readers_b``, each a single bitwise pass. Non-readers are
+listed like notice_reach lists them, by roll number with the same cursors,
+by looking up the students whose ordinals are in the non-reader bitmap.
+Students deleted since the cohorts were built are simply not found.
+"""
+import datetime
+import json
+import threading
+import time
+from types import SimpleNamespace
+from pymongo import UpdateOne
+from config import Config
+from ..models.notice_read_model import NoticeRead
+from ..models.reach_bitmap_model import ReachBitmap
+from ..models.student_model import Student
+from .bitset import Bitset
+from .conditional import current_version
+from .notice_feed import cohort_sees
+from .notice_reach import STUDENT_FIELDS, reach_percentage
+from .pagination import encode_cursor, decode_cursor
+from .user_ordinals import assign_missing_ordinals, ordinals_for
+
+# Reader rows stamped just before the last refresh may commit after it
+SETTLE_SECONDS = 5
+
+_COHORT_FIELDS = ('branch', 'course', 'year', 'section')
+
+_cohort_lock = threading.Lock()
+_cohorts = {'bitmaps': None, 'loaded_at': 0.0, 'version': None}
+
+
+def _bitmaps():
+    return ReachBitmap._get_collection()
+
+
+def _build_cohorts():
+    assign_missing_ordinals()
+    pipeline = [
+        {'$match': {'ordinal': {'$ne': None}}},
+        {'$group': {
+            '_id': {field: f'${field}' for field in _COHORT_FIELDS},
+            'ordinals': {'$push': '$ordinal'},
+        }},
+    ]
+    built_at = datetime.datetime.utcnow()
+    bitmaps, ops = {}, []
+    for row in Student._get_collection().aggregate(pipeline):
+        key = [row['_id'].get(field) for field in _COHORT_FIELDS]
+        bitmap = Bitset.from_ordinals(row['ordinals'])
+        bitmaps[('student', *key)] = bitmap
+        ops.append(UpdateOne({'kind': 'cohort', 'key': json.dumps(key)}, {'$set': {
+            'bits': bitmap.to_bytes(), 'cardinality': len(bitmap), 'built_at': built_at,
+        }}, upsert=True))
+    if ops:
+        _bitmaps().bulk_write(ops, ordered=False)
+    # Cohorts that no longer have any students
+    _bitmaps().delete_many({'kind': 'cohort', 'built_at': {'$lt': built_at}})
+    return bitmaps
+
+
+def _load_cohorts():
+    horizon = datetime.datetime.utcnow() - datetime.timedelta(seconds=Config.REACH_COHORT_TTL_SECONDS)
+    rows = list(_bitmaps().find({'kind': 'cohort'}, {'key': 1, 'bits': 1, 'built_at': 1}))
+    if not rows or min(row['built_at'] for row in rows) < horizon:
+        return None
+    return {('student', *json.loads(row['key'])): Bitset.from_bytes(row['bits']) for row in rows}
+
+
+def cohort_bitmaps():
+    """``{cohort key: Bitset}`` for every student cohort, keyed like notice_feed.cohort_key."""
+    with _cohort_lock:
+        version = current_version('catalog')
+        fresh = (
+            _cohorts['bitmaps'] is not None
+            and _cohorts['version'] == version
+            and time.monotonic() - _cohorts['loaded_at'] < Config.REACH_COHORT_TTL_SECONDS
+        )
+        if not fresh:
+            # Another worker may have rebuilt them recently; only this process knows about
+            # its own catalog changes, so those always force a rebuild
+            bitmaps = _load_cohorts() if _cohorts['version'] in (None, version) else None
+            _cohorts.update(
+                bitmaps=bitmaps if bitmaps is not None else _build_cohorts(),
+                loaded_at=time.monotonic(), version=version,
+            )
+        return _cohorts['bitmaps']
+
+
+def _fold_readers(bitmap, unmapped, rows):
+    user_ids = list({row['user_id'] for row in rows})
+    ordinals = ordinals_for(user_ids)
+    return bitmap | Bitset.from_ordinals(ordinals.values()), unmapped + len(user_ids) - len(ordinals)
+
+
+def reader_bitmap(notice_id):
+    """Bitmap of everyone who has read ``notice_id``."""
+    reads = NoticeRead._get_collection()
+    key = {'kind': 'readers', 'key': str(notice_id)}
+    doc = _bitmaps().find_one(key)
+    built_at = datetime.datetime.utcnow()
+    reader_rows = reads.count_documents({'notice_id': notice_id})
+    if doc is not None:
+        bitmap, unmapped = Bitset.from_bytes(doc['bits']), doc.get('unmapped', 0)
+        if len(bitmap) + unmapped == reader_rows:
+            return bitmap
+        since = doc['built_at'] - datetime.timedelta(seconds=SETTLE_SECONDS)
+        bitmap, unmapped = _fold_readers(bitmap, unmapped, reads.find(
+            {'notice_id': notice_id, 'last_read_at': {'$gt': since}}, {'_id': 0, 'user_id': 1}
+        ))
+    if doc is None or len(bitmap) + unmapped != reader_rows:
+        bitmap, unmapped = _fold_readers(Bitset(), 0, reads.find({'notice_id': notice_id}, {'_id': 0, 'user_id': 1}))
+
+    _bitmaps().update_one(key, {'$set': {
+        'bits': bitmap.to_bytes(), 'cardinality': len(bitmap), 'unmapped': unmapped, 'built_at': built_at,
+    }}, upsert=True)
+    return bitmap
+
+
+def _targeted_cohorts(notice):
+    target = SimpleNamespace(
+        departments=notice.get('departments'), program_course=notice.get('program_course'),
+        year=notice.get('year'), section=notice.get('section'),
+    )
+    cohorts = [(key, bitmap) for key, bitmap in cohort_bitmaps().items() if cohort_sees(key, target)]
+    return sorted(cohorts, key=lambda item: tuple(value or '' for value in item[0]))
+
+
+def bitmap_audience_size(notice):
+    """Same as notice_reach.audience_size, from the cohort bitmaps."""
+    return sum(len(members) for _, members in _targeted_cohorts(notice))
+
+
+def bitmap_reach(notice, limit, after=None):
+    """
+    Same contract as notice_reach.notice_reach, including the roll number
+    order and cursors of the non-reader pages, answered from bitmaps.
+    """
+    readers = reader_bitmap(notice['_id'])
+
+    sections, audience_sets = [], []
+    audience = reached = 0
+    for key, members in _targeted_cohorts(notice):
+        count, read = len(members), len(members & readers)
+        audience += count
+        reached += read
+        audience_sets.append(members)
+        sections.append(dict(
+            zip(_COHORT_FIELDS, key[1:]), audience=count, readers=read,
+            reachPercentage=reach_percentage(read, count)
+        ))
+
+    query = {'ordinal': {'$in': (Bitset.union(audience_sets) - readers).ordinals()}}
+    if after:
+        roll_no, last_id = decode_cursor(after)
+        query['$or'] = [{'univ_roll_no': {'$gt': roll_no}}, {'univ_roll_no': roll_no, '_id': {'$gt': last_id}}]
+    non_readers = list(
+        Student._get_collection().find(query, dict.fromkeys(STUDENT_FIELDS, 1))
+        .sort([('univ_roll_no', 1), ('_id', 1)]).limit(limit + 1)
+    )
+
+    next_cursor = None
+    if len(non_readers) > limit:
+        non_readers = non_readers[:limit]
+        next_cursor = encode_cursor(non_readers[-1].get('univ_roll_no'), non_readers[-1]['_id'])
+
+    summary = {
+        "audienceSize": audience,
+        "readers": reached,
+        "nonReaderCount": audience - reached,
+        "reachPercentage": reach_percentage(reached, audience),
+        "bySection": sections,
+    }
+    return summary, non_readers, next_cursor
+
+
+def reader_overlap(first, second):
+    """How the readers of two raw notice rows (``_id``) overlap."""
+    a = reader_bitmap(first['_id'])
+    b = reader_bitmap(second['_id'])
+    both = len(a & b)
+    return {
+        "both": both,
+        "onlyFirst": len(a) - both,
+        "onlySecond": len(b) - both,
+        "either": len(a | b),
+    }
@@ -0,0 +1,264 @@
+"""
+Write-behind buffer for read events.
+
+When a notice goes out to a whole year, thousands of ``POST .../read``
+calls arrive within minutes. In buffered mode (opt-in with
+``READ_BUFFER_MODE=buffered``; the default writes each read inside the
+request) the request only records the event here and returns 202; a
+background thread folds pending events per (notice, user) and writes them
+with one bulk upsert every ``READ_BUFFER_FLUSH_MS`` milliseconds, or sooner once
+``READ_BUFFER_MAX_EVENTS`` events are waiting. A repeat click by the same user on
+the same notice within ``READ_BUFFER_DEDUPE_SECONDS`` is dropped.
+
+Delivery semantics:
+
+* Clean shutdown: pending reads are flushed from ``atexit`` (and on SIGTERM)
+  when ``READ_BUFFER_FLUSH_ON_EXIT`` is set.
+* Crash / SIGKILL: reads still in memory are lost, bounded by one flush
+  interval. Read counts are engagement metrics, not an audit log.
+* Mongo unavailable: a batch that may be partly written is retried as is
+  on the next flush, under its own id (see read_store.write_reads), so rows,
+  counters and buckets catch up without counting a read twice, even when
+  the server applied part of the failed attempt. Batches waiting for a retry
+  are bounded by ``READ_BUFFER_MAX_PENDING`` (notice, user) pairs; beyond
+  that the oldest are dropped and counted.
+"""
+import atexit
+import datetime
+import logging
+import signal
+import sys
+import threading
+import time
+from config import Config
+from .read_store import apply_reads, write_reads, ReadsNotCounted
+
+logger = logging.getLogger(__name__)
+
+
+class ReadEventBuffer:
+    """
+    Thread-safe accumulator of ``(notice_id, user_id)`` read events.
+    ``apply`` writes one batch (see read_store.apply_reads), ``retry``
+    finishes a batch that failed part way, and ``on_flush`` receives the
+    per-notice summary.
+    """
+
+    def __init__(self, flush_interval_ms=500, max_events=500, dedupe_seconds=10,
+                 max_pending=50000, apply=apply_reads, retry=write_reads):
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_events = max_events
+        self.dedupe_seconds = dedupe_seconds
+        self.max_pending = max_pending
+        self.apply = apply
+        self.retry = retry
+        self.on_flush = None
+        self.lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._wake = threading.Event()
+        self._thread = None
+        self._pending = {}  # (notice_id, user_id) -> [count, first_at, last_at]
+        self._to_retry = []  # batches that failed part way, retried first on every flush
+        self._events = 0
+        self._oldest = None  # monotonic time of the oldest unflushed event
+        self._seen = {}  # (notice_id, user_id) -> monotonic time of last accepted click
+        self._counters = {
+            "accepted": 0, "duplicates": 0, "dropped": 0, "flushed_events": 0,
+            "flushes": 0, "failed_flushes": 0, "retried_batches": 0,
+        }
+        self._last_flush = {"lag_ms": None, "duration_ms": None, "at": None, "error": None}
+        self._max_lag_ms = 0.0
+
+    def add(self, notice_id, user_id):
+        """Queue one read. Returns False when it was a duplicate or had to be dropped."""
+        key = (notice_id, user_id)
+        mono = time.monotonic()
+        now = datetime.datetime.utcnow()
+        with self.lock:
+            last = self._seen.get(key)
+            if last is not None and mono - last < self.dedupe_seconds:
+                self._counters["duplicates"] += 1
+                return False
+            entry = self._pending.get(key)
+            if entry is None:
+                if len(self._pending) >= self.max_pending:
+                    self._counters["dropped"] += 1
+                    return False
+                self._pending[key] = [1, now, now]
+            else:
+                entry[0] += 1
+                entry[2] = now
+            self._seen[key] = mono
+            self._events += 1
+            self._counters["accepted"] += 1
+            if self._oldest is None:
+                self._oldest = mono
+            full = self._events >= self.max_events
+        if full:
+            self._wake.set()
+        return True
+
+    def _take(self):
+        with self.lock:
+            batch, events, oldest = self._pending, self._events, self._oldest
+            self._pending, self._events, self._oldest = {}, 0, None
+            # Forget clicks that fell out of the dedupe window
+            cutoff = time.monotonic() - self.dedupe_seconds
+            self._seen = {key: at for key, at in self._seen.items() if at >= cutoff}
+        return batch, events, oldest
+
+    def _restore(self, batch, events, oldest):
+        with self.lock:
+            for key, (count, first_at, last_at) in batch.items():
+                entry = self._pending.get(key)
+                if entry is None:
+                    if len(self._pending) >= self.max_pending:
+                        self._counters["dropped"] += count
+                        continue
+                    self._pending[key] = [count, first_at, last_at]
+                else:
+                    entry[0] += count
+                    entry[1] = min(entry[1], first_at)
+                    entry[2] = max(entry[2], last_at)
+            self._events += events
+            self._oldest = oldest if self._oldest is None else min(self._oldest, oldest)
+
+    def retry_batch(self, batch):
+        """Retry ``batch`` (see read_store.ReadsNotCounted) on the next flush."""
+        with self.lock:
+            self._to_retry.append(batch)
+            # Bounded like the pending reads; the oldest batches give up first
+            while sum(len(b['pending']) for b in self._to_retry) > self.max_pending and len(self._to_retry) > 1:
+                self._counters["dropped"] += sum(value[0] for value in self._to_retry.pop(0)['pending'].values())
+
+    def _retry_failed(self):
+        with self.lock:
+            batches, self._to_retry = self._to_retry, []
+        summary = {}
+        for index, batch in enumerate(batches):
+            try:
+                counted = self.retry(batch)
+            except Exception:
+                logger.exception("read buffer retry failed")
+                with self.lock:
+                    self._to_retry = batches[index:] + self._to_retry
+                break
+            with self.lock:
+                self._counters["retried_batches"] += 1
+            _merge(summary, counted)
+        return summary
+
+    def _fail(self, error):
+        with self.lock:
+            self._counters["failed_flushes"] += 1
+            self._last_flush["error"] = str(error)
+        logger.exception("read buffer flush failed")
+
+    def flush(self):
+        """Write everything pending now. Returns the number of events written."""
+        with self._flush_lock:
+            summary = self._retry_failed()
+            batch, events, oldest = self._take()
+            if batch and not self._flush_batch(batch, events, oldest, summary):
+                events = 0
+        if self.on_flush and summary:
+            try:
+                self.on_flush(summary)
+            except Exception:
+                logger.exception("read buffer on_flush callback failed")
+        return events
+
+    def _flush_batch(self, batch, events, oldest, summary):
+        """Write one batch, adding what it wrote to ``summary``. False if it failed."""
+        started = time.monotonic()
+        try:
+            _merge(summary, self.apply({key: tuple(value) for key, value in batch.items()}))
+        except ReadsNotCounted as e:
+            # Possibly partly written: retried under the same batch id, never re-queued
+            self.retry_batch(e.batch)
+            self._fail(e)
+            return False
+        except Exception as e:
+            # Failed before anything was written
+            self._restore(batch, events, oldest)
+            self._fail(e)
+            return False
+
+        finished = time.monotonic()
+        lag_ms = (finished - oldest) * 1000
+        with self.lock:
+            self._counters["flushes"] += 1
+            self._counters["flushed_events"] += events
+            self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+            self._last_flush = {
+                "lag_ms": round(lag_ms, 1),
+                "duration_ms": round((finished - started) * 1000, 1),
+                "at": datetime.datetime.utcnow().isoformat(),
+                "error": None,
+            }
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self, on_flush=None, flush_on_exit=True):
+        """Start the background flusher (idempotent)."""
+        self.on_flush = on_flush
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="read-buffer-flusher", daemon=True)
+        self._thread.start()
+        if flush_on_exit:
+            atexit.register(self.flush)
+            exit_on_sigterm()
+
+    def stats(self):
+        with self.lock:
+            pending_age = (time.monotonic() - self._oldest) * 1000 if self._oldest is not None else 0
+            return dict(
+                self._counters,
+                pending_events=self._events,
+                pending_pairs=len(self._pending),
+                batches_to_retry=len(self._to_retry),
+                oldest_pending_ms=round(pending_age, 1),
+                last_flush=dict(self._last_flush),
+                max_flush_lag_ms=round(self._max_lag_ms, 1),
+                flush_interval_ms=int(self.flush_interval * 1000),
+                max_events=self.max_events,
+                dedupe_seconds=self.dedupe_seconds,
+            )
+
+
+def _merge(summary, more):
+    """Add one ``{notice_id: (reads_added, new_readers)}`` summary into another."""
+    for notice_id, (reads_added, new_readers) in more.items():
+        before = summary.get(notice_id, (0, 0))
+        summary[notice_id] = (before[0] + reads_added, before[1] + new_readers)
+
+
+def exit_on_sigterm():
+    """
+    Turn SIGTERM into a normal exit so atexit handlers (the final flush) run.
+    Left alone if something else already handles SIGTERM or we are not on the
+    main thread.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) is not signal.SIG_DFL:
+        return
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+
+def is_buffered():
+    return Config.READ_BUFFER_MODE == 'buffered'
+
+
+read_buffer = ReadEventBuffer(
+    flush_interval_ms=Config.READ_BUFFER_FLUSH_MS,
+    max_events=Config.READ_BUFFER_MAX_EVENTS,
+    dedupe_seconds=Config.READ_BUFFER_DEDUPE_SECONDS,
+    max_pending=Config.READ_BUFFER_MAX_PENDING,
+)
@@ -0,0 +1,335 @@
+"""
+Per-user read tracking backed by the ``notice_reads`` collection.
+
+Each (notice, user) pair is one small document under a unique index, so
+recording a read is a single ``find_one_and_update`` upsert with ``$inc``
+instead of loading the notice, scanning its embedded ``reads`` array and
+rewriting the whole document. Concurrent reads of the same notice no longer
+overwrite each other's counts.
+
+Engagement stats live on the Notice itself and are maintained incrementally
+from the before/after read count of each reader touched by a write:
+``read_count`` (unique readers), ``total_reads``, ``high_engagement_users``
+(readers with at least HIGH_ENGAGEMENT_READS reads) and the top reader. They
+are applied in one bulk write per batch, so analytics can read them in O(1)
+instead of walking every read row.
+
+A batch is written in two steps: the read rows, then the counters and time
+series buckets. Each batch has an id that every row, counter and bucket
+update records (``counted_read_batches``) and skips when already present,
+so the whole batch can simply be written again after any failure, even one
+that left the server having applied part of it. That is what ReadsNotCounted
+asks for: pass its batch to ``write_reads`` until it succeeds.
+"""
+import logging
+import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from ..models.notice_model import Notice
+from ..models.notice_read_model import NoticeRead
+from ..models.notice_read_bucket_model import NoticeReadBucket
+from ..models.reach_bitmap_model import ReachBitmap
+from ..models.student_model import Student
+from ..models.employee_model import Employee
+from .read_timeseries import record_buckets, counted_once
+
+logger = logging.getLogger(__name__)
+
+HIGH_ENGAGEMENT_READS = 5
+
+ENGAGEMENT_FIELDS = (
+    'read_count', 'total_reads', 'high_engagement_users', 'top_reader_id', 'top_reader_count', 'total_time_spent'
+)
+
+READ_FIELDS = {'_id': 0, 'user_id': 1, 'read_count': 1, 'first_read_at': 1, 'last_read_at': 1, 'total_time_spent': 1}
+
+
+def _collection():
+    return NoticeRead._get_collection()
+
+
+class ReadsNotCounted(Exception):
+    """
+    A batch may be partly written: some of its read rows, counters or buckets
+    are missing. Pass ``batch`` to ``write_reads`` to finish the job.
+    """
+
+    def __init__(self, batch):
+        super().__init__("read batch not fully written")
+        self.batch = batch
+
+
+def record_read(notice_id, user_id, now=None):
+    """
+    Count one more read of ``notice_id`` by ``user_id``.
+    Returns ``(read_count, is_first_read)``.
+    """
+    now = now or datetime.datetime.utcnow()
+    update = {
+        '$inc': {'read_count': 1},
+        '$set': {'last_read_at': now},
+        '$setOnInsert': {'first_read_at': now, 'total_time_spent': 0},
+    }
+    query = {'notice_id': notice_id, 'user_id': user_id}
+    try:
+        row = _collection().find_one_and_update(
+            query, update, upsert=True, projection={'read_count': 1},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Two first reads raced on the upsert; the loser is now a plain update
+        row = _collection().find_one_and_update(
+            query, update, projection={'read_count': 1}, return_document=ReturnDocument.AFTER
+        )
+
+    read_count = row['read_count']
+    _bump_engagement([(notice_id, user_id, read_count - 1, read_count, now)])
+    return read_count, read_count == 1
+
+
+def _bump_engagement(changes, batch_id=None):
+    """
+    Fold ``(notice_id, user_id, reads_before, reads_after, at)`` changes into
+    the Notice counters and the read time series buckets, at most once per
+    ``batch_id``.
+    """
+    deltas = {}
+    top = {}
+    for notice_id, user_id, before, after, _ in changes:
+        delta = deltas.setdefault(notice_id, {'read_count': 0, 'total_reads': 0, 'high_engagement_users': 0})
+        delta['total_reads'] += after - before
+        if before == 0:
+            delta['read_count'] += 1
+        if before < HIGH_ENGAGEMENT_READS <= after:
+            delta['high_engagement_users'] += 1
+        if after > top.get(notice_id, (None, 0))[1]:
+            top[notice_id] = (user_id, after)
+
+    ops = [
+        UpdateOne(*counted_once({'_id': notice_id}, {'$inc': delta}, batch_id))
+        for notice_id, delta in deltas.items()
+    ]
+    # Conditional set keeps the top reader correct under concurrent flushes (and retries)
+    ops += [
+        UpdateOne(
+            {'_id': notice_id, '$or': [{'top_reader_count': {'$lt': count}}, {'top_reader_count': {'$exists': False}}]},
+            {'$set': {'top_reader_id': user_id, 'top_reader_count': count}}
+        )
+        for notice_id, (user_id, count) in top.items()
+    ]
+    if ops:
+        Notice._get_collection().bulk_write(ops, ordered=False)
+    record_buckets(changes, batch_id)
+
+
+def _read_update(notice_id, user_id, count, first_at, last_at, batch_id):
+    return counted_once({'notice_id': notice_id, 'user_id': user_id}, {
+        '$inc': {'read_count': count},
+        '$min': {'first_read_at': first_at},
+        '$max': {'last_read_at': last_at},
+        # Marks the reader's first read, wherever the retries of this batch stand
+        '$setOnInsert': {'total_time_spent': 0, 'first_read_batch': batch_id},
+    }, batch_id)
+
+
+def _write_rows(batch):
+    """
+    Upsert the read rows of ``batch``, skipping rows that already have its id.
+    Reads that can never be written (not a duplicate key) are dropped from
+    the batch; anything else raises and the batch can be retried as is.
+    """
+    pending = batch['pending']
+    keys = list(pending)
+    updates = [_read_update(*key, *pending[key], batch['id']) for key in keys]
+    try:
+        _collection().bulk_write([UpdateOne(*update, upsert=True) for update in updates], ordered=False)
+        return
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+
+    # A duplicate key means the row exists: it either has this batch already
+    # (a retry) or was created concurrently, and only the latter matches a plain update
+    duplicates = [error['index'] for error in errors if error.get('code') == 11000]
+    failed = [keys[error['index']] for error in errors if error.get('code') != 11000]
+    if duplicates:
+        try:
+            _collection().bulk_write([UpdateOne(*updates[index]) for index in duplicates], ordered=False)
+        except BulkWriteError as e:
+            failed += [keys[duplicates[error['index']]] for error in e.details.get('writeErrors', [])]
+    for key in failed:
+        logger.error("dropping unwritable read %s", key)
+        del pending[key]
+
+
+def apply_reads(pending):
+    """
+    Write a batch of aggregated reads in one bulk upsert, then count them.
+
+    ``pending`` maps ``(notice ObjectId, user_id)`` to ``(count, first_at,
+    last_at)``. Reads of notices that no longer exist are dropped.
+    Returns ``{notice_id: (reads_added, new_readers)}`` for what was written.
+    Once anything may have been written, every failure raises ReadsNotCounted;
+    any other error means nothing was written.
+    """
+    notice_ids = list({notice_id for notice_id, _ in pending})
+    existing = {row['_id'] for row in Notice._get_collection().find({'_id': {'$in': notice_ids}}, {'_id': 1})}
+    batch = {'id': ObjectId(), 'pending': {key: value for key, value in pending.items() if key[0] in existing}}
+    if not batch['pending']:
+        return {}
+    try:
+        return write_reads(batch)
+    except Exception as e:
+        raise ReadsNotCounted(batch) from e
+
+
+def write_reads(batch):
+    """
+    Write ``batch`` (``{'id': ObjectId, 'pending': {...}}``): its read rows,
+    then the engagement counters and buckets. Every step skips documents
+    that already recorded the batch id, so calling it again after a failure
+    finishes the batch without counting a read twice. Returns the same
+    summary as ``apply_reads``.
+    """
+    _write_rows(batch)
+    pending, batch_id = batch['pending'], batch['id']
+    if not pending:
+        return {}
+
+    # Counts after the write tell us each reader's before/after for the counters
+    rows = _collection().find(
+        {'notice_id': {'$in': list({key[0] for key in pending})}, 'counted_read_batches': batch_id},
+        {'_id': 0, 'notice_id': 1, 'user_id': 1, 'read_count': 1, 'first_read_batch': 1}
+    )
+    changes = []
+    for row in rows:
+        key = (row['notice_id'], row['user_id'])
+        if key not in pending:
+            continue
+        added, count = pending[key][0], row['read_count']
+        before = 0 if row.get('first_read_batch') == batch_id else max(count - added, 1)
+        # Later batches may have moved read_count since; this batch added exactly ``added``
+        changes.append((key[0], key[1], before, before + added, pending[key][2]))
+    _bump_engagement(changes, batch_id)
+
+    summary = {}
+    for notice_id, _, before, count, _ in changes:
+        reads_added, new_readers = summary.get(notice_id, (0, 0))
+        summary[notice_id] = (reads_added + count - before, new_readers + (1 if before == 0 else 0))
+    return summary
+
+
+# ``sort`` query value -> NoticeRead field; each has a (notice_id, field, _id) index
+READER_SORTS = {'read_count': 'read_count', 'last_read': 'last_read_at'}
+DEFAULT_TOP_READERS = 5
+MAX_TOP_READERS = 50
+
+
+def reader_queryset(notice_id):
+    """Reader rows of a notice as raw dicts, ready for ordering/pagination."""
+    return NoticeRead.objects(notice_id=notice_id).only(
+        'user_id', 'read_count', 'first_read_at', 'last_read_at', 'total_time_spent'
+    ).as_pymongo()
+
+
+def parse_reader_args(args):
+    """
+    Read ``sort`` (read_count | last_read, always descending) and ``top``
+    (size of the top-readers summary). Raises ValueError on bad input.
+    """
+    sort = args.get('sort', 'read_count').lstrip('-')
+    if sort not in READER_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(READER_SORTS)}")
+    try:
+        top = int(args.get('top', DEFAULT_TOP_READERS))
+    except ValueError:
+        raise ValueError("top must be an integer")
+    if top < 0 or top > MAX_TOP_READERS:
+        raise ValueError(f"top must be between 0 and {MAX_TOP_READERS}")
+    return READER_SORTS[sort], top
+
+
+def top_readers(notice_id, k):
+    """The ``k`` most engaged readers, straight off the (notice_id, -read_count) index."""
+    if k <= 0:
+        return []
+    return list(reader_queryset(notice_id).order_by('-read_count', '-id').limit(k))
+
+
+def user_read(notice_id, user_id):
+    """The user's read row for a notice, or None if they never opened it."""
+    return _collection().find_one({'notice_id': notice_id, 'user_id': user_id}, READ_FIELDS)
+
+
+def my_read_counts(user_id, notice_ids):
+    """
+    ``{notice_id: read_count}`` for the notices in ``notice_ids`` (strings)
+    the user has opened, in one query covered by the (user_id, notice_id,
+    read_count) index.
+    """
+    if not notice_ids:
+        return {}
+    rows = _collection().find(
+        {'user_id': str(user_id), 'notice_id': {'$in': [ObjectId(n) for n in notice_ids]}},
+        {'_id': 0, 'notice_id': 1, 'read_count': 1}
+    )
+    return {str(row['notice_id']): row.get('read_count', 1) for row in rows}
+
+
+def wants_read_state(args):
+    """True when a list request asked for ``include_read_state``."""
+    return args.get('include_read_state', 'false').lower() in ('1', 'true', 'yes')
+
+
+def overlay_read_state(items, user_id):
+    """Copy list items (dicts with ``id``) and attach the caller's ``is_read`` / ``my_read_count``."""
+    counts = my_read_counts(user_id, [item['id'] for item in items])
+    return [
+        dict(item, is_read=item['id'] in counts, my_read_count=counts.get(item['id'], 0))
+        for item in items
+    ]
+
+
+def forget_reads(notice_id):
+    """Drop the read rows, time series and reader bitmap of a deleted notice."""
+    _collection().delete_many({'notice_id': notice_id})
+    NoticeReadBucket._get_collection().delete_many({'notice_id': notice_id})
+    ReachBitmap._get_collection().delete_one({'kind': 'readers', 'key': str(notice_id)})
+
+
+def reader_name(user_id):
+    """Display name of a reader (student or employee), or None."""
+    if not ObjectId.is_valid(user_id):
+        return None
+    for model in (Student, Employee):
+        row = model.objects(id=user_id).only('name').as_pymongo().first()
+        if row:
+            return row.get('name')
+    return None
+
+
+def engagement_stats(raw, top_reader_name=None):
+    """
+    Engagement summary from the counters on a raw Notice row (projected with
+    ENGAGEMENT_FIELDS). Pass ``top_reader_name`` when the caller already
+    knows it; otherwise it is looked up.
+    """
+    unique_readers = raw.get('read_count') or 0
+    total_reads = raw.get('total_reads') or 0
+    top_reader_id = raw.get('top_reader_id')
+    most_active = None
+    if top_reader_id:
+        most_active = {
+            "id": top_reader_id,
+            "name": top_reader_name or reader_name(top_reader_id),
+            "read_count": raw.get('top_reader_count') or 0,
+        }
+    return {
+        "total_reads": total_reads,  # Sum of all read counts (total interactions)
+        "unique_readers": unique_readers,  # Number of unique users who read
+        "average_reads_per_user": round(total_reads / unique_readers, 1) if unique_readers else 0,
+        "most_active_reader": most_active,
+        "high_engagement_users": raw.get('high_engagement_users') or 0,
+        "total_time_spent": raw.get('total_time_spent') or 0,  # Seconds
+        "average_time_spent_per_reader": round((raw.get('total_time_spent') or 0) / unique_readers, 1) if unique_readers else 0,
+    }
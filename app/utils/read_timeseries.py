@@ -0,0 +1,122 @@
+"""
+Hourly and daily read buckets per notice.
+
+Every batch of reads written by read_store also ``$inc``s one bucket
+document per (notice, granularity, period), so the time series endpoint reads
+at most a few hundred tiny documents instead of scanning raw reads. Buckets
+count all reads and first reads (``new_readers``); reach milestones are
+derived from the cumulative ``new_readers`` of the hourly buckets.
+"""
+import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from ..models.notice_read_bucket_model import NoticeReadBucket
+
+GRANULARITIES = ('hour', 'day')
+REACH_MILESTONES = (50, 90)
+
+# Batch ids remembered per notice / bucket; a retry comes long before this many newer batches
+COUNTED_BATCHES_KEPT = 20
+
+
+def counted_once(query, update, batch_id, field='counted_read_batches'):
+    """
+    Guard an ``$inc`` update so it applies once per batch: ``query`` skips
+    documents that already recorded ``batch_id`` in ``field`` and ``update``
+    records it. Without a batch id both are returned unchanged.
+    """
+    if batch_id is None:
+        return query, update
+    query = dict(query, **{field: {'$ne': batch_id}})
+    update = dict(update, **{'$push': {field: {'$each': [batch_id], '$slice': -COUNTED_BATCHES_KEPT}}})
+    return query, update
+
+
+def truncate(at, granularity):
+    """Start of the hour / day containing ``at``."""
+    if granularity == 'day':
+        return at.replace(hour=0, minute=0, second=0, microsecond=0)
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def record_buckets(changes, batch_id=None):
+    """
+    Fold ``(notice_id, user_id, reads_before, reads_after, at)`` changes
+    into the hourly and daily buckets with one bulk write, at most once per
+    ``batch_id``.
+    """
+    totals = {}
+    for notice_id, _, before, after, at in changes:
+        for granularity in GRANULARITIES:
+            key = (notice_id, granularity, truncate(at, granularity))
+            reads, new_readers = totals.get(key, (0, 0))
+            totals[key] = (reads + after - before, new_readers + (1 if before == 0 else 0))
+    if not totals:
+        return
+    now = datetime.datetime.utcnow()
+    updates = [
+        counted_once(
+            {'notice_id': notice_id, 'granularity': granularity, 'bucket_start': start},
+            {'$inc': {'reads': reads, 'new_readers': new_readers}, '$set': {'updated_at': now}},
+            batch_id
+        )
+        for (notice_id, granularity, start), (reads, new_readers) in totals.items()
+    ]
+    buckets = NoticeReadBucket._get_collection()
+    try:
+        buckets.bulk_write([UpdateOne(query, update, upsert=True) for query, update in updates], ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+        if any(error.get('code') != 11000 for error in errors):
+            raise
+        # The bucket exists: it either counted this batch already (a retry) or
+        # was created concurrently; a plain update only applies in the latter case
+        buckets.bulk_write([UpdateOne(*updates[error['index']]) for error in errors], ordered=False)
+
+
+def parse_timeseries_args(args):
+    """Read ``granularity`` (hour | day). Raises ValueError on bad input."""
+    granularity = args.get('granularity', 'hour')
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    return granularity
+
+
+def read_buckets(notice_id, granularity):
+    """Buckets of a notice in time order as raw dicts."""
+    return list(NoticeReadBucket._get_collection().find(
+        {'notice_id': notice_id, 'granularity': granularity},
+        {'_id': 0, 'bucket_start': 1, 'reads': 1, 'new_readers': 1}
+    ).sort('bucket_start', 1))
+
+
+def time_to_reach(hourly_buckets, published_at, target_readers):
+    """
+    Hours from ``published_at`` until ``target_readers`` unique readers had
+    opened the notice, interpolated linearly inside the hour that crossed the
+    target. None if the target has not been reached.
+    """
+    if target_readers <= 0:
+        return None
+    seen = 0
+    for bucket in hourly_buckets:
+        new_readers = bucket.get('new_readers', 0)
+        if new_readers and seen + new_readers >= target_readers:
+            fraction = (target_readers - seen) / new_readers
+            reached = bucket['bucket_start'] + datetime.timedelta(hours=fraction)
+            return round(max((reached - published_at).total_seconds(), 0) / 3600, 2)
+        seen += new_readers
+    return None
+
+
+def reach_milestones(hourly_buckets, published_at, audience):
+    """
+    ``{"time_to_50_percent_hours": ..., "time_to_90_percent_hours": ...}``:
+    hours until that share of ``audience`` (the notice's targeted audience
+    size, a fixed target) had read it. Readers come from the buckets, so
+    staff and students outside the audience count towards it too.
+    """
+    return {
+        f"time_to_{pct}_percent_hours": time_to_reach(hourly_buckets, published_at, audience * pct / 100.0)
+        for pct in REACH_MILESTONES
+    }
@@ -0,0 +1,29 @@
+import html
+import re
+
+EXCERPT_LENGTH = 200
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_BLOCK_TAG_RE = re.compile(r'</?(p|div|br|li|h[1-6]|tr)\b[^>]*>', re.IGNORECASE)
+_SCRIPT_RE = re.compile(r'<(script|style)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+_SPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(content):
+    """Flatten the rich-text editor HTML stored on a notice into plain text."""
+    if not content:
+        return ""
+    text = _SCRIPT_RE.sub(' ', content)
+    text = _BLOCK_TAG_RE.sub(' ', text)
+    text = _TAG_RE.sub('', text)
+    text = html.unescape(text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    """Plain-text preview of ``content`` cut on a word boundary."""
+    text = html_to_text(content)
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0] or text[:length]
+    return cut.rstrip(' ,.;:') + '…'
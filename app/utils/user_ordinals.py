@@ -0,0 +1,78 @@
+"""
+Dense integer ordinals for students and employees.
+
+Bitmaps (see bitset.py) need every user mapped to a small integer. Students
+and employees share one sequence in the ``counters`` collection, so an
+ordinal identifies a user regardless of type. Ordinals are handed out lazily
+to users that do not have one yet, a whole block per call with a single
+``$inc``; if two workers race, the loser's block simply leaves a gap.
+Ordinals never change once assigned, so lookups are cached for the life of
+the process.
+"""
+import threading
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from ..models.counter_model import Counter
+from ..models.student_model import Student
+from ..models.employee_model import Employee
+
+SEQUENCE = 'user_ordinal'
+USER_MODELS = (Student, Employee)
+
+_cache_lock = threading.Lock()
+_ordinals = {}  # user id string -> ordinal
+
+
+def _reserve(count):
+    """Reserve ``count`` consecutive ordinals. Returns the first one."""
+    row = Counter._get_collection().find_one_and_update(
+        {'_id': SEQUENCE}, {'$inc': {'seq': count}}, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    return row['seq'] - count
+
+
+def assign_missing_ordinals():
+    """Give every student and employee without an ordinal the next free one. Returns how many were assigned."""
+    assigned = 0
+    for model in USER_MODELS:
+        collection = model._get_collection()
+        ids = [row['_id'] for row in collection.find({'ordinal': None}, {'_id': 1})]
+        if not ids:
+            continue
+        first = _reserve(len(ids))
+        result = collection.bulk_write([
+            # Guarded, so a concurrent assignment is never overwritten
+            UpdateOne({'_id': user_id, 'ordinal': None}, {'$set': {'ordinal': first + offset}})
+            for offset, user_id in enumerate(ids)
+        ], ordered=False)
+        assigned += result.modified_count
+    return assigned
+
+
+def ordinals_for(user_ids):
+    """Map user id strings to ordinals, assigning missing ones. Unknown ids are left out."""
+    with _cache_lock:
+        found = {user_id: _ordinals[user_id] for user_id in user_ids if user_id in _ordinals}
+    missing = [user_id for user_id in user_ids if user_id not in found and ObjectId.is_valid(user_id)]
+
+    for attempt in range(2):
+        if not missing:
+            break
+        object_ids = [ObjectId(user_id) for user_id in missing]
+        unassigned = False
+        for model in USER_MODELS:
+            for row in model._get_collection().find({'_id': {'$in': object_ids}}, {'ordinal': 1}):
+                if row.get('ordinal') is None:
+                    unassigned = True
+                else:
+                    found[str(row['_id'])] = row['ordinal']
+        missing = [user_id for user_id in missing if user_id not in found]
+        if not unassigned:
+            break
+        # Users created since the last assignment run; number them and look again
+        assign_missing_ordinals()
+
+    with _cache_lock:
+        _ordinals.update(found)
+    return found
+
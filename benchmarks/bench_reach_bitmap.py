@@ -0,0 +1,90 @@
+"""
+CPU cost and payload size of reach queries over a 20k-student audience:
+sets of ObjectId strings (what a client or service diffing id lists does)
+vs bitmaps of user ordinals (utils/bitset.py). Needs no database.
+
+Each round answers what a reach report needs: reach count, per-cohort
+reader counts, the first page of non-readers and the overlap with a second
+notice's readers, starting from the stored form (JSON id lists vs
+compressed bitmaps).
+
+    python -m benchmarks.bench_reach_bitmap
+"""
+import json
+import random
+import time
+from bson import ObjectId
+from app.utils import bitset
+from app.utils.bitset import Bitset
+
+AUDIENCE = 20_000
+COHORTS = 40
+READ_SHARE = 0.6
+PAGE_SIZE = 20
+ROUNDS = 20
+
+
+def make_data():
+    random.seed(7)
+    users = [str(ObjectId()) for _ in range(AUDIENCE + 2_000)]  # a few staff/outsiders read too
+    ordinal = {user: index for index, user in enumerate(users)}
+    cohorts = [users[i::COHORTS] for i in range(COHORTS)]
+    cohorts = [[user for user in cohort if ordinal[user] < AUDIENCE] for cohort in cohorts]
+    readers_a = random.sample(users, int(len(users) * READ_SHARE))
+    readers_b = random.sample(users, int(len(users) * READ_SHARE / 2))
+
+    lists = {
+        'cohorts': [json.dumps(cohort) for cohort in cohorts],
+        'a': json.dumps(readers_a),
+        'b': json.dumps(readers_b),
+    }
+    bitmaps = {
+        'cohorts': [Bitset.from_ordinals(ordinal[user] for user in cohort).to_bytes() for cohort in cohorts],
+        'a': Bitset.from_ordinals(ordinal[user] for user in readers_a).to_bytes(),
+        'b': Bitset.from_ordinals(ordinal[user] for user in readers_b).to_bytes(),
+    }
+    return lists, bitmaps
+
+
+def with_lists(stored):
+    cohorts = [set(json.loads(cohort)) for cohort in stored['cohorts']]
+    a, b = set(json.loads(stored['a'])), set(json.loads(stored['b']))
+    per_cohort = [len(cohort & a) for cohort in cohorts]
+    audience = set().union(*cohorts)
+    non_readers = sorted(audience - a)[:PAGE_SIZE]
+    return sum(per_cohort), non_readers, len(a & b)
+
+
+def with_bitmaps(stored):
+    cohorts = [Bitset.from_bytes(cohort) for cohort in stored['cohorts']]
+    a, b = Bitset.from_bytes(stored['a']), Bitset.from_bytes(stored['b'])
+    per_cohort = [len(cohort & a) for cohort in cohorts]
+    non_readers = (Bitset.union(cohorts) - a).ordinals(limit=PAGE_SIZE)
+    return sum(per_cohort), non_readers, len(a & b)
+
+
+def size(stored):
+    return sum(len(cohort) for cohort in stored['cohorts']) + len(stored['a']) + len(stored['b'])
+
+
+def bench(label, fn, stored):
+    fn(stored)
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        fn(stored)
+    per_run = (time.process_time() - start) / ROUNDS * 1000
+    print(f"{label:<28} {per_run:8.2f} ms CPU / report   {size(stored) / 1024:8.1f} KB stored")
+    return per_run
+
+
+def main():
+    lists, bitmaps = make_data()
+    backend = "numpy" if bitset.np is not None else "int"
+    before = bench("ObjectId string sets", with_lists, lists)
+    after = bench(f"ordinal bitmaps ({backend})", with_bitmaps, bitmaps)
+    assert with_lists(lists)[0] == with_bitmaps(bitmaps)[0]
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Latency of /api/notices/search on a synthetic 100k-notice corpus.
+
+Seeds a scratch database (``smart-notice-bench`` unless BENCH_DB is set) on
+the server in MONGO_URI, builds the Notice indexes, then times ranked
+first pages and follow-up pages for a mix of queries. Target: p95 < 100 ms.
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.bench_search
+"""
+import datetime
+import os
+import random
+import statistics
+import time
+from mongoengine import connect
+from app.models.notice_model import Notice
+from app.utils.notice_feed import audience_query
+from app.utils.notice_search import ranked_search
+from app.utils.text_utils import html_to_text, make_excerpt
+
+CORPUS_SIZE = int(os.environ.get('BENCH_NOTICES', 100_000))
+RUNS = 50
+PAGE_SIZE = 20
+
+WORDS = (
+    "exam schedule semester hostel fee library placement drive workshop seminar "
+    "holiday sports result revaluation scholarship internship lab assignment "
+    "deadline registration orientation convocation timetable canteen transport "
+    "attendance project viva submission circular meeting"
+).split()
+QUERIES = ["exam", "placement drive", "fee deadline", "hostel transport", "scholarship result", "convocation"]
+DEPARTMENTS = ["CSE", "ECE", "ME", "CE", "EE"]
+
+
+def seed(collection):
+    rng = random.Random(7)
+    now = datetime.datetime.utcnow()
+    batch = []
+    for i in range(CORPUS_SIZE):
+        content = "<p>" + " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 120))) + "</p>"
+        created = now - datetime.timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        batch.append({
+            'title': " ".join(rng.choice(WORDS) for _ in range(5)),
+            'subject': " ".join(rng.choice(WORDS) for _ in range(3)),
+            'content': content,
+            'content_text': html_to_text(content),
+            'excerpt': make_excerpt(content),
+            'departments': rng.sample(DEPARTMENTS, rng.randint(0, 2)),
+            'program_course': rng.choice(["B.Tech", "M.Tech", ""]),
+            'year': rng.choice(["1", "2", "3", "4", ""]),
+            'section': rng.choice(["A", "B", ""]),
+            'priority': rng.choice(["Normal"] * 6 + ["Urgent"] * 3 + ["Highly Urgent"]),
+            'status': rng.choice(["published"] * 8 + ["draft", "pending_approval"]),
+            'created_by': "bench",
+            'created_at': created,
+            'updated_at': created,
+        })
+        if len(batch) == 5000:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<24} p50 {statistics.median(samples):7.1f} ms   p95 {p95:7.1f} ms")
+
+
+def main():
+    connect(db=os.environ.get('BENCH_DB', 'smart-notice-bench'), host=os.environ['MONGO_URI'])
+    collection = Notice._get_collection()
+    if collection.estimated_document_count() < CORPUS_SIZE:
+        print(f"Seeding {CORPUS_SIZE} notices...")
+        collection.drop()
+        seed(collection)
+    Notice.ensure_indexes()
+
+    student = audience_query("CSE", "B.Tech", "3", "A")
+    first, second, audience = [], [], []
+    for i in range(RUNS):
+        q = QUERIES[i % len(QUERIES)]
+        state = {}
+        first.append(timed(lambda: state.update(page=ranked_search(collection, q, {}, PAGE_SIZE))))
+        cursor = state['page'][1]
+        if cursor:
+            second.append(timed(lambda: ranked_search(collection, q, {}, PAGE_SIZE, cursor)))
+        audience.append(timed(lambda: ranked_search(collection, q, student, PAGE_SIZE)))
+
+    print(f"{CORPUS_SIZE} notices, {RUNS} runs, page size {PAGE_SIZE}")
+    report("first page", first)
+    report("next page", second)
+    report("student audience", audience)
+
+
+if __name__ == '__main__':
+    main()
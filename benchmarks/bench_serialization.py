@@ -0,0 +1,97 @@
+"""
+CPU cost of serializing 1k notices: MongoEngine hydration + per-field
+isoformat + jsonify-style encoding vs raw rows + compiled spec + fast encoder.
+Needs no database.
+
+    python -m benchmarks.bench_serialization
+"""
+import datetime
+import json
+import time
+from bson import ObjectId
+from app.models.notice_model import Notice
+from app.utils.notice_summary import _summary_row
+from app.utils.serializers import dumps
+
+ROWS = 1000
+ROUNDS = 20
+
+
+def make_rows():
+    now = datetime.datetime(2024, 1, 1)
+    rows = []
+    for i in range(ROWS):
+        rows.append({
+            '_id': ObjectId(),
+            'title': f"Notice {i}",
+            'subject': "Exam schedule",
+            'excerpt': "Mid-semester examinations begin next week " * 3,
+            'notice_type': "Exam",
+            'departments': ["CSE", "ECE"],
+            'program_course': "B.Tech",
+            'year': "3",
+            'section': "A",
+            'priority': "High",
+            'status': "published",
+            'from_field': "Examination Cell",
+            'created_at': now + datetime.timedelta(minutes=i),
+            'updated_at': now + datetime.timedelta(minutes=i),
+            'read_count': i,
+            'requires_approval': False,
+            'approval_status': "approved",
+            'created_by': str(ObjectId()),
+            'attachments': [],
+        })
+    return rows
+
+
+def hydrated(rows):
+    items = []
+    for raw in rows:
+        notice = Notice._from_son(raw)
+        items.append({
+            "id": str(notice.id),
+            "title": notice.title,
+            "subject": notice.subject,
+            "excerpt": notice.excerpt,
+            "notice_type": notice.notice_type,
+            "departments": notice.departments,
+            "program_course": notice.program_course,
+            "year": notice.year,
+            "section": notice.section,
+            "priority": notice.priority,
+            "status": notice.status,
+            "from_field": notice.from_field,
+            "created_at": notice.created_at.isoformat() if notice.created_at else None,
+            "updated_at": notice.updated_at.isoformat() if notice.updated_at else None,
+            "read_count": notice.read_count,
+            "requires_approval": notice.requires_approval,
+            "approval_status": notice.approval_status,
+            "attachments": notice.attachments,
+        })
+    return json.dumps(items).encode()
+
+
+def fast(rows):
+    return dumps([_summary_row(raw) for raw in rows])
+
+
+def bench(label, fn, rows):
+    fn(rows)
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        fn(rows)
+    per_1k = (time.process_time() - start) / ROUNDS * 1000 * (1000 / ROWS)
+    print(f"{label:<28} {per_1k:8.2f} ms CPU / 1k notices")
+    return per_1k
+
+
+def main():
+    rows = make_rows()
+    before = bench("hydrate + isoformat + json", hydrated, rows)
+    after = bench("as_pymongo + spec + encoder", fast, rows)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
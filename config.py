@@ -5,4 +5,56 @@ load_dotenv()
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9eyJzdWIiOiIxMjM0NTY3ODkwIiwibmFtZSI6k')
-    MONGO_URI = os.environ.get('MONGO_URI')
\ No newline at end of file
+    MONGO_URI = os.environ.get('MONGO_URI')
+
+    # Shared cohort feed cache (see app/utils/notice_feed.py)
+    FEED_CACHE_TTL = int(os.environ.get('FEED_CACHE_TTL', 60))
+    FEED_CACHE_SIZE = int(os.environ.get('FEED_CACHE_SIZE', 2048))
+
+    # created_by -> name lookups (see app/utils/creator_directory.py)
+    CREATOR_CACHE_TTL = int(os.environ.get('CREATOR_CACHE_TTL', 300))
+    CREATOR_CACHE_SIZE = int(os.environ.get('CREATOR_CACHE_SIZE', 4096))
+
+    # Delta sync (see app/utils/notice_sync.py): how long deletions are remembered
+    NOTICE_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('NOTICE_TOMBSTONE_RETENTION_DAYS', 30))
+
+    # Write-behind buffer for POST /api/notices/<id>/read (see app/utils/read_buffer.py).
+    # "sync" (default) writes every read inside the request and answers with the
+    # reader's counts; "buffered" is opt-in: it acknowledges reads with
+    # 202 {"queued": ...} and writes them in batches, and clients then get one
+    # coalesced notice_reads_flushed socket event per notice instead of
+    # per-read notice_read_update events.
+    READ_BUFFER_MODE = os.environ.get('READ_BUFFER_MODE', 'sync')
+    READ_BUFFER_FLUSH_MS = int(os.environ.get('READ_BUFFER_FLUSH_MS', 500))
+    READ_BUFFER_MAX_EVENTS = int(os.environ.get('READ_BUFFER_MAX_EVENTS', 500))
+    # Repeat clicks by the same user on the same notice within this window are dropped
+    READ_BUFFER_DEDUPE_SECONDS = int(os.environ.get('READ_BUFFER_DEDUPE_SECONDS', 10))
+    # Flush pending reads on clean interpreter exit. Reads still buffered when
+    # the process is killed are lost (at most one flush interval's worth).
+    READ_BUFFER_FLUSH_ON_EXIT = os.environ.get('READ_BUFFER_FLUSH_ON_EXIT', 'true').lower() == 'true'
+    # Cap on pending (notice, user) pairs kept for retry while Mongo is failing
+    READ_BUFFER_MAX_PENDING = int(os.environ.get('READ_BUFFER_MAX_PENDING', 50000))
+
+    # Dwell time from "notice is open" heartbeats (see app/utils/dwell_tracker.py)
+    DWELL_HEARTBEAT_SECONDS = int(os.environ.get('DWELL_HEARTBEAT_SECONDS', 15))
+    # A longer silence ends the viewing session; the gap itself is not counted
+    DWELL_MAX_GAP_SECONDS = int(os.environ.get('DWELL_MAX_GAP_SECONDS', 45))
+    DWELL_FLUSH_SECONDS = int(os.environ.get('DWELL_FLUSH_SECONDS', 10))
+
+    # Debounced analytics broadcasts to the socket "analytics" room (see app/utils/analytics_publisher.py)
+    ANALYTICS_PUBLISH_INTERVAL_SECONDS = float(os.environ.get('ANALYTICS_PUBLISH_INTERVAL_SECONDS', 5))
+
+    # Materialized daily analytics (see app/utils/analytics_rollup.py): how often changed days are rolled up
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS = int(os.environ.get('ANALYTICS_ROLLUP_INTERVAL_SECONDS', 300))
+
+    # Reach reports (see app/utils/notice_reach.py): "bitmap" answers from per-cohort and
+    # per-notice reader bitmaps (app/utils/reach_bitmaps.py), "aggregate" joins in MongoDB
+    REACH_ENGINE = os.environ.get('REACH_ENGINE', 'bitmap')
+    # Cohort bitmaps are rebuilt after this long, or as soon as students change in this process
+    REACH_COHORT_TTL_SECONDS = int(os.environ.get('REACH_COHORT_TTL_SECONDS', 600))
+
+    # Shared cache for the analytics endpoints (see app/utils/analytics_cache.py)
+    ANALYTICS_CACHE_TTL_SECONDS = int(os.environ.get('ANALYTICS_CACHE_TTL_SECONDS', 30))
+    ANALYTICS_CACHE_SIZE = int(os.environ.get('ANALYTICS_CACHE_SIZE', 512))
+    # Results computed while reads were landing are kept this long instead
+    ANALYTICS_CACHE_BUSY_TTL_SECONDS = int(os.environ.get('ANALYTICS_CACHE_BUSY_TTL_SECONDS', 2))
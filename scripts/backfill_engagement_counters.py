@@ -0,0 +1,52 @@
+"""
+One-off (re)computation of the Notice engagement counters (read_count,
+total_reads, high_engagement_users, top reader, time spent) from notice_reads. Run after
+scripts.migrate_notice_reads, or any time the counters are suspected to have
+drifted.
+
+    python -m scripts.backfill_engagement_counters
+"""
+import os
+from dotenv import load_dotenv
+from mongoengine import connect
+from pymongo import UpdateOne
+from app.models.notice_model import Notice
+from app.models.notice_read_model import NoticeRead
+from app.utils.read_store import HIGH_ENGAGEMENT_READS
+
+BATCH_SIZE = 500
+
+
+def main():
+    load_dotenv()
+    connect(db="smart-notice", host=os.environ.get('MONGO_URI'))
+
+    rows = NoticeRead._get_collection().aggregate([
+        {'$sort': {'notice_id': 1, 'read_count': -1}},
+        {'$group': {
+            '_id': '$notice_id',
+            'read_count': {'$sum': 1},
+            'total_reads': {'$sum': '$read_count'},
+            'high_engagement_users': {'$sum': {'$cond': [{'$gte': ['$read_count', HIGH_ENGAGEMENT_READS]}, 1, 0]}},
+            'top_reader_id': {'$first': '$user_id'},
+            'top_reader_count': {'$first': '$read_count'},
+            'total_time_spent': {'$sum': '$total_time_spent'},
+        }},
+    ], allowDiskUse=True)
+
+    notices = Notice._get_collection()
+    ops, updated = [], 0
+    for row in rows:
+        notice_id = row.pop('_id')
+        ops.append(UpdateOne({'_id': notice_id}, {'$set': row}))
+        if len(ops) >= BATCH_SIZE:
+            updated += notices.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += notices.bulk_write(ops, ordered=False).modified_count
+
+    print(f"✅ Recomputed engagement counters for {updated} notices")
+
+
+if __name__ == "__main__":
+    main()
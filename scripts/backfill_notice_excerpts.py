@@ -0,0 +1,36 @@
+"""
+One-off backfill of Notice.excerpt for notices saved before the field existed.
+
+    python -m scripts.backfill_notice_excerpts
+"""
+import os
+from dotenv import load_dotenv
+from mongoengine import connect
+from pymongo import UpdateOne
+from app.models.notice_model import Notice
+from app.utils.text_utils import make_excerpt
+
+BATCH_SIZE = 500
+
+
+def main():
+    load_dotenv()
+    connect(db="smart-notice", host=os.environ.get('MONGO_URI'))
+
+    collection = Notice._get_collection()
+    pending = collection.find({'excerpt': {'$exists': False}}, {'content': 1})
+
+    ops, updated = [], 0
+    for raw in pending:
+        ops.append(UpdateOne({'_id': raw['_id']}, {'$set': {'excerpt': make_excerpt(raw.get('content'))}}))
+        if len(ops) >= BATCH_SIZE:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += collection.bulk_write(ops, ordered=False).modified_count
+
+    print(f"✅ Backfilled excerpts for {updated} notices")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+One-off backfill of Notice.content_text (the plain-text copy of content that
+the full-text search index covers) for notices saved before the field existed.
+
+    python -m scripts.backfill_notice_search_text
+"""
+import os
+from dotenv import load_dotenv
+from mongoengine import connect
+from pymongo import UpdateOne
+from app.models.notice_model import Notice
+from app.utils.text_utils import html_to_text
+
+BATCH_SIZE = 500
+
+
+def main():
+    load_dotenv()
+    connect(db="smart-notice", host=os.environ.get('MONGO_URI'))
+
+    collection = Notice._get_collection()
+    pending = collection.find({'content_text': {'$exists': False}}, {'content': 1})
+
+    ops, updated = [], 0
+    for raw in pending:
+        ops.append(UpdateOne({'_id': raw['_id']}, {'$set': {'content_text': html_to_text(raw.get('content'))}}))
+        if len(ops) >= BATCH_SIZE:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += collection.bulk_write(ops, ordered=False).modified_count
+
+    # Builds the text index if the app has not started since the upgrade
+    Notice.ensure_indexes()
+    print(f"✅ Backfilled search text for {updated} notices")
+
+
+if __name__ == "__main__":
+    main()
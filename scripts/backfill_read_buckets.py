@@ -0,0 +1,44 @@
+"""
+One-off seeding of notice_read_buckets from existing notice_reads rows.
+
+Only first reads have a timestamp per reader (first_read_at), so historical
+buckets get exact ``new_readers`` and count those first reads as ``reads``;
+repeat reads before this ran are not spread over time. Run once, before new
+reads start filling the buckets, or drop the collection first when re-running.
+
+    python -m scripts.backfill_read_buckets
+"""
+import os
+from dotenv import load_dotenv
+from mongoengine import connect
+from app.models.notice_read_model import NoticeRead
+from app.models.notice_read_bucket_model import NoticeReadBucket
+from app.utils.read_timeseries import record_buckets
+
+BATCH_SIZE = 5000
+
+
+def main():
+    load_dotenv()
+    connect(db="smart-notice", host=os.environ.get('MONGO_URI'))
+    NoticeReadBucket.ensure_indexes()
+
+    rows = NoticeRead._get_collection().find(
+        {'first_read_at': {'$ne': None}}, {'notice_id': 1, 'user_id': 1, 'first_read_at': 1}
+    )
+    changes, seeded = [], 0
+    for row in rows:
+        changes.append((row['notice_id'], row['user_id'], 0, 1, row['first_read_at']))
+        if len(changes) >= BATCH_SIZE:
+            record_buckets(changes)
+            seeded += len(changes)
+            changes = []
+    if changes:
+        record_buckets(changes)
+        seeded += len(changes)
+
+    print(f"✅ Seeded read buckets from {seeded} readers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+One-off move of the embedded Notice.reads arrays into the notice_reads
+collection (see app/utils/read_store.py).
+
+Safe to run while the app is live: embedded counts and time are added to
+whatever the new store has already recorded for the reader, and the row is
+marked ``migrated_from_embedded`` so a re-run skips it instead of adding
+them again. Afterwards Notice.read_count is recounted from the notice_reads
+rows. Pass
+--drop-embedded once the new code is deployed to strip the old arrays, then
+run scripts.backfill_engagement_counters to seed the other counters.
+
+    python -m scripts.migrate_notice_reads [--drop-embedded]
+"""
+import os
+import sys
+from dotenv import load_dotenv
+from mongoengine import connect
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.models.notice_model import Notice
+from app.models.notice_read_model import NoticeRead
+
+BATCH_SIZE = 1000
+
+
+def _read_op(notice_id, read):
+    first = read.get('first_read_at') or read.get('timestamp')
+    last = read.get('last_read_at') or read.get('timestamp') or first
+    fields = {
+        # Reads already recorded through the new store are kept and added to
+        '$inc': {'read_count': read.get('read_count', 1), 'total_time_spent': read.get('total_time_spent', 0)},
+        '$set': {'migrated_from_embedded': True},
+    }
+    if last:
+        fields['$max'] = {'last_read_at': last}
+    if first:
+        fields['$min'] = {'first_read_at': first}
+    query = {'notice_id': notice_id, 'user_id': read['user_id'], 'migrated_from_embedded': {'$ne': True}}
+    return UpdateOne(query, fields, upsert=True)
+
+
+def _write(reads, ops):
+    """Bulk write ``ops``; rows migrated by an earlier run fail the upsert on the unique index and are skipped."""
+    try:
+        reads.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+            raise
+
+
+def main():
+    load_dotenv()
+    connect(db="smart-notice", host=os.environ.get('MONGO_URI'))
+    NoticeRead.ensure_indexes()  # the unique index must exist before upserting
+
+    notices = Notice._get_collection()
+    reads = NoticeRead._get_collection()
+
+    ops, migrated, touched = [], 0, []
+    for raw in notices.find({'reads.0': {'$exists': True}}, {'reads': 1}):
+        touched.append(raw['_id'])
+        for read in raw['reads']:
+            if not read.get('user_id'):
+                continue
+            ops.append(_read_op(raw['_id'], read))
+            if len(ops) >= BATCH_SIZE:
+                _write(reads, ops)
+                migrated += len(ops)
+                ops = []
+    if ops:
+        _write(reads, ops)
+        migrated += len(ops)
+
+    # read_count counts unique readers; recount it from the migrated rows
+    counts = reads.aggregate([
+        {'$match': {'notice_id': {'$in': touched}}},
+        {'$group': {'_id': '$notice_id', 'readers': {'$sum': 1}}},
+    ])
+    recount = [UpdateOne({'_id': row['_id']}, {'$set': {'read_count': row['readers']}}) for row in counts]
+    if recount:
+        notices.bulk_write(recount, ordered=False)
+
+    if '--drop-embedded' in sys.argv[1:]:
+        notices.update_many({'reads': {'$exists': True}}, {'$unset': {'reads': ''}})
+
+    print(f"✅ Migrated {migrated} read records from {len(touched)} notices")
+
+
+if __name__ == "__main__":
+    main()
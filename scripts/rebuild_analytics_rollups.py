@@ -0,0 +1,32 @@
+"""
+Rebuild every daily analytics rollup from the raw collections, ignoring the
+watermark. The background job does this by itself on its very first run;
+use this after changing the rollup logic or to correct days whose notices
+had their publish date moved.
+
+    python -m scripts.rebuild_analytics_rollups
+"""
+import os
+from dotenv import load_dotenv
+from mongoengine import connect
+from app.models.analytics_rollup_model import DailyAnalytics, AnalyticsRollupState
+from app.utils.analytics_rollup import analytics_rollup
+
+
+def main():
+    load_dotenv()
+    connect(db="smart-notice", host=os.environ.get('MONGO_URI'))
+    DailyAnalytics.ensure_indexes()
+    AnalyticsRollupState.ensure_indexes()
+
+    days = analytics_rollup.run_once(full=True)
+    error = analytics_rollup.stats()['last_run']['error']
+    if error:
+        print(f"❌ Rollup failed: {error}")
+        return
+
+    print(f"✅ Rebuilt {days} daily analytics rollups")
+
+
+if __name__ == "__main__":
+    main()
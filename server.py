@@ -46,7 +46,7 @@ def create_app():
 
     # Register blueprints
     from app.controllers.auth_controllers import auth_bp
-    from app.controllers.notices_controller import notice_bp
+    from app.controllers.notices_controller import notice_bp, start_read_buffer, start_dwell_tracker, start_analytics_publisher, start_analytics_rollup
     from app.controllers.department_controllers import department_bp
     from app.controllers.user_controllers import user_bp
     from app.controllers.university_controllers import university_bp
@@ -62,6 +62,10 @@ def create_app():
         start_holiday_checker()
     except Exception as e:
         print(f"Warning: Holiday checker failed to start: {e}")
+    start_read_buffer(app)
+    start_dwell_tracker()
+    start_analytics_publisher(app)
+    start_analytics_rollup()
 
     app.register_blueprint(holiday_api)
     app.register_blueprint(auth_bp)
@@ -0,0 +1,61 @@
+"""
+Tests run against an in-memory mongomock database, so they need neither a
+MongoDB server nor network access.
+"""
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+from mongoengine import connect, disconnect  # noqa: E402
+from mongoengine.base.common import _document_registry  # noqa: E402
+from mongomock.collection import BulkOperationBuilder, Collection  # noqa: E402
+from pymongo.errors import AutoReconnect  # noqa: E402
+
+# Recent pymongo passes ``sort`` to bulk update ops, which mongomock does not know about yet
+_add_update = BulkOperationBuilder.add_update
+
+
+def _add_update_without_sort(self, *args, sort=None, **kwargs):
+    return _add_update(self, *args, **kwargs)
+
+
+BulkOperationBuilder.add_update = _add_update_without_sort
+
+
+@pytest.fixture(scope='session')
+def _connection():
+    connection = connect('smartnotice_test', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+    yield connection
+    disconnect()
+
+
+@pytest.fixture()
+def db(_connection):
+    """The test database, emptied after each test."""
+    database = _connection['smartnotice_test']
+    yield database
+    for name in database.list_collection_names():
+        database.drop_collection(name)
+    # Models cache their collection; forget it so the next test recreates their indexes
+    for document in _document_registry.values():
+        document._collection = None
+
+
+@pytest.fixture()
+def fail_once(monkeypatch):
+    """
+    ``fail_once(name, applied=False)``: the next bulk write to collection
+    ``name`` raises AutoReconnect, before it reaches the server or, with
+    ``applied``, after the server applied it (a lost reply).
+    """
+    failing = {}
+    bulk_write = Collection.bulk_write
+
+    def flaky_bulk_write(self, requests, *args, **kwargs):
+        if self.name not in failing:
+            return bulk_write(self, requests, *args, **kwargs)
+        if failing.pop(self.name):
+            bulk_write(self, requests, *args, **kwargs)
+        raise AutoReconnect(f"connection lost writing {self.name}")
+
+    monkeypatch.setattr(Collection, 'bulk_write', flaky_bulk_write)
+    return lambda name, applied=False: failing.__setitem__(name, applied)
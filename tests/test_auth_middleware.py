@@ -0,0 +1,50 @@
+import datetime
+import jwt
+import pytest
+from bson import ObjectId
+from app.middleware.auth_middleware import user_from_token, TokenError
+from app.models.student_model import Student
+from config import Config
+
+
+@pytest.fixture()
+def student(db):
+    return Student(univ_roll_no='2101', course='B.Tech', branch='CSE', name='Asha',
+                   email='asha@example.com', password='x').save()
+
+
+def token_for(user_id, **claims):
+    payload = {'user_id': str(user_id), 'role': 'student',
+               'exp': datetime.datetime.utcnow() + datetime.timedelta(minutes=5)}
+    payload.update(claims)
+    payload = {k: v for k, v in payload.items() if v is not None}
+    return jwt.encode(payload, Config.SECRET_KEY, algorithm='HS256')
+
+
+def code_for(token, remote_addr=None):
+    with pytest.raises(TokenError) as e:
+        user_from_token(token, remote_addr)
+    return e.value.code
+
+
+def test_token_resolves_to_its_user(student):
+    assert user_from_token(token_for(student.id)).id == student.id
+
+
+def test_token_for_missing_user_is_rejected(student):
+    assert code_for(token_for(ObjectId())) == 'USER_NOT_FOUND'
+
+
+def test_token_without_exp_is_rejected(student):
+    assert code_for(token_for(student.id, exp=None)) == 'TOKEN_EXPIRED'
+
+
+def test_token_bound_to_another_ip_is_rejected(student):
+    token = token_for(student.id, ip='10.0.0.1')
+    assert code_for(token, '10.0.0.2') == 'IP_MISMATCH'
+    assert user_from_token(token, '10.0.0.1').id == student.id
+
+
+def test_forged_token_is_rejected(student):
+    token = jwt.encode({'user_id': str(student.id)}, 'not-the-secret', algorithm='HS256')
+    assert code_for(token) == 'INVALID_TOKEN'
@@ -0,0 +1,61 @@
+import pytest
+from bson import ObjectId
+from app.utils import dwell_tracker as dwell
+from app.utils.dwell_tracker import DwellAccumulator
+
+
+@pytest.fixture()
+def notice_id(db):
+    notice_id = ObjectId()
+    db.notices.insert_one({'_id': notice_id, 'title': 'Exam schedule', 'total_time_spent': 0})
+    # Only student-1 has a read row; student-2's read is still in the read buffer
+    db.notice_reads.insert_one({'notice_id': notice_id, 'user_id': 'student-1', 'read_count': 1, 'total_time_spent': 0})
+    return notice_id
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dwell.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def view(tracker, clock, notice_id, user_id, seconds):
+    tracker.heartbeat(notice_id, user_id)
+    clock[0] += seconds
+    tracker.heartbeat(notice_id, user_id)
+
+
+def time_spent(db, notice_id):
+    row = db.notice_reads.find_one({'notice_id': notice_id, 'user_id': 'student-1'})
+    return row['total_time_spent'], db.notices.find_one({'_id': notice_id})['total_time_spent']
+
+
+def test_notice_is_credited_only_with_matched_rows(db, notice_id, clock):
+    tracker = DwellAccumulator(max_gap_seconds=45)
+    view(tracker, clock, notice_id, 'student-1', 15)
+    view(tracker, clock, notice_id, 'student-2', 30)
+
+    assert tracker.flush() == 15
+    assert time_spent(db, notice_id) == (15, 15)
+    assert tracker.stats()['seconds_without_read'] == 30
+
+
+@pytest.mark.parametrize('failing_collection', ['notice_reads', 'notices'])
+def test_failed_flush_is_retried_without_double_counting(db, notice_id, clock, fail_once, failing_collection):
+    tracker = DwellAccumulator(max_gap_seconds=45)
+    view(tracker, clock, notice_id, 'student-1', 15)
+    view(tracker, clock, notice_id, 'student-2', 30)
+    fail_once(failing_collection)
+
+    assert tracker.flush() == 0
+    assert tracker.stats()['failed_flushes'] == 1
+
+    assert tracker.flush() == 15
+    assert time_spent(db, notice_id) == (15, 15)
+
+    # Later flushes still add up
+    clock[0] += 100
+    view(tracker, clock, notice_id, 'student-1', 10)
+    tracker.flush()
+    assert time_spent(db, notice_id) == (25, 25)
@@ -0,0 +1,101 @@
+import datetime
+from types import SimpleNamespace
+import pytest
+from bson import ObjectId
+from app.utils import notice_search
+from app.utils.notice_search import ranked_search, search_pipeline, _decode_search_cursor
+
+
+class TextScored:
+    """
+    mongomock has no text index, so this runs the real search pipeline with
+    the ``$text`` clause removed and ``{'$meta': 'textScore'}`` read from each
+    document's ``text_score`` field instead.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def aggregate(self, pipeline):
+        first = dict(pipeline[0]['$match'])
+        first.pop('$text')
+        return self.collection.aggregate([{'$match': first}] + [self._score(stage) for stage in pipeline[1:]])
+
+    def _score(self, value):
+        if value == {'$meta': 'textScore'}:
+            return '$text_score'
+        if isinstance(value, dict):
+            return {key: self._score(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._score(item) for item in value]
+        return value
+
+
+NOW = datetime.datetime(2026, 3, 2, 12, 0)
+
+
+@pytest.fixture()
+def notices(db):
+    def add(title, score, days_old, priority='Normal'):
+        notice_id = ObjectId()
+        db.notices.insert_one({
+            '_id': notice_id, 'title': title, 'text_score': score, 'priority': priority,
+            'status': 'published', 'created_at': NOW - datetime.timedelta(days=days_old),
+        })
+        return notice_id
+    return add
+
+
+def search(db, limit, after=None):
+    return ranked_search(TextScored(db.notices), 'exam', {}, limit, after)
+
+
+@pytest.fixture()
+def frozen_now(monkeypatch):
+    class FrozenDatetime(datetime.datetime):
+        @classmethod
+        def utcnow(cls):
+            return NOW
+    monkeypatch.setattr(notice_search, 'datetime', SimpleNamespace(datetime=FrozenDatetime, timedelta=datetime.timedelta))
+
+
+def test_rank_combines_text_score_recency_and_priority(db, notices, frozen_now):
+    old = notices('Old exam notice', score=2.0, days_old=60)
+    fresh = notices('Fresh exam notice', score=2.0, days_old=0)
+    urgent = notices('Urgent old exam notice', score=2.0, days_old=60, priority='Highly Urgent')
+    weak = notices('Barely matching', score=0.5, days_old=0)
+
+    rows, next_cursor = search(db, limit=10)
+
+    assert [row['_id'] for row in rows] == [fresh, urgent, old, weak]
+    assert next_cursor is None
+    # 2.0 * (1 + 14 / 14) for a notice published now
+    assert rows[0]['rank'] == pytest.approx(4.0)
+
+
+def test_cursor_pages_are_stable(db, notices, frozen_now, monkeypatch):
+    # Ties on rank are broken by _id
+    ids = [notices(f'Exam {i}', score=1.0 + (i % 3), days_old=i % 5) for i in range(25)]
+    everything, _ = search(db, limit=100)
+    assert sorted(row['_id'] for row in everything) == sorted(ids)
+
+    pages, cursor = [], None
+    for _ in range(10):
+        rows, cursor = search(db, limit=7, after=cursor)
+        pages.append([row['_id'] for row in rows])
+        # Time moves on between pages; the cursor keeps ranking at the first page's "now"
+        monkeypatch.setattr(notice_search, 'datetime', datetime)
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [7, 7, 7, 4]
+    assert [notice_id for page in pages for notice_id in page] == [row['_id'] for row in everything]
+
+
+def test_cursor_pins_ranking_time(frozen_now):
+    pipeline, now = search_pipeline('exam', {}, 20)
+    assert now == NOW
+    token = notice_search.encode_cursor([3.5, now.isoformat()], ObjectId())
+    assert _decode_search_cursor(token)[:2] == (3.5, NOW)
+    with pytest.raises(ValueError):
+        _decode_search_cursor(notice_search.encode_cursor('not a rank', ObjectId()))
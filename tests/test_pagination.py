@@ -0,0 +1,44 @@
+import datetime
+import pytest
+from bson import ObjectId
+from app.models.notice_read_model import NoticeRead
+from app.utils.pagination import keyset_paginate, check_cursor_sort, decode_cursor, encode_cursor
+
+
+@pytest.fixture()
+def reads(db):
+    notice_id = ObjectId()
+    start = datetime.datetime(2026, 3, 1)
+    for i in range(5):
+        NoticeRead(notice_id=notice_id, user_id=f'student-{i}', read_count=i % 3,
+                   last_read_at=start + datetime.timedelta(hours=i)).save()
+    return NoticeRead.objects(notice_id=notice_id)
+
+
+def test_cursor_resumes_the_sort_it_was_issued_for(reads):
+    first, cursor = keyset_paginate(reads, 2, field='read_count')
+    rest, end = keyset_paginate(reads, 10, cursor, field='read_count')
+
+    assert end is None
+    counts = [row.read_count for row in first + rest]
+    assert counts == sorted(counts, reverse=True) and len(counts) == 5
+
+
+@pytest.mark.parametrize('field,descending', [('last_read_at', True), ('read_count', False)])
+def test_cursor_for_another_sort_is_rejected(reads, field, descending):
+    _, cursor = keyset_paginate(reads, 2, field='read_count')
+
+    with pytest.raises(ValueError, match='does not match sort'):
+        keyset_paginate(reads, 2, cursor, field=field, descending=descending)
+    with pytest.raises(ValueError, match='does not match sort'):
+        check_cursor_sort((2, cursor), field, descending)
+    check_cursor_sort((2, cursor), 'read_count')
+
+
+def test_cursor_without_sort_is_only_read_unchecked():
+    doc_id = ObjectId()
+    cursor = encode_cursor(3, doc_id)
+
+    assert decode_cursor(cursor) == (3, doc_id)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, '-read_count')
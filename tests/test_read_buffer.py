@@ -0,0 +1,105 @@
+import datetime
+import pytest
+from bson import ObjectId
+from pymongo.errors import AutoReconnect, BulkWriteError
+from mongomock.collection import Collection
+from app.utils import read_store
+from app.utils.read_buffer import ReadEventBuffer
+from app.utils.read_store import apply_reads, write_reads, ReadsNotCounted
+
+
+@pytest.fixture()
+def notice_id(db):
+    notice_id = ObjectId()
+    db.notices.insert_one({'_id': notice_id, 'title': 'Exam schedule', 'read_count': 0, 'total_reads': 0})
+    return notice_id
+
+
+def make_buffer():
+    flushed = []
+    buffer = ReadEventBuffer(dedupe_seconds=0)
+    buffer.on_flush = flushed.append
+    return buffer, flushed
+
+
+def assert_counted_once(db, notice_id, reads, user_id='student-1', readers=1):
+    notice = db.notices.find_one({'_id': notice_id})
+    assert notice['read_count'] == readers
+    assert notice['total_reads'] == reads
+    row = db.notice_reads.find_one({'notice_id': notice_id, 'user_id': user_id})
+    assert row['read_count'] == reads
+    for granularity in ('hour', 'day'):
+        bucket = db.notice_read_buckets.find_one({'notice_id': notice_id, 'granularity': granularity})
+        assert (bucket['reads'], bucket['new_readers']) == (reads, readers)
+
+
+def test_flush_counts_reads(db, notice_id):
+    buffer, flushed = make_buffer()
+    buffer.add(notice_id, 'student-1')
+    buffer.add(notice_id, 'student-1')
+
+    assert buffer.flush() == 2
+    assert flushed == [{notice_id: (2, 1)}]
+    assert_counted_once(db, notice_id, reads=2)
+
+
+@pytest.mark.parametrize('applied', [False, True], ids=['write lost', 'reply lost'])
+@pytest.mark.parametrize('failing_collection', ['notice_reads', 'notices', 'notice_read_buckets'])
+def test_failed_flush_is_finished_without_double_counting(db, notice_id, fail_once, failing_collection, applied):
+    buffer, flushed = make_buffer()
+    buffer.add(notice_id, 'student-1')
+    fail_once(failing_collection, applied=applied)
+
+    assert buffer.flush() == 0
+    stats = buffer.stats()
+    assert stats['failed_flushes'] == 1
+    # Never re-queued as new reads; the same batch is retried instead
+    assert stats['pending_events'] == 0
+    assert stats['batches_to_retry'] == 1
+
+    # The retry skips whatever the failed attempt (or the server, behind its back) already applied
+    buffer.flush()
+    assert buffer.stats()['batches_to_retry'] == 0
+    assert flushed == [{notice_id: (1, 1)}]
+    assert_counted_once(db, notice_id, reads=1)
+
+    # Later batches still count normally
+    buffer.add(notice_id, 'student-1')
+    buffer.flush()
+    assert_counted_once(db, notice_id, reads=2)
+
+
+def test_unwritable_rows_do_not_hold_back_the_rest(db, notice_id, monkeypatch):
+    bulk_write = Collection.bulk_write
+
+    def reject_first(self, requests, *args, **kwargs):
+        if self.name != 'notice_reads' or len(requests) < 2:
+            return bulk_write(self, requests, *args, **kwargs)
+        # Unordered: the other upserts succeed, the first one fails validation
+        bulk_write(self, requests[1:], *args, **kwargs)
+        raise BulkWriteError({'writeErrors': [{'index': 0, 'code': 121, 'errmsg': 'Document failed validation'}]})
+
+    monkeypatch.setattr(Collection, 'bulk_write', reject_first)
+    buffer, flushed = make_buffer()
+    buffer.add(notice_id, 'student-1')
+    buffer.add(notice_id, 'student-2')
+
+    assert buffer.flush() == 2
+    assert flushed == [{notice_id: (1, 1)}]
+    assert_counted_once(db, notice_id, reads=1, user_id='student-2')
+    assert db.notice_reads.find_one({'user_id': 'student-1'}) is None
+
+
+def test_retry_with_same_batch_id_is_a_no_op(db, notice_id, monkeypatch):
+    def lose_connection(changes, batch_id=None):
+        raise AutoReconnect("connection lost")
+
+    now = datetime.datetime.utcnow()
+    monkeypatch.setattr(read_store, '_bump_engagement', lose_connection)
+    with pytest.raises(ReadsNotCounted) as raised:
+        apply_reads({(notice_id, 'student-1'): (1, now, now)})
+    monkeypatch.undo()
+
+    write_reads(raised.value.batch)
+    write_reads(raised.value.batch)
+    assert_counted_once(db, notice_id, reads=1)